@@ -1,5 +1,5 @@
 # Config Module
-from .config_manager import ConfigManager
-from .settings import Settings
+from .config_manager import ConfigManager, get_config_manager
+from .settings import Settings, get_settings
 
-__all__ = ['ConfigManager', 'Settings']
+__all__ = ['ConfigManager', 'get_config_manager', 'Settings', 'get_settings']
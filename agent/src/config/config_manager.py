@@ -6,12 +6,14 @@
 
 主要组件:
 - ConfigManager: 配置管理器核心类
+- get_config_manager: 按配置路径缓存的共享实例工厂
 
 功能特点:
 - 支持JSON和YAML格式的配置文件
+- YAML 解析结果缓存为 JSON，加速后续启动
 - 环境变量替换，如 ${API_KEY}
 - 多模型配置管理
-- 旅游知识数据内置
+- 旅游知识数据内置（data/travel_knowledge.json）
 - 嵌套配置项访问
 
 配置文件示例 (config/llm_config.yaml):
@@ -35,9 +37,12 @@
         api_base: http://localhost:11434/v1
 
 使用示例:
-    from config.config_manager import ConfigManager
+    from config.config_manager import ConfigManager, get_config_manager
 
-    # 创建配置管理器
+    # 获取共享的配置管理器（推荐，同一路径只加载一次）
+    config = get_config_manager("config/llm_config.yaml")
+
+    # 或创建独立的配置管理器
     config = ConfigManager("config/llm_config.yaml")
 
     # 获取模型配置
@@ -55,9 +60,147 @@
 
 import json
 import os
-import re
+import sys
 import yaml
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from string import Template
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Tuple
+
+try:
+    import orjson
+    # orjson.loads 同时接受 str 与 bytes
+    _json_loads = orjson.loads
+except ImportError:  # orjson 为可选依赖，缺失时使用标准库 json
+    _json_loads = json.loads
+
+# 优先使用 libyaml 提供的 C 加速解析器，不可用时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# YAML 配置解析结果的 JSON 缓存文件后缀
+_CACHE_SUFFIX = '.cache.json'
+
+# get_config 缓存未命中标记
+_MISSING = object()
+
+
+class _EnvTemplate(Template):
+    """
+    仅识别 ${VAR_NAME} 形式占位符的模板
+
+    屏蔽 Template 默认的 $VAR 简写与 $$ 转义语法，
+    未设置的变量原样保留，与原有占位符规则保持一致。
+    """
+    pattern = r'''
+        \$(?:
+            (?P<escaped>(?!))          |  # 不支持 $$ 转义
+            (?P<named>(?!))            |  # 不支持 $VAR 简写
+            \{(?P<braced>[^}]+)\}      |  # ${VAR_NAME}
+            (?P<invalid>(?!))
+        )
+    '''
+
+
+# ------------------------------------------------------------------------------
+# 内置旅游知识数据
+#
+# 数据保存在 data/travel_knowledge.json，首次访问时加载一次，
+# 所有 ConfigManager 实例共享同一份只读数据。
+#
+# 数据结构:
+#     travel_knowledge
+#     ├── cities: {城市名: 城市信息}
+#     │   ├── region: 地区
+#     │   ├── tags: 标签列表
+#     │   ├── best_season: 最佳游玩季节
+#     │   ├── avg_budget_per_day: 日均预算
+#     │   ├── recommended_days: 推荐天数
+#     │   └── attractions: 景点列表
+#     └── interest_tags: {兴趣标签: 城市列表}
+# ------------------------------------------------------------------------------
+_TRAVEL_KNOWLEDGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      'data', 'travel_knowledge.json')
+
+
+@lru_cache(maxsize=1)
+def _load_travel_knowledge() -> Mapping[str, Any]:
+    """
+    加载内置旅游知识数据（进程内只读取一次）
+
+    数据在所有实例间共享，因此加载后冻结：外层映射包装为只读
+    MappingProxyType，列表转为元组。单个城市信息和景点仍为 dict，
+    以便调用方继续做 isinstance(dict) 判断、** 展开和 JSON 序列化。
+
+    Returns:
+        Mapping[str, Any]: 只读的旅游知识数据
+    """
+    with open(_TRAVEL_KNOWLEDGE_PATH, 'rb') as f:
+        data = f.read()
+    raw = _json_loads(data)
+
+    # 驻留城市名、地区与标签字符串，调用方传入字面量时字典查找可走身份比较快速路径
+    cities = {}
+    for name, info in raw['cities'].items():
+        info['region'] = sys.intern(info['region'])
+        info['tags'] = tuple(sys.intern(tag) for tag in info['tags'])
+        info['best_season'] = tuple(info['best_season'])
+        info['attractions'] = tuple(info['attractions'])
+        cities[sys.intern(name)] = info
+    interest_tags = {
+        sys.intern(tag): tuple(sys.intern(city) for city in city_list)
+        for tag, city_list in raw['interest_tags'].items()
+    }
+    return MappingProxyType({
+        'cities': MappingProxyType(cities),
+        'interest_tags': MappingProxyType(interest_tags),
+    })
+
+
+@lru_cache(maxsize=1)
+def _load_city_names() -> Tuple[str, ...]:
+    """
+    获取全部城市名称（进程内只构建一次）
+
+    Returns:
+        Tuple[str, ...]: 城市名称元组，保持数据文件中的顺序
+    """
+    return tuple(_load_travel_knowledge()['cities'])
+
+
+@lru_cache(maxsize=1)
+def _load_travel_indexes() -> Tuple[Dict[str, Tuple[str, ...]],
+                                    Dict[str, FrozenSet[str]],
+                                    Dict[str, Tuple[Tuple[str, Dict[str, Any]], ...]]]:
+    """
+    基于旅游知识数据一次性构建倒排索引（进程内只构建一次）
+
+    Returns:
+        Tuple: (地区 -> 城市, 标签 -> 城市, 景点类型 -> (城市, 景点))
+            标签索引合并了各城市的 tags 与 interest_tags
+    """
+    knowledge = _load_travel_knowledge()
+    region_index: Dict[str, List[str]] = {}
+    tag_index: Dict[str, set] = {}
+    type_index: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+
+    for city, info in knowledge['cities'].items():
+        region_index.setdefault(info.get('region', ''), []).append(city)
+        for tag in info.get('tags', []):
+            tag_index.setdefault(tag, set()).add(city)
+        for attraction in info.get('attractions', []):
+            type_index.setdefault(attraction.get('type', ''), []).append((city, attraction))
+
+    for tag, cities in knowledge['interest_tags'].items():
+        tag_index.setdefault(tag, set()).update(cities)
+
+    return (
+        {k: tuple(v) for k, v in region_index.items()},
+        {k: frozenset(v) for k, v in tag_index.items()},
+        {k: tuple(v) for k, v in type_index.items()},
+    )
 
 
 class ConfigManager:
@@ -70,15 +213,14 @@ class ConfigManager:
     1. 初始化时检查配置文件是否存在
     2. 加载配置文件（JSON或YAML格式）
     3. 替换环境变量占位符
-    4. 初始化旅游知识数据
-    5. 提供配置访问接口
+    4. 提供配置访问接口（旅游知识数据首次访问时加载）
 
     属性:
         config_path: str 配置文件路径
         config: Dict[str, Any] 原始配置数据
         models_config: Dict[str, Dict] 模型配置字典
         default_model_id: str 默认模型ID
-        travel_knowledge: Dict[str, Any] 内置旅游知识数据
+        travel_knowledge: Mapping[str, Any] 内置旅游知识数据（只读）
 
     内置旅游知识:
         - 支持城市: 北京、上海、杭州、成都、西安、厦门、呼和浩特、呼伦贝尔、包头
@@ -86,6 +228,12 @@ class ConfigManager:
         - 兴趣标签关联城市列表
     """
 
+    # 实例属性固定，使用 __slots__ 省去 __dict__，加快属性访问；
+    # 保留 __weakref__ 以便按实例弱引用缓存派生对象
+    __slots__ = ('config_path', 'config', 'models_config', 'default_model_id',
+                 '_cfg_cache', '_available_models', '_default_model_config',
+                 '_agent', '_web', '_grpc', '__weakref__')
+
     def __init__(self, config_path: str = "config/llm_config.yaml"):
         """
         初始化配置管理器
@@ -97,11 +245,16 @@ class ConfigManager:
         self.config: Dict[str, Any] = {}
         self.models_config: Dict[str, Dict[str, Any]] = {}
         self.default_model_id: str = "gpt-4o-mini"
-        self.travel_knowledge: Dict[str, Any] = {}
+        # get_config 点分键查找缓存，配置重新加载时清空
+        self._cfg_cache: Dict[str, Any] = {}
+        self._available_models: List[Dict[str, Any]] = []
+        self._default_model_config: Optional[Dict[str, Any]] = None
+        self._agent: Dict[str, Any] = {}
+        self._web: Dict[str, Any] = {}
+        self._grpc: Dict[str, Any] = {}
 
         self._check_config_files()
         self._load_config()
-        self._init_travel_knowledge()
 
     def _check_config_files(self) -> None:
         """
@@ -112,47 +265,61 @@ class ConfigManager:
         Raises:
             FileNotFoundError: 配置文件不存在时抛出
         """
-        # 优先查找 YAML 文件
-        yaml_path = self.config_path
-        json_path = self.config_path.replace('.yaml', '.json').replace('.yml', '.json')
+        # 指定文件存在时直接使用，常见情况只需一次 stat
+        if os.path.exists(self.config_path):
+            return
 
         # 如果指定的是 yaml 文件但不存在，尝试 json
-        if self.config_path.endswith(('.yaml', '.yml')) and not os.path.exists(yaml_path):
+        if self.config_path.endswith(('.yaml', '.yml')):
+            json_path = self.config_path.replace('.yaml', '.json').replace('.yml', '.json')
             if os.path.exists(json_path):
                 self.config_path = json_path
                 return
 
-        if not os.path.exists(self.config_path):
-            error_msg = (
-                f"Configuration file missing: {self.config_path}\n\n"
-                f"Please create configuration file before starting the application:\n"
-                f"  1. Copy config/llm_config.yaml.example to config/llm_config.yaml\n"
-                f"  2. Update the API keys in the configuration\n\n"
-                f"Refer to README.md for detailed instructions."
-            )
-            raise FileNotFoundError(error_msg)
+        error_msg = (
+            f"Configuration file missing: {self.config_path}\n\n"
+            f"Please create configuration file before starting the application:\n"
+            f"  1. Copy config/llm_config.yaml.example to config/llm_config.yaml\n"
+            f"  2. Update the API keys in the configuration\n\n"
+            f"Refer to README.md for detailed instructions."
+        )
+        raise FileNotFoundError(error_msg)
 
     def _load_config(self) -> None:
         """
         加载配置文件，支持 YAML 和 JSON 格式
 
-        读取配置文件内容，替换环境变量占位符，然后解析为Python字典。
-        格式由文件扩展名自动判断。
+        解析原始字节为Python字典，再替换其中的环境变量占位符。
+        格式由文件扩展名自动判断。YAML 的解析结果（替换前）写入 JSON 缓存，
+        缓存中只有占位符而没有变量值，密钥等不会落盘。
         """
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # 替换环境变量占位符 ${VAR_NAME}
-        content = self._replace_env_vars(content)
+        with open(self.config_path, 'rb') as f:
+            data = f.read()
+        is_yaml = self.config_path.endswith(('.yaml', '.yml'))
 
-        if self.config_path.endswith(('.yaml', '.yml')):
-            self.config = yaml.safe_load(content)
+        if is_yaml:
+            config = self._load_yaml_with_cache(data)
         else:
-            self.config = json.loads(content)
+            config = _json_loads(data)
+
+        if b'${' in data:
+            # 替换环境变量占位符 ${VAR_NAME}
+            # 空值环境变量视为未设置，保留原始占位符
+            env = {k: v for k, v in os.environ.items() if v}
+            config = self._substitute_env_vars(config, env, is_yaml)
+        self.config = config
+        self._cfg_cache = {}
+
+        # 常用配置段在加载时解析一次，属性访问直接返回
+        self._agent = self.config.get('agent', {})
+        self._web = self.config.get('web', {})
+        self._grpc = self.config.get('grpc', {})
 
         # 加载模型配置
         self.models_config = self.config.get('models', {})
         self.default_model_id = self.config.get('default_model', 'gpt-4o-mini')
+        # 默认模型未配置时为 None，get_model_config 仍按原逻辑抛出 ValueError
+        self._default_model_config = self.models_config.get(self.default_model_id)
 
         # 检查是否有模型配置
         if not self.models_config:
@@ -161,178 +328,109 @@ class ConfigManager:
                 f"Please add at least one model configuration."
             )
 
-    def _replace_env_vars(self, content: str) -> str:
+        # 预先构建可用模型列表，get_available_models 直接返回
+        self._available_models = [
+            {
+                'model_id': model_id,
+                'name': config.get('name', model_id),
+                'provider': config.get('provider', 'openai'),
+                'model': config.get('model', model_id)
+            }
+            for model_id, config in self.models_config.items()
+        ]
+
+    def _load_yaml_with_cache(self, content: bytes) -> Dict[str, Any]:
         """
-        替换环境变量占位符 ${VAR_NAME}
+        解析 YAML 配置，并维护同目录下的 JSON 缓存
 
-        扫描配置文件中的 ${VAR_NAME} 格式的占位符，
-        替换为对应的环境变量值。如果环境变量未设置，
-        则保留原始占位符。
+        YAML 解析远慢于 JSON。首次加载后将解析结果写入
+        <config_path>.cache.json，缓存头记录源文件的 mtime_ns 与 size，
+        二者一致时直接用 json 解析缓存，跳过 YAML 解析。
+        缓存读写失败（只读目录、内容无法用 JSON 表达等）时静默回退。
 
         Args:
-            content: str 配置文件原始内容
+            content: bytes 配置文件原始内容（环境变量占位符尚未替换）
 
         Returns:
-            str: 替换环境变量后的内容
-        """
-        pattern = r'\$\{([^}]+)\}'
-
-        def replace(match):
-            var_name = match.group(1)
-            env_value = os.environ.get(var_name, '')
-            return env_value if env_value else match.group(0)
-
-        return re.sub(pattern, replace, content)
-
-    def _init_travel_knowledge(self) -> None:
-        """
-        初始化旅游知识数据
-
-        加载内置的城市信息、景点、兴趣标签等旅游知识数据。
-        这些数据用于辅助旅游推荐和路线规划。
-
-        数据结构:
-            travel_knowledge
-            ├── cities: {城市名: 城市信息}
-            │   ├── region: 地区
-            │   ├── tags: 标签列表
-            │   ├── best_season: 最佳游玩季节
-            │   ├── avg_budget_per_day: 日均预算
-            │   ├── recommended_days: 推荐天数
-            │   └── attractions: 景点列表
-            └── interest_tags: {兴趣标签: 城市列表}
-        """
-        self.travel_knowledge = {
-            "cities": {
-                "北京": {
-                    "region": "华北",
-                    "tags": ["历史文化", "首都", "古建筑"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 500,
-                    "recommended_days": 4,
-                    "attractions": [
-                        {"name": "故宫", "type": "历史遗迹", "duration": 4, "ticket": 60},
-                        {"name": "长城", "type": "历史遗迹", "duration": 6, "ticket": 40},
-                        {"name": "天坛", "type": "历史遗迹", "duration": 3, "ticket": 15},
-                        {"name": "颐和园", "type": "园林", "duration": 4, "ticket": 30}
-                    ]
-                },
-                "上海": {
-                    "region": "华东",
-                    "tags": ["现代都市", "购物", "美食"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 600,
-                    "recommended_days": 3,
-                    "attractions": [
-                        {"name": "外滩", "type": "城市景观", "duration": 3, "ticket": 0},
-                        {"name": "东方明珠", "type": "地标建筑", "duration": 2, "ticket": 180},
-                        {"name": "迪士尼乐园", "type": "主题乐园", "duration": 8, "ticket": 399},
-                        {"name": "豫园", "type": "园林", "duration": 2, "ticket": 40}
-                    ]
-                },
-                "杭州": {
-                    "region": "华东",
-                    "tags": ["自然风光", "人文历史", "休闲"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 400,
-                    "recommended_days": 3,
-                    "attractions": [
-                        {"name": "西湖", "type": "自然风光", "duration": 4, "ticket": 0},
-                        {"name": "灵隐寺", "type": "宗教文化", "duration": 3, "ticket": 45},
-                        {"name": "千岛湖", "type": "自然风光", "duration": 6, "ticket": 150},
-                        {"name": "宋城", "type": "主题乐园", "duration": 4, "ticket": 310}
-                    ]
-                },
-                "成都": {
-                    "region": "西南",
-                    "tags": ["美食", "休闲", "熊猫"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 350,
-                    "recommended_days": 4,
-                    "attractions": [
-                        {"name": "大熊猫繁育研究基地", "type": "动物园", "duration": 4, "ticket": 55},
-                        {"name": "宽窄巷子", "type": "历史街区", "duration": 3, "ticket": 0},
-                        {"name": "武侯祠", "type": "历史遗迹", "duration": 2, "ticket": 50},
-                        {"name": "都江堰", "type": "历史遗迹", "duration": 5, "ticket": 80}
-                    ]
-                },
-                "西安": {
-                    "region": "西北",
-                    "tags": ["历史文化", "古都", "美食"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 400,
-                    "recommended_days": 4,
-                    "attractions": [
-                        {"name": "兵马俑", "type": "历史遗迹", "duration": 4, "ticket": 120},
-                        {"name": "大雁塔", "type": "历史遗迹", "duration": 2, "ticket": 50},
-                        {"name": "古城墙", "type": "历史遗迹", "duration": 3, "ticket": 54},
-                        {"name": "华清宫", "type": "历史遗迹", "duration": 3, "ticket": 120}
-                    ]
-                },
-                "厦门": {
-                    "region": "华南",
-                    "tags": ["海滨", "休闲", "文艺"],
-                    "best_season": ["春季", "秋季", "冬季"],
-                    "avg_budget_per_day": 450,
-                    "recommended_days": 3,
-                    "attractions": [
-                        {"name": "鼓浪屿", "type": "海岛", "duration": 6, "ticket": 0},
-                        {"name": "南普陀寺", "type": "宗教文化", "duration": 2, "ticket": 0},
-                        {"name": "曾厝垵", "type": "历史街区", "duration": 3, "ticket": 0},
-                        {"name": "环岛路", "type": "城市景观", "duration": 3, "ticket": 0}
-                    ]
-                },
-                "呼和浩特": {
-                    "region": "内蒙古",
-                    "tags": ["草原", "历史文化", "美食", "民族风情"],
-                    "best_season": ["夏季", "秋季"],
-                    "avg_budget_per_day": 350,
-                    "recommended_days": 3,
-                    "attractions": [
-                        {"name": "大召寺", "type": "宗教文化", "duration": 2, "ticket": 35},
-                        {"name": "内蒙古博物馆", "type": "博物馆", "duration": 2, "ticket": 0},
-                        {"name": "昭君墓", "type": "历史遗迹", "duration": 2, "ticket": 65},
-                        {"name": "敕勒川草原", "type": "自然风光", "duration": 4, "ticket": 0}
-                    ]
-                },
-                "呼伦贝尔": {
-                    "region": "内蒙古",
-                    "tags": ["草原", "自然风光", "民族风情", "美食"],
-                    "best_season": ["夏季", "秋季"],
-                    "avg_budget_per_day": 450,
-                    "recommended_days": 4,
-                    "attractions": [
-                        {"name": "呼伦贝尔大草原", "type": "自然风光", "duration": 6, "ticket": 0},
-                        {"name": "额尔古纳湿地", "type": "自然风光", "duration": 4, "ticket": 65},
-                        {"name": "满洲里国门", "type": "历史遗迹", "duration": 2, "ticket": 80},
-                        {"name": "套娃广场", "type": "主题广场", "duration": 2, "ticket": 0}
-                    ]
-                },
-                "包头": {
-                    "region": "内蒙古",
-                    "tags": ["草原", "工业", "美食"],
-                    "best_season": ["夏季", "秋季"],
-                    "avg_budget_per_day": 300,
-                    "recommended_days": 2,
-                    "attractions": [
-                        {"name": "赛罕塔拉公园", "type": "自然风光", "duration": 3, "ticket": 0},
-                        {"name": "北方兵器城", "type": "工业旅游", "duration": 2, "ticket": 50},
-                        {"name": "五当召", "type": "宗教文化", "duration": 3, "ticket": 60}
-                    ]
-                }
-            },
-
-            "interest_tags": {
-                "历史文化": ["北京", "西安", "洛阳", "南京"],
-                "自然风光": ["杭州", "桂林", "张家界", "九寨沟", "呼伦贝尔"],
-                "现代都市": ["上海", "深圳", "广州", "香港"],
-                "美食": ["成都", "重庆", "广州", "西安", "呼和浩特", "呼伦贝尔"],
-                "海滨度假": ["三亚", "厦门", "青岛", "大连"],
-                "休闲养生": ["杭州", "成都", "丽江", "大理"],
-                "草原风光": ["呼伦贝尔", "呼和浩特", "包头"],
-                "民族风情": ["呼和浩特", "呼伦贝尔", "大理", "丽江"]
+            Dict[str, Any]: 解析后的配置字典
+        """
+        cache_path = self.config_path + _CACHE_SUFFIX
+        st = os.stat(self.config_path)
+
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = _json_loads(f.read())
+            if cached.get('mtime_ns') == st.st_mtime_ns and cached.get('size') == st.st_size:
+                return cached['config']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        config = yaml.load(content, Loader=_YamlLoader)
+
+        try:
+            payload = json.dumps({
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+                'config': config
+            }, ensure_ascii=False)
+            # 仅当 JSON 能无损还原时才写入缓存（如日期、非字符串键会改变类型）
+            if json.loads(payload)['config'] == config:
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+        return config
+
+    def _substitute_env_vars(self, value: Any, env: Mapping[str, str], is_yaml: bool) -> Any:
+        """
+        递归替换解析结果中的环境变量占位符
+
+        字符串（含字典键）中的 ${VAR_NAME} 替换为环境变量值，未设置的变量
+        保留原始占位符。YAML 中整个标量恰为一个占位符时（如 port: ${PORT}），
+        替换后再按 YAML 标量规则解析，与先替换文本再解析的结果类型保持一致。
+
+        Args:
+            value: 解析后的配置值
+            env: 可用的环境变量
+            is_yaml: 是否为 YAML 配置
+
+        Returns:
+            Any: 替换环境变量后的配置值
+        """
+        if isinstance(value, str):
+            if '${' not in value:
+                return value
+            replaced = _EnvTemplate(value).safe_substitute(env)
+            if (is_yaml and replaced != value and value.startswith('${')
+                    and value.endswith('}') and value.count('${') == 1):
+                try:
+                    scalar = yaml.load(replaced, Loader=_YamlLoader)
+                except yaml.YAMLError:
+                    return replaced
+                if scalar is None or isinstance(scalar, (bool, int, float)):
+                    return scalar
+            return replaced
+        if isinstance(value, dict):
+            return {
+                self._substitute_env_vars(k, env, is_yaml): self._substitute_env_vars(v, env, is_yaml)
+                for k, v in value.items()
             }
-        }
+        if isinstance(value, list):
+            return [self._substitute_env_vars(v, env, is_yaml) for v in value]
+        return value
+
+    @property
+    def travel_knowledge(self) -> Mapping[str, Any]:
+        """
+        获取内置旅游知识数据
+
+        Returns:
+            Mapping[str, Any]: 内置旅游知识数据
+        """
+        return _load_travel_knowledge()
 
     def get_config(self, key: str, default: Any = None) -> Any:
         """
@@ -345,15 +443,19 @@ class ConfigManager:
         Returns:
             Any: 配置值，不存在时返回默认值
         """
-        keys = key.split('.')
-        value = self.config
+        value = self._cfg_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
 
-        for k in keys:
+        value = self.config
+        for k in key.split('.'):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
+                # 不缓存缺失的键，调用方可能传入不同的默认值
                 return default
 
+        self._cfg_cache[key] = value
         return value
 
     def get_city_info(self, city_name: str) -> Optional[Dict[str, Any]]:
@@ -366,9 +468,9 @@ class ConfigManager:
         Returns:
             Optional[Dict]: 城市信息字典，不存在返回None
         """
-        return self.travel_knowledge['cities'].get(city_name)
+        return _load_travel_knowledge()['cities'].get(city_name)
 
-    def search_cities_by_tag(self, tag: str) -> List[str]:
+    def search_cities_by_tag(self, tag: str) -> Tuple[str, ...]:
         """
         根据标签搜索城市
 
@@ -376,18 +478,54 @@ class ConfigManager:
             tag: str 兴趣标签，如"美食"、"历史文化"等
 
         Returns:
-            List[str]: 匹配该标签的城市列表
+            Tuple[str, ...]: 匹配该标签的城市列表
         """
-        return self.travel_knowledge['interest_tags'].get(tag, [])
+        return _load_travel_knowledge()['interest_tags'].get(tag, ())
 
-    def get_all_cities(self) -> List[str]:
+    def get_all_cities(self) -> Tuple[str, ...]:
         """
         获取所有城市列表
 
         Returns:
-            List[str]: 支持的城市名称列表
+            Tuple[str, ...]: 支持的城市名称列表
         """
-        return list(self.travel_knowledge['cities'].keys())
+        return _load_city_names()
+
+    def cities_in_region(self, region: str) -> Tuple[str, ...]:
+        """
+        获取指定地区的城市
+
+        Args:
+            region: str 地区名称，如"华东"、"内蒙古"
+
+        Returns:
+            Tuple[str, ...]: 该地区的城市，不存在返回空元组
+        """
+        return _load_travel_indexes()[0].get(region, ())
+
+    def cities_by_combined_tag(self, tag: str) -> FrozenSet[str]:
+        """
+        根据标签搜索城市（合并城市自身 tags 与 interest_tags）
+
+        Args:
+            tag: str 标签，如"美食"、"草原"
+
+        Returns:
+            FrozenSet[str]: 匹配该标签的城市集合
+        """
+        return _load_travel_indexes()[1].get(tag, frozenset())
+
+    def attractions_by_type(self, attraction_type: str) -> Tuple[Tuple[str, Dict[str, Any]], ...]:
+        """
+        根据景点类型查询景点
+
+        Args:
+            attraction_type: str 景点类型，如"园林"、"历史遗迹"
+
+        Returns:
+            Tuple: (城市, 景点信息) 元组序列
+        """
+        return _load_travel_indexes()[2].get(attraction_type, ())
 
     def get_available_models(self) -> List[Dict[str, Any]]:
         """
@@ -396,18 +534,7 @@ class ConfigManager:
         Returns:
             List[Dict]: 模型信息列表，每个包含model_id、name、provider、model
         """
-        models = []
-        for model_id, config in self.models_config.items():
-            provider_type = config.get('provider', 'openai')
-            model_name = config.get('model', model_id)
-            display_name = config.get('name', model_id)
-            models.append({
-                'model_id': model_id,
-                'name': display_name,
-                'provider': provider_type,
-                'model': model_name
-            })
-        return models
+        return self._available_models
 
     def get_model_config(self, model_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -422,13 +549,16 @@ class ConfigManager:
         Raises:
             ValueError: 模型ID不存在时抛出
         """
-        if model_id is None:
+        # 默认模型走预先解析的引用
+        if model_id is None or model_id == self.default_model_id:
+            if self._default_model_config is not None:
+                return self._default_model_config
             model_id = self.default_model_id
 
-        if model_id not in self.models_config:
+        config = self.models_config.get(model_id)
+        if config is None:
             raise ValueError(f"模型不存在: {model_id}")
-
-        return self.models_config[model_id]
+        return config
 
     def get_default_model_id(self) -> str:
         """
@@ -456,7 +586,7 @@ class ConfigManager:
         Returns:
             Dict[str, Any]: Agent配置字典
         """
-        return self.config.get('agent', {})
+        return self._agent
 
     @property
     def web_config(self) -> Dict[str, Any]:
@@ -466,7 +596,7 @@ class ConfigManager:
         Returns:
             Dict[str, Any]: Web服务配置字典
         """
-        return self.config.get('web', {})
+        return self._web
 
     @property
     def grpc_config(self) -> Dict[str, Any]:
@@ -476,208 +606,20 @@ class ConfigManager:
         Returns:
             Dict[str, Any]: gRPC服务配置字典
         """
-        return self.config.get('grpc', {})
-        self.travel_knowledge = {
-            "cities": {
-                "北京": {
-                    "region": "华北",
-                    "tags": ["历史文化", "首都", "古建筑"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 500,
-                    "recommended_days": 4,
-                    "attractions": [
-                        {"name": "故宫", "type": "历史遗迹", "duration": 4, "ticket": 60},
-                        {"name": "长城", "type": "历史遗迹", "duration": 6, "ticket": 40},
-                        {"name": "天坛", "type": "历史遗迹", "duration": 3, "ticket": 15},
-                        {"name": "颐和园", "type": "园林", "duration": 4, "ticket": 30}
-                    ]
-                },
-                "上海": {
-                    "region": "华东",
-                    "tags": ["现代都市", "购物", "美食"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 600,
-                    "recommended_days": 3,
-                    "attractions": [
-                        {"name": "外滩", "type": "城市景观", "duration": 3, "ticket": 0},
-                        {"name": "东方明珠", "type": "地标建筑", "duration": 2, "ticket": 180},
-                        {"name": "迪士尼乐园", "type": "主题乐园", "duration": 8, "ticket": 399},
-                        {"name": "豫园", "type": "园林", "duration": 2, "ticket": 40}
-                    ]
-                },
-                "杭州": {
-                    "region": "华东",
-                    "tags": ["自然风光", "人文历史", "休闲"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 400,
-                    "recommended_days": 3,
-                    "attractions": [
-                        {"name": "西湖", "type": "自然风光", "duration": 4, "ticket": 0},
-                        {"name": "灵隐寺", "type": "宗教文化", "duration": 3, "ticket": 45},
-                        {"name": "千岛湖", "type": "自然风光", "duration": 6, "ticket": 150},
-                        {"name": "宋城", "type": "主题乐园", "duration": 4, "ticket": 310}
-                    ]
-                },
-                "成都": {
-                    "region": "西南",
-                    "tags": ["美食", "休闲", "熊猫"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 350,
-                    "recommended_days": 4,
-                    "attractions": [
-                        {"name": "大熊猫繁育研究基地", "type": "动物园", "duration": 4, "ticket": 55},
-                        {"name": "宽窄巷子", "type": "历史街区", "duration": 3, "ticket": 0},
-                        {"name": "武侯祠", "type": "历史遗迹", "duration": 2, "ticket": 50},
-                        {"name": "都江堰", "type": "历史遗迹", "duration": 5, "ticket": 80}
-                    ]
-                },
-                "西安": {
-                    "region": "西北",
-                    "tags": ["历史文化", "古都", "美食"],
-                    "best_season": ["春季", "秋季"],
-                    "avg_budget_per_day": 400,
-                    "recommended_days": 4,
-                    "attractions": [
-                        {"name": "兵马俑", "type": "历史遗迹", "duration": 4, "ticket": 120},
-                        {"name": "大雁塔", "type": "历史遗迹", "duration": 2, "ticket": 50},
-                        {"name": "古城墙", "type": "历史遗迹", "duration": 3, "ticket": 54},
-                        {"name": "华清宫", "type": "历史遗迹", "duration": 3, "ticket": 120}
-                    ]
-                },
-                "厦门": {
-                    "region": "华南",
-                    "tags": ["海滨", "休闲", "文艺"],
-                    "best_season": ["春季", "秋季", "冬季"],
-                    "avg_budget_per_day": 450,
-                    "recommended_days": 3,
-                    "attractions": [
-                        {"name": "鼓浪屿", "type": "海岛", "duration": 6, "ticket": 0},
-                        {"name": "南普陀寺", "type": "宗教文化", "duration": 2, "ticket": 0},
-                        {"name": "曾厝垵", "type": "历史街区", "duration": 3, "ticket": 0},
-                        {"name": "环岛路", "type": "城市景观", "duration": 3, "ticket": 0}
-                    ]
-                },
-                "呼和浩特": {
-                    "region": "内蒙古",
-                    "tags": ["草原", "历史文化", "美食", "民族风情"],
-                    "best_season": ["夏季", "秋季"],
-                    "avg_budget_per_day": 350,
-                    "recommended_days": 3,
-                    "attractions": [
-                        {"name": "大召寺", "type": "宗教文化", "duration": 2, "ticket": 35},
-                        {"name": "内蒙古博物馆", "type": "博物馆", "duration": 2, "ticket": 0},
-                        {"name": "昭君墓", "type": "历史遗迹", "duration": 2, "ticket": 65},
-                        {"name": "敕勒川草原", "type": "自然风光", "duration": 4, "ticket": 0}
-                    ]
-                },
-                "呼伦贝尔": {
-                    "region": "内蒙古",
-                    "tags": ["草原", "自然风光", "民族风情", "美食"],
-                    "best_season": ["夏季", "秋季"],
-                    "avg_budget_per_day": 450,
-                    "recommended_days": 4,
-                    "attractions": [
-                        {"name": "呼伦贝尔大草原", "type": "自然风光", "duration": 6, "ticket": 0},
-                        {"name": "额尔古纳湿地", "type": "自然风光", "duration": 4, "ticket": 65},
-                        {"name": "满洲里国门", "type": "历史遗迹", "duration": 2, "ticket": 80},
-                        {"name": "套娃广场", "type": "主题广场", "duration": 2, "ticket": 0}
-                    ]
-                },
-                "包头": {
-                    "region": "内蒙古",
-                    "tags": ["草原", "工业", "美食"],
-                    "best_season": ["夏季", "秋季"],
-                    "avg_budget_per_day": 300,
-                    "recommended_days": 2,
-                    "attractions": [
-                        {"name": "赛罕塔拉公园", "type": "自然风光", "duration": 3, "ticket": 0},
-                        {"name": "北方兵器城", "type": "工业旅游", "duration": 2, "ticket": 50},
-                        {"name": "五当召", "type": "宗教文化", "duration": 3, "ticket": 60}
-                    ]
-                }
-            },
-
-            "interest_tags": {
-                "历史文化": ["北京", "西安", "洛阳", "南京"],
-                "自然风光": ["杭州", "桂林", "张家界", "九寨沟", "呼伦贝尔"],
-                "现代都市": ["上海", "深圳", "广州", "香港"],
-                "美食": ["成都", "重庆", "广州", "西安", "呼和浩特", "呼伦贝尔"],
-                "海滨度假": ["三亚", "厦门", "青岛", "大连"],
-                "休闲养生": ["杭州", "成都", "丽江", "大理"],
-                "草原风光": ["呼伦贝尔", "呼和浩特", "包头"],
-                "民族风情": ["呼和浩特", "呼伦贝尔", "大理", "丽江"]
-            }
-        }
-
-    def get_config(self, key: str, default: Any = None) -> Any:
-        """获取配置值，支持嵌套键如 'web.port'"""
-        keys = key.split('.')
-        value = self.config
+        return self._grpc
 
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-
-        return value
 
-    def get_city_info(self, city_name: str) -> Optional[Dict[str, Any]]:
-        """获取城市信息"""
-        return self.travel_knowledge['cities'].get(city_name)
-
-    def search_cities_by_tag(self, tag: str) -> List[str]:
-        """根据标签搜索城市"""
-        return self.travel_knowledge['interest_tags'].get(tag, [])
-
-    def get_all_cities(self) -> List[str]:
-        """获取所有城市列表"""
-        return list(self.travel_knowledge['cities'].keys())
-
-    def get_available_models(self) -> List[Dict[str, Any]]:
-        """获取可用模型列表"""
-        models = []
-        for model_id, config in self.models_config.items():
-            provider_type = config.get('provider', 'openai')
-            model_name = config.get('model', model_id)
-            display_name = config.get('name', model_id)
-            models.append({
-                'model_id': model_id,
-                'name': display_name,
-                'provider': provider_type,
-                'model': model_name
-            })
-        return models
-
-    def get_model_config(self, model_id: Optional[str] = None) -> Dict[str, Any]:
-        """获取模型配置"""
-        if model_id is None:
-            model_id = self.default_model_id
-
-        if model_id not in self.models_config:
-            raise ValueError(f"模型不存在: {model_id}")
-
-        return self.models_config[model_id]
-
-    def get_default_model_id(self) -> str:
-        """获取默认模型ID"""
-        return self.default_model_id
+@lru_cache(maxsize=4)
+def get_config_manager(config_path: str = "config/llm_config.yaml") -> ConfigManager:
+    """
+    获取指定配置文件的共享配置管理器（推荐入口）
 
-    def get_default_model_config(self) -> Dict[str, Any]:
-        """获取默认模型配置"""
-        return self.get_model_config(self.default_model_id)
+    同一路径在进程内只加载一次，避免多个模块重复读取和解析配置文件。
 
-    @property
-    def agent_config(self) -> Dict[str, Any]:
-        """获取 Agent 配置"""
-        return self.config.get('agent', {})
+    Args:
+        config_path: str 配置文件路径，支持.yaml和.json格式
 
-    @property
-    def web_config(self) -> Dict[str, Any]:
-        """获取 Web 服务配置"""
-        return self.config.get('web', {})
-
-    @property
-    def grpc_config(self) -> Dict[str, Any]:
-        """获取 gRPC 服务配置"""
-        return self.config.get('grpc', {})
+    Returns:
+        ConfigManager: 共享的配置管理器实例
+    """
+    return ConfigManager(config_path)
@@ -24,8 +24,13 @@ pydantic Settings 模块 - 应用配置设置
     # 访问配置
     print(settings.llm_model)
     print(settings.grpc_port)
+
+    # 方式4: 获取进程内共享的默认实例（推荐，只做一次校验）
+    settings = get_settings()
 """
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 
 
@@ -64,7 +69,7 @@ class Settings(BaseSettings):
     # ========================================
     llm_api_base: str = ""  # LLM API基础URL
     llm_api_key: str = ""  # LLM API密钥
-    llm_model: str = "gpt-4o-mini  # 默认模型
+    llm_model: str = "gpt-4o-mini"  # 默认模型
     llm_temperature: float = 0.7  # 生成温度 (0.0-1.0)
     llm_max_tokens: int = 2000  # 最大输出token数
 
@@ -90,3 +95,17 @@ class Settings(BaseSettings):
     class Config:
         """Pydantic配置"""
         env_prefix = "SHUAI_TRAVEL_"  # 环境变量前缀
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    获取默认应用设置（进程内缓存）
+
+    Settings 构造时会读取环境变量并执行 pydantic 校验，
+    使用默认配置的调用方应通过本函数获取共享实例。
+
+    Returns:
+        Settings: 应用设置实例
+    """
+    return Settings()
@@ -38,17 +38,138 @@ result = await agent.run("规划北京三日游行程")
 import re
 import json
 import asyncio
-from typing import Dict, Any, Optional, List, Callable, Set
+import contextvars
+import copy
+import hashlib
+import threading
+import time
+from typing import Dict, Any, Optional, List, Callable, Deque, Set, Tuple, FrozenSet, NamedTuple
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from datetime import datetime
-from collections import deque
+from collections import OrderedDict, deque
+from itertools import islice
 import logging
 
-# 配置日志级别，确保在生产环境中可以灵活调整
-logging.basicConfig(level=logging.INFO)
+# 日志级别由应用入口配置（如 server.py），模块导入时不修改全局日志设置
 logger = logging.getLogger(__name__)
 
+# Markdown 代码块，在完整响应上单次匹配
+_JSON_FENCE_RE = re.compile(r"```json(.*?)(?:```|\Z)", re.DOTALL)
+_FENCE_RE = re.compile(r"```(.*?)(?:```|\Z)", re.DOTALL)
+
+# ------------------------------------------------------------------------------
+# 规则模式使用的预编译正则
+# ------------------------------------------------------------------------------
+# 优先使用线性时间的 RE2 引擎（可选依赖 google-re2），避免用户输入触发回溯，
+# 不可用时回退到标准库 re。以下模式均在 RE2 支持的语法范围内。
+try:
+    import re2 as _rule_re
+except ImportError:
+    _rule_re = re
+
+# 天数："X天" 或 "X 天"
+_DAYS_RE = _rule_re.compile(r"(\d+)\s*天")
+# 预算："X元"
+_BUDGET_RE = _rule_re.compile(r"(\d+)\s*元")
+# 城市名提取模式（按优先级排序）
+_CITY_PATTERNS = tuple(_rule_re.compile(p) for p in (
+    r"^(.+?)\s+计划",                         # "北京计划..."
+    r"^(.+?)\s+想要",                         # "北京想要..."
+    r"(?:去|在|到)(.+?)(?:旅游|游玩|旅行)?",   # "去北京旅游"
+    r"(.+?)的?攻略",                          # "北京攻略"
+))
+# 匹配结果包含这些词时不视为城市名
+_CITY_REJECT_RE = _rule_re.compile("推荐|建议|哪些|什么")
+
+# 思考/行动事件队列容量，超出时回调退回同步执行
+_EVENT_QUEUE_SIZE = 1024
+
+
+class _RunScope(NamedTuple):
+    """单次 run() 的回调与事件队列"""
+    step_callback: Optional[Callable] = None      # 步骤回调
+    think_callback: Optional[Callable] = None     # 思考流回调
+    event_queue: Optional[asyncio.Queue] = None   # 事件队列，为 None 时同步调用回调
+    thought_callback: Optional[Callable] = None   # 思考事件回调
+    action_callback: Optional[Callable] = None    # 行动事件回调
+
+
+# 同一个 agent 被并发请求共享时，按调用上下文隔离每次 run() 的回调与事件队列，
+# 每个请求只收到自己的事件
+_RUN_SCOPE: contextvars.ContextVar[_RunScope] = \
+    contextvars.ContextVar("react_run_scope", default=_RunScope())
+
+# 执行历史默认保留的最大条数
+_HISTORY_MAXLEN = 64
+
+# 单条历史中工具结果的最大字符数，超出部分转存到短期记忆
+_HISTORY_RESULT_LIMIT = 64 * 1024
+
+# 成功执行后即可结束循环的最终工具
+_TERMINAL_TOOLS = frozenset({"llm_chat", "generate_city_recommendation", "generate_route_plan"})
+
+# LLM 计划中的参数名映射，例如：city -> cities, destination -> cities
+_PARAM_MAPPING = {
+    'city': 'cities',
+    'destination': 'cities',
+    'location': 'cities',
+}
+
+# 任务关键词 -> 所属类别。一个关键词可属于多个类别：
+#   recommendation / query / planning 用于任务类型判断
+#   route 用于决定是否调用路线规划工具
+_TASK_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "推荐": ("recommendation",), "建议": ("recommendation",),
+    "哪些": ("recommendation",), "适合": ("recommendation",),
+    "查询": ("query",), "搜索": ("query",), "有什么": ("query",), "信息": ("query",),
+    "计划": ("planning",), "攻略": ("planning",),
+    "规划": ("planning", "route"), "路线": ("planning", "route"),
+    "行程": ("planning", "route"), "安排": ("planning", "route"),
+    "旅游": ("planning", "route"), "旅行": ("planning", "route"),
+    "游玩": ("planning", "route"), "出游": ("planning", "route"),
+    "出发": ("planning", "route"),
+}
+# 所有关键词合并为一个正则，单次扫描即可得到命中的类别（长词优先）
+_TASK_KEYWORD_RE = _rule_re.compile("|".join(
+    re.escape(kw) for kw in sorted(_TASK_KEYWORDS, key=len, reverse=True)
+))
+
+
+def _extract_city(task: str) -> Optional[str]:
+    """
+    按优先级依次尝试城市名提取模式
+
+    Args:
+        task: 用户输入的任务描述
+
+    Returns:
+        提取到的城市名，未匹配或匹配结果为"推荐"等关键词时返回 None
+    """
+    for pattern in _CITY_PATTERNS:
+        city_match = pattern.search(task)
+        if city_match:
+            city = city_match.group(1).strip()
+            if city and not _CITY_REJECT_RE.search(city):
+                return city
+    return None
+
+
+def _match_task_categories(task: str) -> Set[str]:
+    """
+    单次扫描任务描述，返回命中的关键词类别
+
+    Args:
+        task: 用户输入的任务描述
+
+    Returns:
+        命中的类别集合，如 {"recommendation", "route"}
+    """
+    categories: Set[str] = set()
+    for match in _TASK_KEYWORD_RE.finditer(task):
+        categories.update(_TASK_KEYWORDS[match.group()])
+    return categories
+
 
 def extract_json_from_markdown(content: str) -> str:
     """
@@ -69,12 +190,10 @@ def extract_json_from_markdown(content: str) -> str:
         >>> extract_json_from_markdown("hello")
         'hello'
     """
-    if "```json" in content:
-        # 提取 ```json 代码块中的内容
-        return content.split("```json")[1].split("```")[0].strip()
-    elif "```" in content:
-        # 提取 ``` 代码块中的内容
-        return content.split("```")[1].split("```")[0].strip()
+    # 优先提取 ```json 代码块，其次是普通 ``` 代码块；未闭合时取到末尾
+    match = _JSON_FENCE_RE.search(content) or _FENCE_RE.search(content)
+    if match:
+        return match.group(1).strip()
     return content
 
 
@@ -119,7 +238,7 @@ class ThoughtType(Enum):
     INFERENCE = auto()  # 推理型思考，用于从结果中得出结论
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolInfo:
     """
     工具信息数据类
@@ -135,6 +254,7 @@ class ToolInfo:
         timeout: 工具执行超时时间（秒），默认30秒
         category: 工具分类，如 "search"、"planning" 等
         tags: 工具标签列表，用于搜索和过滤
+        serialize: 是否必须单独执行（有副作用的工具设为 True，不与其他步骤并发）
     """
     name: str                           # 工具名称
     description: str                    # 工具功能描述
@@ -143,9 +263,10 @@ class ToolInfo:
     timeout: int = 30                   # 超时时间（秒）
     category: str = "general"           # 工具分类
     tags: List[str] = field(default_factory=list)  # 工具标签
+    serialize: bool = False             # 是否禁止并发执行
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """
     行动数据类
@@ -161,8 +282,7 @@ class Action:
         result: 执行结果（成功时）
         error: 错误信息（失败时）
         duration: 执行耗时（毫秒）
-        start_time: 开始时间（动态添加）
-        end_time: 结束时间（动态添加）
+        start_ns: 开始时间（time.monotonic_ns()，仅用于计算耗时）
 
     Examples:
         >>> action = Action(
@@ -179,6 +299,7 @@ class Action:
     result: Optional[Dict[str, Any]] = None      # 执行结果
     error: Optional[str] = None          # 错误信息
     duration: int = 0                    # 执行耗时（毫秒）
+    start_ns: int = field(default=0, init=False, repr=False)  # 开始时间（单调时钟纳秒）
 
     def mark_running(self) -> None:
         """
@@ -187,7 +308,7 @@ class Action:
         将状态设置为 RUNNING，并记录开始时间。
         """
         self.status = ActionStatus.RUNNING
-        self.start_time = datetime.now()
+        self.start_ns = time.monotonic_ns()
 
     def mark_success(self, result: Dict[str, Any]) -> None:
         """
@@ -198,10 +319,9 @@ class Action:
         """
         self.status = ActionStatus.SUCCESS
         self.result = result
-        self.end_time = datetime.now()
         # 计算执行耗时（毫秒）
-        if hasattr(self, "start_time"):
-            self.duration = int((self.end_time - self.start_time).total_seconds() * 1000)
+        if self.start_ns:
+            self.duration = (time.monotonic_ns() - self.start_ns) // 1_000_000
 
     def mark_failed(self, error: str) -> None:
         """
@@ -212,12 +332,11 @@ class Action:
         """
         self.status = ActionStatus.FAILED
         self.error = error
-        self.end_time = datetime.now()
-        if hasattr(self, "start_time"):
-            self.duration = int((self.end_time - self.start_time).total_seconds() * 1000)
+        if self.start_ns:
+            self.duration = (time.monotonic_ns() - self.start_ns) // 1_000_000
 
 
-@dataclass
+@dataclass(slots=True)
 class Thought:
     """
     思考数据类
@@ -230,7 +349,8 @@ class Thought:
         content: 思考内容文本
         confidence: 置信度（0-1之间），越高表示越确定
         reasoning_chain: 推理链，记录推理过程
-        decision: 决策结果，JSON 格式的行动计划
+        decision: 决策结果，JSON 格式的行动计划（用于展示和历史记录）
+        decision_plan: 决策结果的原始列表，执行时直接使用，免去 JSON 解析
     """
     id: str                             # 思考标识
     type: ThoughtType                   # 思考类型
@@ -238,9 +358,22 @@ class Thought:
     confidence: float = 0.8             # 置信度
     reasoning_chain: List[str] = field(default_factory=list)  # 推理链
     decision: Optional[str] = None      # 决策/行动计划
+    decision_plan: Optional[List[Dict[str, Any]]] = None  # 决策/行动计划（已解析）
+
+    def set_plan(self, plan: List[Dict[str, Any]]) -> None:
+        """
+        设置行动计划
+
+        同时保存原始列表和 JSON 文本，执行阶段无需再解析 decision。
+
+        Args:
+            plan: 行动计划列表，每项包含 step、action、params
+        """
+        self.decision_plan = plan
+        self.decision = json.dumps(plan)
 
 
-@dataclass
+@dataclass(slots=True)
 class Observation:
     """
     观察数据类
@@ -259,7 +392,7 @@ class Observation:
     observation_type: str = "data"      # 观察类型
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentStateData:
     """
     智能体状态数据类
@@ -269,19 +402,119 @@ class AgentStateData:
     Attributes:
         task: 当前任务描述
         goal: 任务目标（可选）
-        history: 执行历史记录
+        history: 执行历史记录（有界队列，超出容量时淘汰最旧记录）
         current_step: 当前执行步骤（0-based）
         max_steps: 最大执行步骤数
         state: 当前状态枚举值
         context: 上下文信息字典
+        updated_at: 最近一次状态更新时间
+        large_results: 本次任务中被截断的工具结果原文，键为截断摘要中的 _memory_id
     """
     task: str = ""                                      # 当前任务
     goal: Optional[str] = None                          # 任务目标
-    history: List[Dict[str, Any]] = field(default_factory=list)  # 执行历史
+    history: Deque[Dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=_HISTORY_MAXLEN))  # 执行历史
     current_step: int = 0                               # 当前步骤
     max_steps: int = 10                                 # 最大步骤
     state: AgentState = AgentState.IDLE                 # 当前状态
     context: Dict[str, Any] = field(default_factory=dict)  # 上下文
+    updated_at: Optional[datetime] = None               # 更新时间
+    large_results: Dict[str, Any] = field(default_factory=dict)  # 截断结果原文
+
+
+def _independent_group_end(decisions: List[Dict[str, Any]], start: int, limit: int) -> int:
+    """
+    计算从 start 开始可并发执行的连续步骤范围
+
+    后续步骤必须显式给出 depends_on，且不依赖 start 及之后的步骤，
+    才会并入同一组；未声明依赖的步骤按原有方式顺序执行。
+
+    Args:
+        decisions: 行动计划列表
+        start: 当前步骤序号
+        limit: 本组最多包含的步骤数
+
+    Returns:
+        int: 分组结束位置（不含）
+    """
+    end = start + 1
+    stop = min(len(decisions), start + max(limit, 1))
+    while end < stop:
+        deps = decisions[end].get("depends_on")
+        if not isinstance(deps, list) or any(
+                not isinstance(d, int) or d >= start for d in deps):
+            break
+        end += 1
+    return end
+
+
+def _format_tool_descriptions(tools) -> str:
+    """
+    将工具列表格式化为提示词中的描述文本
+
+    Args:
+        tools: ToolInfo 可迭代对象
+
+    Returns:
+        str: 每行一个工具，格式为 "- 名称: 描述 (参数: p1(type), ...)"
+    """
+    lines = []
+    for t in tools:
+        params = t.parameters.get("properties", {})
+        # 格式化参数描述
+        param_str = ", ".join(f"{k}({v.get('type', 'string')})" for k, v in params.items())
+        lines.append(f"- {t.name}: {t.description} (参数: {param_str})")
+    return "\n".join(lines)
+
+
+# 工具角色规则：工具名（小写）包含任一关键词即归入该角色，一个工具可属于多个角色
+_ROLE_RULES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("recommend", ("recommend", "search")),
+    ("city_info", ("city_info", "attraction")),
+    ("route", ("route", "plan")),
+    ("llm", ("llm_chat",)),
+)
+
+
+def _tool_roles(tool_name: str) -> Tuple[str, ...]:
+    """
+    根据工具名判断工具角色
+
+    Args:
+        tool_name: 工具名称
+
+    Returns:
+        工具所属的角色元组
+    """
+    name = tool_name.lower()
+    return tuple(role for role, keywords in _ROLE_RULES
+                 if any(kw in name for kw in keywords))
+
+
+def _index_tools_by_role(tools) -> Dict[str, ToolInfo]:
+    """
+    按角色索引工具，每个角色保留第一个匹配的工具
+
+    Args:
+        tools: ToolInfo 可迭代对象
+
+    Returns:
+        Dict[str, ToolInfo]: 角色 -> 工具
+    """
+    index: Dict[str, ToolInfo] = {}
+    for tool in tools:
+        for role in _tool_roles(tool.name):
+            index.setdefault(role, tool)
+    return index
+
+
+class _ToolSlot(NamedTuple):
+    """工具注册表中的单个工具记录"""
+    info: ToolInfo                   # 工具信息
+    executor: Callable               # 执行函数
+    is_coro: bool                    # 执行函数是否为协程函数
+    required_params: FrozenSet[str]  # 必需参数集合
+    timeout: int                     # 超时时间（秒）
 
 
 class ToolRegistry:
@@ -305,12 +538,14 @@ class ToolRegistry:
     """
 
     def __init__(self):
-        # 工具名称 -> 工具信息字典
-        self._tools: Dict[str, ToolInfo] = {}
-        # 工具名称 -> 执行函数字典
-        self._executors: Dict[str, Callable] = {}
+        # 工具名称 -> 工具槽位（工具信息、执行函数及注册时预计算的元数据）
+        self._tools: Dict[str, _ToolSlot] = {}
         # 并发安全锁
         self._lock = asyncio.Lock()
+        # 工具描述文本缓存，注册新工具时失效
+        self._desc_cache: Optional[str] = None
+        # 角色 -> 第一个注册的该角色工具，注册时维护
+        self._by_role: Dict[str, ToolInfo] = {}
 
     async def register(self, tool_info: ToolInfo, executor: Callable) -> bool:
         """
@@ -324,15 +559,36 @@ class ToolRegistry:
             bool: 注册成功返回 True，工具已存在返回 False
         """
         async with self._lock:
-            # 检查工具是否已存在
-            if tool_info.name in self._tools:
-                logger.warning(f"工具已存在: {tool_info.name}")
-                return False
-            # 注册工具信息和执行函数
-            self._tools[tool_info.name] = tool_info
-            self._executors[tool_info.name] = executor
-            logger.info(f"工具注册成功: {tool_info.name}")
-            return True
+            return self.register_sync(tool_info, executor)
+
+    def register_sync(self, tool_info: ToolInfo, executor: Callable) -> bool:
+        """
+        同步注册工具（不加锁，供初始化阶段调用）
+
+        Args:
+            tool_info: 工具信息对象
+            executor: 工具执行函数（可以是 sync 或 async 函数）
+
+        Returns:
+            bool: 注册成功返回 True，工具已存在返回 False
+        """
+        # 检查工具是否已存在
+        if tool_info.name in self._tools:
+            logger.warning("工具已存在: %s", tool_info.name)
+            return False
+        # 注册工具信息和执行函数，执行时需要的元数据在此一次性计算
+        self._tools[tool_info.name] = _ToolSlot(
+            info=tool_info,
+            executor=executor,
+            is_coro=asyncio.iscoroutinefunction(executor),
+            required_params=frozenset(tool_info.required_params),
+            timeout=tool_info.timeout
+        )
+        self._desc_cache = None
+        for role in _tool_roles(tool_info.name):
+            self._by_role.setdefault(role, tool_info)
+        logger.debug("工具注册成功: %s", tool_info.name)
+        return True
 
     def get_tool(self, tool_name: str) -> Optional[ToolInfo]:
         """
@@ -344,7 +600,8 @@ class ToolRegistry:
         Returns:
             ToolInfo: 工具信息对象，不存在返回 None
         """
-        return self._tools.get(tool_name)
+        slot = self._tools.get(tool_name)
+        return slot.info if slot else None
 
     def get_executor(self, tool_name: str) -> Optional[Callable]:
         """
@@ -356,7 +613,8 @@ class ToolRegistry:
         Returns:
             Callable: 执行函数，不存在返回 None
         """
-        return self._executors.get(tool_name)
+        slot = self._tools.get(tool_name)
+        return slot.executor if slot else None
 
     def list_tools(self) -> List[ToolInfo]:
         """
@@ -365,7 +623,39 @@ class ToolRegistry:
         Returns:
             List[ToolInfo]: 工具信息列表
         """
-        return list(self._tools.values())
+        return [slot.info for slot in self._tools.values()]
+
+    def first_by_role(self, role: str) -> Optional[ToolInfo]:
+        """
+        获取指定角色的第一个工具
+
+        Args:
+            role: 工具角色，如 "recommend"、"city_info"、"route"、"llm"
+
+        Returns:
+            ToolInfo: 工具信息，不存在返回 None
+        """
+        return self._by_role.get(role)
+
+    def tools_by_role(self) -> Dict[str, ToolInfo]:
+        """
+        获取角色索引（只读使用）
+
+        Returns:
+            Dict[str, ToolInfo]: 角色 -> 工具
+        """
+        return self._by_role
+
+    def describe_all(self) -> str:
+        """
+        获取所有工具的描述文本（用于 LLM 规划提示词）
+
+        Returns:
+            str: 每行一个工具，格式为 "- 名称: 描述 (参数: p1(type), ...)"
+        """
+        if self._desc_cache is None:
+            self._desc_cache = _format_tool_descriptions(self.list_tools())
+        return self._desc_cache
 
     async def execute(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -384,23 +674,24 @@ class ToolRegistry:
             ValueError: 工具不存在或缺少必需参数
             TimeoutError: 工具执行超时
         """
-        tool_info = self.get_tool(tool_name)
-        if not tool_info:
+        slot = self._tools.get(tool_name)
+        if not slot:
             raise ValueError(f"工具不存在: {tool_name}")
 
-        executor = self.get_executor(tool_name)
+        executor = slot.executor
         if not executor:
             raise ValueError(f"工具执行函数未注册: {tool_name}")
 
-        # 验证必填参数
-        for param in tool_info.required_params:
-            if param not in params:
-                raise ValueError(f"缺少必需参数: {param}")
+        # 验证必填参数（集合差集），报错时按声明顺序给出第一个缺失参数
+        missing = slot.required_params - params.keys()
+        if missing:
+            param = next(p for p in slot.info.required_params if p in missing)
+            raise ValueError(f"缺少必需参数: {param}")
 
-        timeout_duration = tool_info.timeout
+        timeout_duration = slot.timeout
         try:
-            # 判断执行函数是否为异步函数
-            if asyncio.iscoroutinefunction(executor):
+            # 执行函数是否为异步函数已在注册时判断
+            if slot.is_coro:
                 # 异步函数：使用 asyncio.wait_for 控制超时
                 result = await asyncio.wait_for(executor(**params), timeout=timeout_duration)
             else:
@@ -432,6 +723,8 @@ class ShortTermMemory:
         self.max_size = max_size
         # 使用 deque 实现自动淘汰旧数据
         self._memory: deque = deque(maxlen=max_size)
+        # 记忆 ID 计数器
+        self._id_counter = 0
 
     def add(self, content: Any, importance: float = 0.5) -> str:
         """
@@ -444,9 +737,9 @@ class ShortTermMemory:
         Returns:
             str: 生成的记忆 ID
         """
-        import uuid
-        # 生成唯一 ID
-        memory_id = str(uuid.uuid4())
+        # 生成实例内唯一的自增 ID（仅在本记忆内作为标识）
+        self._id_counter += 1
+        memory_id = f"mem_{self._id_counter}"
         # 存储记忆及元数据
         self._memory.append({
             "id": memory_id,
@@ -466,9 +759,8 @@ class ShortTermMemory:
         Returns:
             List[Dict]: 最近的记忆列表（按时间倒序）
         """
-        if limit < len(self._memory):
-            return list(self._memory)[-limit:][::-1]
-        return list(self._memory)[::-1]
+        # 从队尾反向遍历，只取需要的条目
+        return list(islice(reversed(self._memory), limit))
 
     def clear(self) -> None:
         """清空所有记忆"""
@@ -479,6 +771,82 @@ class ShortTermMemory:
         return len(self._memory)
 
 
+class _ExtractionCache:
+    """
+    LLM 结构化结果缓存
+
+    相同任务、相同工具集、相同模型的分析/规划/实体提取结果只请求一次 LLM，
+    以 (提示词版本, 类型, 任务, 工具名, 模型) 的 sha256 作为键，
+    保存解析后的 JSON 结果，按 LRU 淘汰。仅在进程内缓存，不落盘，
+    避免用户输入写入磁盘。
+
+    Attributes:
+        max_size: 最大缓存条目数
+    """
+
+    # 修改提示词后递增版本号，使旧缓存失效
+    PROMPT_VERSION = "v2"
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # gRPC 服务在线程池中运行，读写需加锁
+        self._lock = threading.Lock()
+
+    def make_key(self, kind: str, task: str, tool_names: Tuple[str, ...] = (),
+                 model_id: str = "") -> str:
+        """
+        构建缓存键
+
+        Args:
+            kind: 结果类型，如 "analyze"、"plan"、"entities"
+            task: 用户任务描述
+            tool_names: 可用工具名称
+            model_id: 模型标识
+
+        Returns:
+            str: sha256 十六进制摘要
+        """
+        raw = "|".join((self.PROMPT_VERSION, kind, task,
+                        ",".join(sorted(tool_names)), model_id))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, required_keys: Tuple[str, ...] = ()) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存，缺少必需字段的条目视为失效并淘汰
+
+        Args:
+            key: 缓存键
+            required_keys: 结果必须包含的字段
+
+        Returns:
+            Dict: 缓存的结果，未命中返回 None
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            if not all(k in value for k in required_keys):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            value: 解析后的结果
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
 class ThoughtEngine:
     """
     思考引擎
@@ -502,6 +870,8 @@ class ThoughtEngine:
         self.max_reasoning_depth = max_reasoning_depth
         self._thought_counter = 0
         self.llm_client = llm_client
+        # LLM 分析/规划结果缓存
+        self._cache = _ExtractionCache()
 
     def _create_thought(self, thought_type: ThoughtType, content: str) -> Thought:
         """
@@ -522,6 +892,42 @@ class ThoughtEngine:
             confidence=0.85
         )
 
+    def _chat_json(self, kind: str, task: str, messages: List[Dict[str, str]],
+                   required_keys: Tuple[str, ...] = (),
+                   tool_names: Tuple[str, ...] = ()) -> Optional[Dict[str, Any]]:
+        """
+        请求 LLM 并解析 JSON 结果，相同请求直接返回缓存
+
+        Args:
+            kind: 结果类型，参与缓存键构建
+            task: 用户任务描述
+            messages: 发送给 LLM 的消息
+            required_keys: 结果必须包含的字段，缺少时不写入缓存
+            tool_names: 可用工具名称，参与缓存键构建
+
+        Returns:
+            Dict: 解析后的结果，LLM 调用失败返回 None
+
+        Raises:
+            ValueError: LLM 返回内容不是合法 JSON
+        """
+        model_id = str(getattr(self.llm_client, "config", {}).get("model", ""))
+        key = self._cache.make_key(kind, task, tool_names, model_id)
+        cached = self._cache.get(key, required_keys)
+        if cached is not None:
+            logger.info("[ThoughtEngine] 命中LLM结果缓存: %s", kind)
+            return cached
+
+        result = self.llm_client.chat(messages, temperature=0.3)
+        if not result.get("success"):
+            return None
+
+        content = extract_json_from_markdown(result.get("content", ""))
+        data = json.loads(content)
+        if isinstance(data, dict) and all(k in data for k in required_keys):
+            self._cache.put(key, data)
+        return data
+
     def _extract_task_entities(self, task: str) -> Dict[str, Any]:
         """
         使用 LLM 提取任务实体
@@ -562,15 +968,13 @@ class ThoughtEngine:
             ]
 
             try:
-                result = self.llm_client.chat(messages, temperature=0.3)
-                if result.get("success"):
-                    # 提取 JSON 并解析
-                    content = extract_json_from_markdown(result.get("content", ""))
-                    entities = json.loads(content)
-                    logger.info(f"[ThoughtEngine] LLM提取实体: {entities}")
-                    return entities
+                entities = self._chat_json("entities", task, messages)
+                if entities is not None:
+                    logger.info("[ThoughtEngine] LLM提取实体: %s", entities)
+                    # 返回副本，避免调用方修改缓存内容
+                    return dict(entities)
             except Exception as e:
-                logger.error(f"[ThoughtEngine] LLM实体提取失败: {e}")
+                logger.error("[ThoughtEngine] LLM实体提取失败: %s", e)
 
         # LLM 失败时使用规则回退
         return self._extract_entities_by_rules(task)
@@ -589,27 +993,16 @@ class ThoughtEngine:
         """
         entities = {}
         # 提取天数：匹配 "X天" 或 "X 天" 格式
-        days_match = re.search(r"(\d+)\s*天", task)
+        days_match = _DAYS_RE.search(task)
         entities["days"] = int(days_match.group(1)) if days_match else 3
 
-        # 城市名提取模式列表（按优先级排序）
-        city_patterns = [
-            r"^(.+?)\s+计划",           # "北京计划..."
-            r"^(.+?)\s+想要",           # "北京想要..."
-            r"(?:去|在|到)(.+?)(?:旅游|游玩|旅行)?",  # "去北京旅游"
-            r"(.+?)的?攻略",            # "北京攻略"
-        ]
-        for pattern in city_patterns:
-            city_match = re.search(pattern, task)
-            if city_match:
-                city = city_match.group(1).strip()
-                # 排除包含"推荐"等关键词的情况
-                if city and not any(kw in city for kw in ["推荐", "建议", "哪些", "什么"]):
-                    entities["city"] = city
-                    break
+        # 提取城市名（排除包含"推荐"等关键词的情况）
+        city = _extract_city(task)
+        if city:
+            entities["city"] = city
 
         # 提取预算：匹配 "X元" 格式
-        budget_match = re.search(r"(\d+)\s*元", task)
+        budget_match = _BUDGET_RE.search(task)
         if budget_match:
             entities["budget"] = int(budget_match.group(1))
 
@@ -633,6 +1026,21 @@ class ThoughtEngine:
         else:
             return self._analyze_task_with_rules(task, context)
 
+    async def analyze_task_async(self, task: str, context: Dict[str, Any]) -> Thought:
+        """
+        异步分析任务
+
+        LLM 客户端为同步阻塞调用，放入线程池执行，便于与规划并发。
+
+        Args:
+            task: 用户任务描述
+            context: 上下文信息
+
+        Returns:
+            Thought: 分析结果思考对象
+        """
+        return await asyncio.to_thread(self.analyze_task, task, context)
+
     def _analyze_task_with_llm(self, task: str, context: Dict[str, Any]) -> Thought:
         """
         使用 LLM 分析任务
@@ -665,11 +1073,10 @@ class ThoughtEngine:
         ]
 
         try:
-            result = self.llm_client.chat(messages, temperature=0.3)
-            if result.get("success"):
-                content = extract_json_from_markdown(result.get("content", ""))
-                analysis = json.loads(content)
-                logger.info(f"[ThoughtEngine] LLM分析结果: {analysis}")
+            analysis = self._chat_json("analyze", task, messages,
+                                       required_keys=("reasoning", "tools"))
+            if analysis is not None:
+                logger.info("[ThoughtEngine] LLM分析结果: %s", analysis)
 
                 # 创建分析型思考
                 thought = self._create_thought(
@@ -677,7 +1084,7 @@ class ThoughtEngine:
                     f"【任务分析】{analysis.get('reasoning', '')}"
                 )
                 # 将工具列表转换为决策格式
-                thought.decision = json.dumps([{
+                thought.set_plan([{
                     "step": i + 1,
                     "action": tool.get("name", ""),
                     "params": tool.get("parameters", {})
@@ -685,7 +1092,7 @@ class ThoughtEngine:
                 thought.confidence = analysis.get("confidence", 0.85)
                 return thought
         except Exception as e:
-            logger.error(f"[ThoughtEngine] LLM分析失败: {e}")
+            logger.error("[ThoughtEngine] LLM分析失败: %s", e)
 
         return self._analyze_task_with_rules(task, context)
 
@@ -703,14 +1110,14 @@ class ThoughtEngine:
             Thought: 分析结果
         """
         entities = self._extract_entities_by_rules(task)
-        task_lower = task.lower()
+        categories = _match_task_categories(task)
 
-        # 根据关键词判断任务类型
-        if any(kw in task_lower for kw in ["推荐", "建议", "哪些", "适合"]):
+        # 根据关键词判断任务类型（按优先级）
+        if "recommendation" in categories:
             task_type = "recommendation"
-        elif any(kw in task_lower for kw in ["查询", "搜索", "有什么", "信息"]):
+        elif "query" in categories:
             task_type = "query"
-        elif any(kw in task_lower for kw in ["规划", "计划", "路线", "行程", "安排", "攻略", "旅游", "旅行", "游玩", "出游", "出发"]):
+        elif "planning" in categories:
             task_type = "planning"
         else:
             task_type = "general"
@@ -731,7 +1138,9 @@ class ThoughtEngine:
         return thought
 
     def plan_actions(self, task: str, tools: List[ToolInfo],
-                     constraints: Optional[List[str]] = None) -> Thought:
+                     constraints: Optional[List[str]] = None,
+                     tool_descriptions: Optional[str] = None,
+                     tools_by_role: Optional[Dict[str, ToolInfo]] = None) -> Thought:
         """
         规划行动步骤
 
@@ -741,17 +1150,44 @@ class ThoughtEngine:
             task: 用户任务描述
             tools: 可用工具列表
             constraints: 约束条件列表（可选）
+            tool_descriptions: 预先格式化的工具描述（可选，如 ToolRegistry.describe_all()）
+            tools_by_role: 预先构建的工具角色索引（可选，如 ToolRegistry.tools_by_role()）
 
         Returns:
             Thought: 规划结果思考
         """
         if self.llm_client:
-            return self._plan_actions_with_llm(task, tools, constraints)
+            return self._plan_actions_with_llm(task, tools, constraints, tool_descriptions,
+                                               tools_by_role)
         else:
-            return self._plan_actions_with_rules(task, tools, constraints)
+            return self._plan_actions_with_rules(task, tools, constraints, tools_by_role)
+
+    async def plan_actions_async(self, task: str, tools: List[ToolInfo],
+                                 constraints: Optional[List[str]] = None,
+                                 tool_descriptions: Optional[str] = None,
+                                 tools_by_role: Optional[Dict[str, ToolInfo]] = None) -> Thought:
+        """
+        异步规划行动步骤
+
+        LLM 客户端为同步阻塞调用，放入线程池执行，便于与分析并发。
+
+        Args:
+            task: 用户任务描述
+            tools: 可用工具列表
+            constraints: 约束条件列表（可选）
+            tool_descriptions: 预先格式化的工具描述（可选）
+            tools_by_role: 预先构建的工具角色索引（可选）
+
+        Returns:
+            Thought: 规划结果思考
+        """
+        return await asyncio.to_thread(self.plan_actions, task, tools, constraints,
+                                       tool_descriptions, tools_by_role)
 
     def _plan_actions_with_llm(self, task: str, tools: List[ToolInfo],
-                                constraints: Optional[List[str]] = None) -> Thought:
+                                constraints: Optional[List[str]] = None,
+                                tool_descriptions: Optional[str] = None,
+                                tools_by_role: Optional[Dict[str, ToolInfo]] = None) -> Thought:
         """
         使用 LLM 规划行动
 
@@ -761,39 +1197,38 @@ class ThoughtEngine:
             task: 用户任务描述
             tools: 可用工具列表
             constraints: 约束条件
+            tool_descriptions: 预先格式化的工具描述，为 None 时根据 tools 生成
+            tools_by_role: 工具角色索引，LLM 失败回退到规则模式时使用
 
         Returns:
             Thought: 规划结果
         """
-        # 构建工具描述列表
-        tool_descriptions = []
-        for t in tools:
-            params = t.parameters.get("properties", {})
-            # 格式化参数描述
-            param_str = ", ".join([f"{k}({v.get('type', 'string')})" for k, v in params.items()])
-            tool_descriptions.append(f"- {t.name}: {t.description} (参数: {param_str})")
+        # 构建工具描述列表（优先使用注册表缓存的文本）
+        if tool_descriptions is None:
+            tool_descriptions = _format_tool_descriptions(tools)
 
         system_prompt = f"""你是 ReAct 智能体，负责规划行动步骤。
 
 用户任务：{task}
 
 可用工具：
-{chr(10).join(tool_descriptions)}
+{tool_descriptions}
 
 请规划执行步骤。返回JSON格式：
 {{
   "reasoning": "选择理由",
   "steps": [
-    {{"action": "工具名", "params": {{"参数名": "参数值"}}, "reasoning": "为什么选这个工具"}}
+    {{"action": "工具名", "params": {{"参数名": "参数值"}}, "reasoning": "为什么选这个工具", "depends_on": [依赖的步骤序号]}}
   ]
-}}"""
+}}
+depends_on 填写该步骤需要使用其结果的前序步骤序号（从0开始），不依赖任何步骤时填 []。"""
 
         try:
-            result = self.llm_client.chat([{"role": "system", "content": system_prompt}], temperature=0.3)
-            if result.get("success"):
-                content = extract_json_from_markdown(result.get("content", ""))
-                plan = json.loads(content)
-                logger.info(f"[ThoughtEngine] LLM规划结果: {plan}")
+            plan = self._chat_json("plan", task, [{"role": "system", "content": system_prompt}],
+                                   required_keys=("reasoning", "steps"),
+                                   tool_names=tuple(t.name for t in tools))
+            if plan is not None:
+                logger.info("[ThoughtEngine] LLM规划结果: %s", plan)
 
                 steps = plan.get("steps", [])
                 thought = self._create_thought(
@@ -801,20 +1236,22 @@ class ThoughtEngine:
                     f"【执行计划】{plan.get('reasoning', '')}"
                 )
                 # 转换为统一格式
-                thought.decision = json.dumps([{
+                thought.set_plan([{
                     "step": s.get("step", i + 1),
                     "action": s.get("action") or s.get("tool", ""),
-                    "params": s.get("params") or s.get("parameters", {})
+                    "params": s.get("params") or s.get("parameters", {}),
+                    **({"depends_on": s["depends_on"]} if isinstance(s.get("depends_on"), list) else {})
                 } for i, s in enumerate(steps)])
                 thought.confidence = 0.9
                 return thought
         except Exception as e:
-            logger.error(f"[ThoughtEngine] LLM规划失败: {e}")
+            logger.error("[ThoughtEngine] LLM规划失败: %s", e)
 
-        return self._plan_actions_with_rules(task, tools, constraints)
+        return self._plan_actions_with_rules(task, tools, constraints, tools_by_role)
 
     def _plan_actions_with_rules(self, task: str, tools: List[ToolInfo],
-                                  constraints: Optional[List[str]] = None) -> Thought:
+                                  constraints: Optional[List[str]] = None,
+                                  tools_by_role: Optional[Dict[str, ToolInfo]] = None) -> Thought:
         """
         使用规则规划行动
 
@@ -824,11 +1261,12 @@ class ThoughtEngine:
             task: 用户任务描述
             tools: 可用工具列表
             constraints: 约束条件
+            tools_by_role: 工具角色索引（可选）
 
         Returns:
             Thought: 规划结果
         """
-        steps = self._decompose_task_by_rules(task, tools)
+        steps = self._decompose_task_by_rules(task, tools, tools_by_role)
 
         # 构建规划内容
         content = f"""【执行计划】根据任务分析结果，制定以下执行方案：
@@ -859,7 +1297,7 @@ class ThoughtEngine:
         thought.reasoning_chain.append("准备按计划执行各步骤")
 
         if steps:
-            thought.decision = json.dumps([{
+            thought.set_plan([{
                 "step": i + 1,
                 "action": s.tool_name,
                 "params": s.parameters
@@ -867,7 +1305,8 @@ class ThoughtEngine:
 
         return thought
 
-    def _decompose_task_by_rules(self, task: str, tools: List[ToolInfo]) -> List[Action]:
+    def _decompose_task_by_rules(self, task: str, tools: List[ToolInfo],
+                                 tools_by_role: Optional[Dict[str, ToolInfo]] = None) -> List[Action]:
         """
         使用规则分解任务
 
@@ -876,74 +1315,65 @@ class ThoughtEngine:
         Args:
             task: 用户任务描述
             tools: 可用工具列表
+            tools_by_role: 工具角色索引，为 None 时根据 tools 构建
 
         Returns:
             List[Action]: 分解后的行动列表
         """
+        if tools_by_role is None:
+            tools_by_role = _index_tools_by_role(tools)
         actions = []
-        task_lower = task.lower()
+        categories = _match_task_categories(task)
 
         # 提取天数
-        days_match = re.search(r"(\d+)\s*天", task)
+        days_match = _DAYS_RE.search(task)
         days = int(days_match.group(1)) if days_match else 3
 
         # 提取城市
-        city = None
-        city_patterns = [
-            r"^(.+?)\s+计划",
-            r"^(.+?)\s+想要",
-            r"(?:去|在|到)(.+?)(?:旅游|游玩|旅行)?",
-            r"(.+?)的?攻略",
-        ]
-        for pattern in city_patterns:
-            city_match = re.search(pattern, task)
-            if city_match:
-                city = city_match.group(1).strip()
-                if city and not any(kw in city for kw in ["推荐", "建议", "哪些", "什么"]):
-                    break
+        city = _extract_city(task)
 
         # 根据任务类型选择工具
         # 1. 推荐类任务 -> 搜索工具
-        if any(kw in task_lower for kw in ["推荐", "建议", "哪些", "适合"]):
-            recommend_tools = [t for t in tools if "recommend" in t.name.lower() or "search" in t.name.lower()]
-            if recommend_tools:
+        if "recommendation" in categories:
+            recommend_tool = tools_by_role.get("recommend")
+            if recommend_tool:
                 actions.append(Action(
                     id=f"action_{len(actions)}",
-                    tool_name=recommend_tools[0].name,
+                    tool_name=recommend_tool.name,
                     parameters={"interests": [], "budget_min": None, "budget_max": None, "season": None}
                 ))
 
         # 2. 城市相关任务 -> 城市信息工具
         if city:
-            city_info_tools = [t for t in tools if "city_info" in t.name.lower() or "attraction" in t.name.lower()]
-            if city_info_tools:
+            city_info_tool = tools_by_role.get("city_info")
+            if city_info_tool:
                 actions.append(Action(
                     id=f"action_{len(actions)}",
-                    tool_name=city_info_tools[0].name,
+                    tool_name=city_info_tool.name,
                     parameters={"city": city}
                 ))
 
         # 3. 规划类任务 -> 路线规划工具
-        route_tools = [t for t in tools if "route" in t.name.lower() or "plan" in t.name.lower()]
-        if route_tools and (any(kw in task_lower for kw in ["规划", "路线", "行程", "安排"]) or
-                           any(kw in task_lower for kw in ["旅游", "旅行", "游玩", "出游", "出发"])):
+        route_tool = tools_by_role.get("route")
+        if route_tool and "route" in categories:
             actions.append(Action(
                 id=f"action_{len(actions)}",
-                tool_name=route_tools[0].name,
+                tool_name=route_tool.name,
                 parameters={"city": city or "未知", "days": days}
             ))
 
         # 4. 默认 -> LLM 对话工具
         if not actions:
-            llm_tools = [t for t in tools if "llm_chat" in t.name.lower()]
-            if llm_tools:
+            llm_tool = tools_by_role.get("llm")
+            if llm_tool:
                 actions.append(Action(
                     id=f"action_{len(actions)}",
-                    tool_name=llm_tools[0].name,
+                    tool_name=llm_tool.name,
                     parameters={"query": task}
                 ))
 
-        logger.info(f"[ReAct] 生成 {len(actions)} 个动作: {[a.tool_name for a in actions]}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[ReAct] 生成 %d 个动作: %s", len(actions), [a.tool_name for a in actions])
         return actions
 
     def reflect(self, action_result: Dict[str, Any]) -> Thought:
@@ -1065,10 +1495,16 @@ class ReActAgent:
         # 历史记录
         self.action_history: List[Action] = []
         self.thought_history: List[Thought] = []
+        # 最近一次行动，避免每步反复读取 action_history[-1]
+        self._last_action: Optional[Action] = None
+        # 本次任务的成功步数与总耗时，在 _update_state 中累计
+        self._successful_steps = 0
+        self._total_duration_ms = 0
 
         # 事件回调列表
         self._on_thought_callbacks: List[Callable] = []
         self._on_action_callbacks: List[Callable] = []
+        self._on_step_callbacks: List[Callable] = []
 
         # 实时思考流回调
         self._think_stream_callback = None
@@ -1085,11 +1521,7 @@ class ReActAgent:
         Returns:
             bool: 注册成功返回 True
         """
-        if tool_info.name in self.tool_registry._tools:
-            return False
-        self.tool_registry._tools[tool_info.name] = tool_info
-        self.tool_registry._executors[tool_info.name] = executor
-        return True
+        return self.tool_registry.register_sync(tool_info, executor)
 
     def add_thought_callback(self, callback: Callable) -> None:
         """
@@ -1109,6 +1541,17 @@ class ReActAgent:
         """
         self._on_action_callbacks.append(callback)
 
+    def add_step_callback(self, callback: Callable) -> None:
+        """
+        添加步骤回调
+
+        每条执行历史记录写入后调用，便于调用方在执行过程中增量汇总结果。
+
+        Args:
+            callback: 回调函数，接收历史记录字典
+        """
+        self._on_step_callbacks.append(callback)
+
     def set_think_stream_callback(self, callback: Callable[[str, float], None]) -> None:
         """
         设置实时思考流回调
@@ -1124,70 +1567,161 @@ class ReActAgent:
         """
         通知思考事件
 
-        调用所有注册的思考回调。
+        run() 执行期间放入事件队列异步分发，否则直接调用所有注册的思考回调。
 
         Args:
             thought: 产生的思考对象
         """
-        for callback in self._on_thought_callbacks:
-            try:
-                callback(thought)
-            except Exception as e:
-                logger.error(f"思考回调错误: {e}")
+        if self._on_thought_callbacks or _RUN_SCOPE.get().thought_callback is not None:
+            self._emit_event("thought", thought)
 
     def _notify_action(self, action: Action) -> None:
         """
         通知行动事件
 
-        调用所有注册的行动回调。
+        run() 执行期间放入事件队列异步分发，否则直接调用所有注册的行动回调。
 
         Args:
             action: 执行的行动对象
         """
-        for callback in self._on_action_callbacks:
+        if self._on_action_callbacks or _RUN_SCOPE.get().action_callback is not None:
+            self._emit_event("action", action)
+
+    def _emit_event(self, kind: str, obj: Any) -> None:
+        """
+        发布事件
+
+        入队的是浅拷贝快照，回调看到的状态与事件发生时一致
+        （如行动的 RUNNING 状态不会被随后的执行结果覆盖）。
+        队列不存在或已满时退回同步调用。
+
+        Args:
+            kind: 事件类型，"thought"、"action" 或 "step"
+            obj: 思考、行动对象或历史记录
+        """
+        # 本次 run() 的回调在发布时绑定到事件上，分发时不会串到其他请求
+        scope = _RUN_SCOPE.get()
+        run_callback = getattr(scope, f"{kind}_callback")
+        if scope.event_queue is not None:
+            try:
+                scope.event_queue.put_nowait((kind, copy.copy(obj), run_callback))
+                return
+            except asyncio.QueueFull:
+                logger.warning("事件队列已满，回调改为同步执行")
+        self._invoke_callbacks(kind, obj, run_callback)
+
+    def _invoke_callbacks(self, kind: str, obj: Any, run_callback: Optional[Callable] = None) -> None:
+        """
+        调用指定类型事件的所有回调
+
+        Args:
+            kind: 事件类型，"thought"、"action" 或 "step"
+            obj: 思考、行动对象或历史记录
+            run_callback: 发布事件的 run() 调用传入的回调
+        """
+        if kind == "thought":
+            callbacks, label = self._on_thought_callbacks, "思考"
+        elif kind == "action":
+            callbacks, label = self._on_action_callbacks, "行动"
+        else:
+            callbacks, label = self._on_step_callbacks, "步骤"
+        if run_callback is not None:
+            callbacks = [*callbacks, run_callback]
+        for callback in callbacks:
             try:
-                callback(action)
+                callback(obj)
             except Exception as e:
-                logger.error(f"行动回调错误: {e}")
+                logger.error("%s回调错误: %s", label, e)
 
-    async def run(self, task: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def _dispatch_events(self, queue: asyncio.Queue) -> None:
+        """
+        事件分发任务
+
+        按入队顺序依次调用回调，收到 None 时结束。
+
+        Args:
+            queue: 事件队列
+        """
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+            self._invoke_callbacks(*event)
+
+    async def run(self, task: str, context: Optional[Dict[str, Any]] = None,
+                  step_callback: Optional[Callable] = None,
+                  think_callback: Optional[Callable[[str, float], None]] = None,
+                  thought_callback: Optional[Callable] = None,
+                  action_callback: Optional[Callable] = None) -> Dict[str, Any]:
         """
         执行任务
 
         启动 ReAct 循环，执行任务直到完成或达到最大步骤数。
+        执行期间的回调由事件分发任务调用，返回前等待所有事件分发完毕。
 
         Args:
             task: 用户任务描述
             context: 上下文信息（如用户偏好等）
+            step_callback: 仅本次执行的步骤回调，接收历史记录字典
+            think_callback: 仅本次执行的思考流回调，优先于 set_think_stream_callback 设置的回调
+            thought_callback: 仅本次执行的思考事件回调，接收思考对象
+            action_callback: 仅本次执行的行动事件回调，接收行动对象
 
         Returns:
             Dict: 执行结果，包含 success、history、steps_completed 等
         """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_EVENT_QUEUE_SIZE)
+        dispatcher = asyncio.create_task(self._dispatch_events(queue))
+        scope_token = _RUN_SCOPE.set(
+            _RunScope(step_callback, think_callback, queue, thought_callback, action_callback))
+        try:
+            return await self._run_loop(task, context)
+        finally:
+            _RUN_SCOPE.reset(scope_token)
+            await queue.put(None)
+            await dispatcher
+
+    async def _run_loop(self, task: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        ReAct 主循环
+
+        Args:
+            task: 用户任务描述
+            context: 上下文信息
+
+        Returns:
+            Dict: 执行结果
+        """
         self.state.task = task
         self.state.context = context or {}
         self.state.current_step = 0
-        self.state.history = []
+        # 每步记录一条历史，容量取 max_steps 即可保留完整执行过程
+        self.state.history = deque(maxlen=max(self.max_steps, 1))
+        self.state.large_results = {}
+        self._successful_steps = 0
+        self._total_duration_ms = 0
 
         self.current_state = AgentState.REASONING
         self._think_start_time = None  # 重置思考开始时间
 
-        logger.info(f"开始执行任务: {task}")
+        logger.info("开始执行任务: %s", task)
 
         try:
             # ReAct 主循环
             while self.state.current_step < self.max_steps:
                 # 首次思考时记录开始时间
                 if self._think_start_time is None:
-                    self._think_start_time = datetime.now()
+                    self._think_start_time = time.monotonic()
 
                 # 观察 -> 思考 -> 行动 -> 评估
                 observation = await self._observe()
                 thought = await self._think(observation)
 
                 # 实时流式输出思考内容
-                if self._think_stream_callback:
-                    elapsed = (datetime.now() - self._think_start_time).total_seconds()
-                    self._think_stream_callback(
+                think_callback = _RUN_SCOPE.get().think_callback or self._think_stream_callback
+                if think_callback:
+                    elapsed = time.monotonic() - self._think_start_time
+                    think_callback(
                         f"已思考（{elapsed:.1f}秒）\n\n{thought.content}",
                         elapsed
                     )
@@ -1196,18 +1730,19 @@ class ReActAgent:
                 if self._should_stop(thought):
                     break
 
-                action = await self._act(thought)
-                evaluation = await self._evaluate(action)
+                # 相互独立的计划步骤会在同一轮并发执行，逐个评估并记录
+                for action in await self._act(thought):
+                    evaluation = await self._evaluate(action)
 
-                # 更新状态和记录历史
-                self._update_state(action, evaluation)
-                self._record_history(thought, action, evaluation)
+                    # 更新状态和记录历史
+                    self._update_state(action, evaluation)
+                    self._record_history(thought, action, evaluation)
 
             self.current_state = AgentState.COMPLETED
             return self._build_result()
 
         except Exception as e:
-            logger.error(f"执行任务失败: {e}")
+            logger.error("执行任务失败: %s", e)
             self.current_state = AgentState.ERROR
             return {
                 "success": False,
@@ -1227,7 +1762,7 @@ class ReActAgent:
         """
         self.current_state = AgentState.OBSERVING
 
-        last_action = self.action_history[-1] if self.action_history else None
+        last_action = self._last_action
 
         return Observation(
             id=f"obs_{self.state.current_step}",
@@ -1253,22 +1788,38 @@ class ReActAgent:
         self.current_state = AgentState.REASONING
 
         if self.state.current_step == 0:
-            # 第一步：分析任务并制定计划
-            thought = self.thought_engine.analyze_task(
-                self.state.task,
-                self.state.context
-            )
-
-            # 始终生成执行计划
-            plan_thought = self.thought_engine.plan_actions(
-                self.state.task,
-                self.tool_registry.list_tools()
-            )
+            # 第一步：分析任务并制定计划（始终生成执行计划）
+            if self.thought_engine.llm_client:
+                # 分析与规划的 LLM 请求相互独立，并发执行以重叠网络等待
+                thought, plan_thought = await asyncio.gather(
+                    self.thought_engine.analyze_task_async(
+                        self.state.task,
+                        self.state.context
+                    ),
+                    self.thought_engine.plan_actions_async(
+                        self.state.task,
+                        self.tool_registry.list_tools(),
+                        tool_descriptions=self.tool_registry.describe_all(),
+                        tools_by_role=self.tool_registry.tools_by_role()
+                    )
+                )
+            else:
+                # 规则模式为纯本地计算，直接顺序执行
+                thought = self.thought_engine.analyze_task(
+                    self.state.task,
+                    self.state.context
+                )
+                plan_thought = self.thought_engine.plan_actions(
+                    self.state.task,
+                    self.tool_registry.list_tools(),
+                    tools_by_role=self.tool_registry.tools_by_role()
+                )
             thought.decision = plan_thought.decision
+            thought.decision_plan = plan_thought.decision_plan
             thought.reasoning_chain.extend(plan_thought.reasoning_chain)
         else:
             # 后续步骤：根据结果决定下一步
-            last_action = self.action_history[-1] if self.action_history else None
+            last_action = self._last_action
 
             if last_action and last_action.status == ActionStatus.FAILED:
                 # 执行失败：反思并调整策略
@@ -1342,14 +1893,14 @@ class ReActAgent:
         """
         # 条件1: 执行了最终工具且成功
         if thought.type == ThoughtType.INFERENCE:
-            last_action = self.action_history[-1] if self.action_history else None
-            if last_action and last_action.tool_name in ["llm_chat", "generate_city_recommendation", "generate_route_plan"]:
+            last_action = self._last_action
+            if last_action and last_action.tool_name in _TERMINAL_TOOLS:
                 if last_action.status == ActionStatus.SUCCESS:
                     return True
 
         # 条件2: 高置信度且有决策
         if thought.confidence > 0.9 and thought.decision:
-            last_action = self.action_history[-1] if self.action_history else None
+            last_action = self._last_action
             if last_action and last_action.status == ActionStatus.SUCCESS:
                 return True
 
@@ -1359,38 +1910,35 @@ class ReActAgent:
 
         return False
 
-    async def _act(self, thought: Thought) -> Action:
+    async def _act(self, thought: Thought) -> List[Action]:
         """
         行动阶段
 
-        根据思考决策执行工具调用。
+        根据思考决策执行工具调用。当前步骤之后若有声明了 depends_on
+        且不依赖本组内任何步骤的计划步骤，则与当前步骤一起并发执行。
 
         Args:
             thought: 思考对象，包含决策信息
 
         Returns:
-            Action: 执行结果行动对象
+            List[Action]: 本轮执行的行动对象，按计划顺序排列
         """
         self.current_state = AgentState.ACTING
 
-        action = self._extract_action(thought)
+        actions = self._extract_actions(thought)
 
-        if action:
-            # 执行工具调用
-            action.mark_running()
-            self.action_history.append(action)
-            self._notify_action(action)
+        if actions:
+            for action in actions:
+                action.mark_running()
+                self.action_history.append(action)
+                self._notify_action(action)
+            self._last_action = actions[-1]
 
-            try:
-                result = await self.tool_registry.execute(
-                    action.tool_name,
-                    action.parameters
-                )
-                action.mark_success(result)
-                logger.info(f"工具执行成功: {action.tool_name}")
-            except Exception as e:
-                action.mark_failed(str(e))
-                logger.error(f"工具执行失败: {action.tool_name}: {e}")
+            if len(actions) == 1:
+                await self._execute_action(actions[0])
+            else:
+                await asyncio.gather(*(self._execute_action(a) for a in actions))
+            return actions
         else:
             # 无需执行工具
             action = Action(
@@ -1401,64 +1949,91 @@ class ReActAgent:
             )
             action.mark_success({"message": "无操作需要执行"})
             self.action_history.append(action)
+            self._last_action = action
 
-        return action
+        return [action]
 
-    def _extract_action(self, thought: Thought) -> Optional[Action]:
+    async def _execute_action(self, action: Action) -> None:
+        """
+        执行单个行动的工具调用并记录结果
+
+        Args:
+            action: 已标记为运行中的行动对象
+        """
+        try:
+            result = await self.tool_registry.execute(
+                action.tool_name,
+                action.parameters
+            )
+            action.mark_success(result)
+            logger.info("工具执行成功: %s", action.tool_name)
+        except Exception as e:
+            action.mark_failed(str(e))
+            logger.error("工具执行失败: %s: %s", action.tool_name, e)
+
+    def _extract_actions(self, thought: Thought) -> List[Action]:
         """
         从思考中提取行动
 
-        解析思考的决策字段，生成具体的行动对象。
+        解析思考的决策字段，生成当前步骤及可与之并发的后续步骤的行动对象。
 
         Args:
             thought: 思考对象
 
         Returns:
-            Action: 行动对象，解析失败返回 None
+            List[Action]: 行动对象列表，解析失败返回空列表
         """
         if not thought.decision:
-            return None
+            return []
 
         try:
-            # 解析决策 JSON
-            if isinstance(thought.decision, str):
+            # 优先使用已解析的计划，仅在只有 JSON 文本时解析
+            if thought.decision_plan is not None:
+                decisions = thought.decision_plan
+            elif isinstance(thought.decision, str):
                 decisions = json.loads(thought.decision)
             else:
                 decisions = thought.decision if isinstance(thought.decision, list) else []
 
             if not decisions:
-                return None
+                return []
 
-            # 获取当前步骤对应的决策
+            # 获取当前步骤对应的决策，以及紧随其后的独立步骤
             current_step = self.state.current_step
             if current_step < len(decisions):
-                decision = decisions[current_step]
-                params = decision.get("params", {})
-
-                # 参数名映射：处理 LLM 生成的计划中参数名不匹配的问题
-                # 例如：city -> cities, destination -> cities
-                param_mapping = {
-                    'city': 'cities',
-                    'destination': 'cities',
-                    'location': 'cities',
-                }
-                mapped_params = {}
-                for k, v in params.items():
-                    mapped_key = param_mapping.get(k, k)
-                    # 如果参数期望是数组，但提供的是单个值，转换为数组
-                    if mapped_key == 'cities' and isinstance(v, str):
-                        v = [v]
-                    mapped_params[mapped_key] = v
-
-                return Action(
-                    id=f"action_{len(self.action_history)}",
-                    tool_name=decision.get("action", ""),
-                    parameters=mapped_params
-                )
-        except (json.JSONDecodeError, TypeError, KeyError):
+                end = _independent_group_end(decisions, current_step,
+                                             self.max_steps - current_step)
+                # 声明 serialize 的工具必须单独执行，分组在其之前截断
+                if end - current_step > 1:
+                    for j in range(current_step, end):
+                        tool = self.tool_registry.get_tool(decisions[j].get("action", ""))
+                        if tool is not None and tool.serialize:
+                            end = max(j, current_step + 1)
+                            break
+                base = len(self.action_history)
+                actions = []
+                for offset, decision in enumerate(decisions[current_step:end]):
+                    params = decision.get("params", {})
+
+                    # 参数名映射：处理 LLM 生成的计划中参数名不匹配的问题
+                    mapped_params = {}
+                    for k, v in params.items():
+                        mapped_key = _PARAM_MAPPING.get(k, k)
+                        # 如果参数期望是数组，但提供的是单个值，转换为数组
+                        if mapped_key == 'cities' and isinstance(v, str):
+                            v = [v]
+                        mapped_params[mapped_key] = v
+
+                    actions.append(Action(
+                        id=f"action_{base + offset}",
+                        tool_name=decision.get("action", ""),
+                        parameters=mapped_params
+                    ))
+                return actions
+        except (json.JSONDecodeError, TypeError, KeyError, AttributeError):
             pass
 
-        return None
+        return []
 
     async def _evaluate(self, action: Action) -> Dict[str, Any]:
         """
@@ -1488,6 +2063,11 @@ class ReActAgent:
             self.state.context["last_result"] = action.result
         self.state.updated_at = datetime.now()
 
+        # 累计统计，_build_result 无需再遍历历史
+        if evaluation.get("success", False):
+            self._successful_steps += 1
+        self._total_duration_ms += action.duration
+
     def _record_history(self, thought: Thought, action: Action,
                         evaluation: Dict[str, Any]) -> None:
         """
@@ -1500,16 +2080,28 @@ class ReActAgent:
             action: 行动对象
             evaluation: 评估结果
         """
+        result = action.result
+        if result:
+            # 过大的结果只在历史中保留摘要，完整内容转存到短期记忆
+            size = len(str(result))
+            if size > _HISTORY_RESULT_LIMIT:
+                memory_id = self.short_memory.add(
+                    {"action_id": action.id, "result": result}
+                )
+                # 短期记忆容量有限，原文另存一份到本次任务状态，生成回答前由 resolve_result 还原
+                self.state.large_results[memory_id] = result
+                result = {"_truncated": True, "_size": size, "_memory_id": memory_id}
+
         action_dict = {
             "id": action.id,
             "tool_name": action.tool_name,
             "status": action.status.name,
             "duration": action.duration,
-            "result": action.result,
+            "result": result,
             "error": action.error
         }
 
-        self.state.history.append({
+        entry = {
             "step": self.state.current_step,
             "thought": {
                 "id": thought.id,
@@ -1521,7 +2113,24 @@ class ReActAgent:
             "action": action_dict,
             "evaluation": evaluation,
             "timestamp": datetime.now().isoformat()
-        })
+        }
+        self.state.history.append(entry)
+        if self._on_step_callbacks or _RUN_SCOPE.get().step_callback is not None:
+            self._emit_event("step", entry)
+
+    def resolve_result(self, result: Any) -> Any:
+        """
+        还原历史中被截断的工具结果
+
+        Args:
+            result: 历史记录中的工具结果
+
+        Returns:
+            Any: 截断摘要对应的完整结果；非截断结果或原文已不可用时原样返回
+        """
+        if isinstance(result, dict) and result.get("_truncated"):
+            return self.state.large_results.get(result.get("_memory_id"), result)
+        return result
 
     def _build_result(self) -> Dict[str, Any]:
         """
@@ -1530,21 +2139,13 @@ class ReActAgent:
         Returns:
             Dict: 包含 success、history、steps_completed 等的 result 字典
         """
-        successful_steps = sum(
-            1 for step in self.state.history
-            if step.get("evaluation", {}).get("success", False)
-        )
-
         return {
             "success": self.current_state == AgentState.COMPLETED,
             "task": self.state.task,
-            "steps_completed": len(self.state.history),
-            "successful_steps": successful_steps,
-            "total_duration": sum(
-                step.get("action", {}).get("duration", 0)
-                for step in self.state.history
-            ),
-            "history": self.state.history
+            "steps_completed": self.state.current_step,
+            "successful_steps": self._successful_steps,
+            "total_duration": self._total_duration_ms,
+            "history": list(self.state.history)
         }
 
     def reset(self) -> None:
@@ -1558,3 +2159,6 @@ class ReActAgent:
         self.action_history.clear()
         self.thought_history.clear()
         self.short_memory.clear()
+        self._last_action = None
+        self._successful_steps = 0
+        self._total_duration_ms = 0
@@ -32,10 +32,16 @@ result = await agent.process("北京三日游推荐")
 """
 
 import json
+import logging
+import re
 import sys
 import os
+import time
+import weakref
 import asyncio
-from typing import Dict, Any, Optional, List
+import functools
+from collections import defaultdict, deque
+from typing import Dict, Any, Callable, DefaultDict, Deque, Mapping, Optional, List, Tuple
 from datetime import datetime
 
 # 添加父目录到路径以支持外部导入
@@ -47,9 +53,246 @@ if AGENT_SRC_DIR not in sys.path:
 
 # 使用绝对导入替代相对导入，提高代码可读性和可维护性
 from core.react_agent import ReActAgent, ToolInfo, Action, Thought, AgentState, ActionStatus
-from config.config_manager import ConfigManager
+from config.config_manager import ConfigManager, get_config_manager
 from memory.manager import MemoryManager
-from llm.client import LLMClient
+from llm.client import LLMClient, StreamError
+from environment.travel_data import TravelData
+
+logger = logging.getLogger(__name__)
+
+# 可选依赖：orjson 序列化速度明显快于标准库 json
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        """紧凑序列化为 JSON 文本（保留中文字符）"""
+        return orjson.dumps(obj, default=_json_default).decode('utf-8')
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        """紧凑序列化为 JSON 文本（保留中文字符）"""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+def _json_default(obj: Any) -> Any:
+    """序列化只读映射等非内置类型"""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# LLM 回答中的 JSON 代码块与裸 JSON 对象
+_JSON_BLOCK_RE = re.compile(r'```json\s*([\s\S]*?)\s*```')
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*\}')
+# 终结工具在同一轮 LLM 请求中给出的最终回答
+_FINAL_ANSWER_RE = re.compile(r'<final_answer>([\s\S]*?)</final_answer>')
+
+# 生成回答时每个城市最多提供给 LLM 的景点数量
+_PROMPT_MAX_ATTRACTIONS = 5
+
+# llm_chat 作为终结工具时附加的系统提示：直接产出面向用户的最终回答，
+# 省去 _generate_answer 再次请求 LLM 总结的一轮往返
+_FINAL_ANSWER_PROMPT = """你是一个热情、活泼的AI旅游小伙伴。请直接回答用户的问题，语气轻松，重点信息用**加粗**标记。
+将面向用户的完整回答放在 <final_answer> 与 </final_answer> 标签之间。"""
+
+
+# 工具元数据与配置无关，模块导入时构建一次，各 Agent 实例共享
+_TOOL_SCHEMAS: Tuple[ToolInfo, ...] = (
+    # ========== 工具1: 城市搜索 ==========
+    # 根据用户兴趣、预算和季节偏好搜索匹配的城市
+    ToolInfo(
+        name="search_cities",
+        description="根据用户兴趣、预算和季节偏好搜索匹配的城市",
+        parameters={
+            'type': 'object',
+            'properties': {
+                'interests': {
+                    'type': 'array',
+                    'items': {'type': 'string'},
+                    'description': '用户兴趣标签列表，如 ["美食", "历史", "自然风光"]'
+                },
+                'budget_min': {'type': 'integer', 'description': '最低预算金额（元）'},
+                'budget_max': {'type': 'integer', 'description': '最高预算金额（元）'},
+                'season': {'type': 'string', 'description': '旅行季节，如 "春季", "夏季"'}
+            }
+        },
+        required_params=[],  # 所有参数都是可选的
+        category='travel',
+        tags=['search', 'city', 'recommend']
+    ),
+
+    # ========== 工具2: 景点查询 ==========
+    # 查询指定城市的景点信息
+    ToolInfo(
+        name="query_attractions",
+        description="查询指定城市的景点信息",
+        parameters={
+            'type': 'object',
+            'properties': {
+                'cities': {
+                    'type': 'array',
+                    'items': {'type': 'string'},
+                    'description': '要查询的城市名称列表'
+                }
+            },
+            'required': ['cities']  # cities 是必填参数
+        },
+        required_params=['cities'],
+        category='travel',
+        tags=['query', 'attraction', 'scenic']
+    ),
+
+    # ========== 工具3: 路线生成 ==========
+    # 为指定城市生成详细的旅游路线规划
+    ToolInfo(
+        name="generate_route",
+        description="为指定城市生成详细的旅游路线规划",
+        parameters={
+            'type': 'object',
+            'properties': {
+                'city': {'type': 'string', 'description': '目标城市名称'},
+                'days': {'type': 'integer', 'description': '旅行天数，默认3天', 'default': 3}
+            },
+            'required': ['city']  # city 是必填参数
+        },
+        required_params=['city'],
+        category='travel',
+        tags=['route', 'plan', 'schedule']
+    ),
+
+    # ========== 工具4: 预算计算 ==========
+    # 计算指定城市和天数的旅游预算
+    ToolInfo(
+        name="calculate_budget",
+        description="计算指定城市和天数的旅游预算",
+        parameters={
+            'type': 'object',
+            'properties': {
+                'city': {'type': 'string', 'description': '目标城市'},
+                'days': {'type': 'integer', 'description': '旅行天数'}
+            },
+            'required': ['city', 'days']  # city 和 days 都是必填参数
+        },
+        required_params=['city', 'days'],
+        category='travel',
+        tags=['budget', 'cost', 'expense']
+    ),
+
+    # ========== 工具5: 城市信息 ==========
+    # 获取指定城市的详细信息
+    ToolInfo(
+        name="get_city_info",
+        description="获取指定城市的详细信息",
+        parameters={
+            'type': 'object',
+            'properties': {
+                'city': {'type': 'string', 'description': '城市名称'}
+            },
+            'required': ['city']
+        },
+        required_params=['city'],
+        category='travel',
+        tags=['city', 'info', 'detail']
+    ),
+
+    # ========== 工具6: LLM 对话 ==========
+    # 使用大语言模型进行对话回答
+    ToolInfo(
+        name="llm_chat",
+        description="使用大语言模型进行对话回答",
+        parameters={
+            'type': 'object',
+            'properties': {
+                'query': {'type': 'string', 'description': '用户问题'},
+                'context': {'type': 'string', 'description': '对话上下文'}
+            },
+            'required': ['query']
+        },
+        required_params=['query'],
+        category='ai',
+        tags=['chat', 'llm', 'ai']
+    ),
+
+    # ========== 工具7: 城市推荐 ==========
+    # 根据用户需求生成个性化城市推荐
+    ToolInfo(
+        name="generate_city_recommendation",
+        description="根据用户需求生成个性化城市推荐",
+        parameters={
+            'type': 'object',
+            'properties': {
+                'user_query': {'type': 'string', 'description': '用户原始需求'},
+                'available_cities': {
+                    'type': 'array',
+                    'items': {'type': 'string'},
+                    'description': '可选城市列表'
+                }
+            },
+            'required': ['user_query', 'available_cities']
+        },
+        required_params=['user_query', 'available_cities'],
+        category='ai',
+        tags=['recommend', 'city', 'llm']
+    ),
+
+    # ========== 工具8: 路线规划 ==========
+    # 根据城市景点信息生成详细路线规划
+    ToolInfo(
+        name="generate_route_plan",
+        description="根据城市景点信息生成详细路线规划",
+        parameters={
+            'type': 'object',
+            'properties': {
+                'city': {'type': 'string', 'description': '目标城市'},
+                'days': {'type': 'integer', 'description': '旅行天数'},
+                'preferences': {'type': 'string', 'description': '用户偏好'}
+            },
+            'required': ['city', 'days']
+        },
+        required_params=['city', 'days'],
+        category='ai',
+        tags=['route', 'plan', 'llm']
+    ),
+)
+
+
+def _make_executors(config_manager: ConfigManager) -> Tuple[Callable, ...]:
+    """
+    创建绑定到配置管理器的工具执行函数
+
+    Args:
+        config_manager: 配置管理器实例
+
+    Returns:
+        Tuple[Callable, ...]: 执行函数元组，顺序与 _TOOL_SCHEMAS 一致
+    """
+    search_cities_bound = functools.partial(_search_cities, config_manager)
+
+    def search_cities(interests=None, budget_min=None, budget_max=None, season=None):
+        # 预算上下限同时提供时才按预算筛选
+        budget = (budget_min, budget_max) if budget_min and budget_max else None
+        return search_cities_bound(interests, budget, season)
+
+    partial = functools.partial
+    return (
+        # search_cities
+        search_cities,
+        # query_attractions
+        partial(_query_attractions, config_manager),
+        # generate_route
+        partial(_generate_route, config_manager, days=3),
+        # calculate_budget
+        partial(_calculate_budget, config_manager),
+        # get_city_info
+        partial(_get_city_info, config_manager),
+        # 以下三个 LLM 工具为异步请求，等待 LLM 期间不占用线程
+        # llm_chat
+        partial(_llm_chat, config_manager),
+        # generate_city_recommendation
+        partial(_generate_recommendation, config_manager),
+        # generate_route_plan
+        partial(_generate_route_plan, config_manager),
+    )
 
 
 def create_travel_tools(config_manager: ConfigManager) -> List[tuple]:
@@ -82,200 +325,130 @@ def create_travel_tools(config_manager: ConfigManager) -> List[tuple]:
         >>> for tool_info, executor in tools:
         ...     agent.register_tool(tool_info, executor)
     """
-    from environment.travel_data import TravelData
+    return [(info, _timed(info.name, executor))
+            for info, executor in zip(_TOOL_SCHEMAS, _make_executors(config_manager))]
 
-    tools = []
 
-    # ========== 工具1: 城市搜索 ==========
-    # 根据用户兴趣、预算和季节偏好搜索匹配的城市
-    tools.append((
-        ToolInfo(
-            name="search_cities",
-            description="根据用户兴趣、预算和季节偏好搜索匹配的城市",
-            parameters={
-                'type': 'object',
-                'properties': {
-                    'interests': {
-                        'type': 'array',
-                        'items': {'type': 'string'},
-                        'description': '用户兴趣标签列表，如 ["美食", "历史", "自然风光"]'
-                    },
-                    'budget_min': {'type': 'integer', 'description': '最低预算金额（元）'},
-                    'budget_max': {'type': 'integer', 'description': '最高预算金额（元）'},
-                    'season': {'type': 'string', 'description': '旅行季节，如 "春季", "夏季"'}
-                }
-            },
-            required_params=[],  # 所有参数都是可选的
-            category='travel',
-            tags=['search', 'city', 'recommend']
-        ),
-        # 执行函数：调用内部函数处理搜索逻辑
-        lambda interests=None, budget_min=None, budget_max=None, season=None:
-            _search_cities(config_manager, interests, (budget_min, budget_max) if budget_min and budget_max else None, season)
-    ))
+# ==============================================================================
+# 调用耗时统计
+# ==============================================================================
 
-    # ========== 工具2: 景点查询 ==========
-    # 查询指定城市的景点信息
-    tools.append((
-        ToolInfo(
-            name="query_attractions",
-            description="查询指定城市的景点信息",
-            parameters={
-                'type': 'object',
-                'properties': {
-                    'cities': {
-                        'type': 'array',
-                        'items': {'type': 'string'},
-                        'description': '要查询的城市名称列表'
-                    }
-                },
-                'required': ['cities']  # cities 是必填参数
-            },
-            required_params=['cities'],
-            category='travel',
-            tags=['query', 'attraction', 'scenic']
-        ),
-        lambda cities: _query_attractions(config_manager, cities)
-    ))
+# 每个工具 / LLM 调用保留最近的耗时样本（纳秒）
+_LATENCY_SAMPLES = 1024
+_LATENCY: DefaultDict[str, Deque[int]] = defaultdict(lambda: deque(maxlen=_LATENCY_SAMPLES))
 
-    # ========== 工具3: 路线生成 ==========
-    # 为指定城市生成详细的旅游路线规划
-    tools.append((
-        ToolInfo(
-            name="generate_route",
-            description="为指定城市生成详细的旅游路线规划",
-            parameters={
-                'type': 'object',
-                'properties': {
-                    'city': {'type': 'string', 'description': '目标城市名称'},
-                    'days': {'type': 'integer', 'description': '旅行天数，默认3天', 'default': 3}
-                },
-                'required': ['city']  # city 是必填参数
-            },
-            required_params=['city'],
-            category='travel',
-            tags=['route', 'plan', 'schedule']
-        ),
-        lambda city, days=3: _generate_route(config_manager, city, days)
-    ))
 
-    # ========== 工具4: 预算计算 ==========
-    # 计算指定城市和天数的旅游预算
-    tools.append((
-        ToolInfo(
-            name="calculate_budget",
-            description="计算指定城市和天数的旅游预算",
-            parameters={
-                'type': 'object',
-                'properties': {
-                    'city': {'type': 'string', 'description': '目标城市'},
-                    'days': {'type': 'integer', 'description': '旅行天数'}
-                },
-                'required': ['city', 'days']  # city 和 days 都是必填参数
-            },
-            required_params=['city', 'days'],
-            category='travel',
-            tags=['budget', 'cost', 'expense']
-        ),
-        lambda city, days: _calculate_budget(config_manager, city, days)
-    ))
+def _timed(name: str, func: Callable) -> Callable:
+    """
+    包装执行函数，记录每次调用耗时
 
-    # ========== 工具5: 城市信息 ==========
-    # 获取指定城市的详细信息
-    tools.append((
-        ToolInfo(
-            name="get_city_info",
-            description="获取指定城市的详细信息",
-            parameters={
-                'type': 'object',
-                'properties': {
-                    'city': {'type': 'string', 'description': '城市名称'}
-                },
-                'required': ['city']
-            },
-            required_params=['city'],
-            category='travel',
-            tags=['city', 'info', 'detail']
-        ),
-        lambda city: _get_city_info(config_manager, city)
-    ))
+    保持同步/异步属性不变，ToolRegistry 仍能按协程函数直接 await。
 
-    # ========== 工具6: LLM 对话 ==========
-    # 使用大语言模型进行对话回答
-    tools.append((
-        ToolInfo(
-            name="llm_chat",
-            description="使用大语言模型进行对话回答",
-            parameters={
-                'type': 'object',
-                'properties': {
-                    'query': {'type': 'string', 'description': '用户问题'},
-                    'context': {'type': 'string', 'description': '对话上下文'}
-                },
-                'required': ['query']
-            },
-            required_params=['query'],
-            category='ai',
-            tags=['chat', 'llm', 'ai']
-        ),
-        lambda query, context="": _llm_chat(config_manager, query, context)
-    ))
+    Args:
+        name: 统计名称（工具名）
+        func: 原执行函数
 
-    # ========== 工具7: 城市推荐 ==========
-    # 根据用户需求生成个性化城市推荐
-    tools.append((
-        ToolInfo(
-            name="generate_city_recommendation",
-            description="根据用户需求生成个性化城市推荐",
-            parameters={
-                'type': 'object',
-                'properties': {
-                    'user_query': {'type': 'string', 'description': '用户原始需求'},
-                    'available_cities': {
-                        'type': 'array',
-                        'items': {'type': 'string'},
-                        'description': '可选城市列表'
-                    }
-                },
-                'required': ['user_query', 'available_cities']
-            },
-            required_params=['user_query', 'available_cities'],
-            category='ai',
-            tags=['recommend', 'city', 'llm']
-        ),
-        lambda user_query, available_cities: _generate_recommendation(config_manager, user_query, available_cities)
-    ))
+    Returns:
+        Callable: 记录耗时的执行函数
+    """
+    samples = _LATENCY[name]
+
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter_ns() - start)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter_ns() - start)
+    return wrapper
 
-    # ========== 工具8: 路线规划 ==========
-    # 根据城市景点信息生成详细路线规划
-    tools.append((
-        ToolInfo(
-            name="generate_route_plan",
-            description="根据城市景点信息生成详细路线规划",
-            parameters={
-                'type': 'object',
-                'properties': {
-                    'city': {'type': 'string', 'description': '目标城市'},
-                    'days': {'type': 'integer', 'description': '旅行天数'},
-                    'preferences': {'type': 'string', 'description': '用户偏好'}
-                },
-                'required': ['city', 'days']
-            },
-            required_params=['city', 'days'],
-            category='ai',
-            tags=['route', 'plan', 'llm']
-        ),
-        lambda city, days, preferences="": _generate_route_plan(config_manager, city, days, preferences)
-    ))
 
-    return tools
+def get_latency_stats() -> Dict[str, Dict[str, float]]:
+    """
+    获取各工具与 LLM 调用的耗时统计
+
+    Returns:
+        Dict[str, Dict[str, float]]: 名称 -> {count, avg_ms, p50_ms, p95_ms, max_ms}
+    """
+    stats = {}
+    for name, samples in list(_LATENCY.items()):
+        values = sorted(samples)
+        if not values:
+            continue
+        count = len(values)
+        stats[name] = {
+            'count': count,
+            'avg_ms': sum(values) / count / 1e6,
+            'p50_ms': values[count // 2] / 1e6,
+            'p95_ms': values[min(count - 1, int(count * 0.95))] / 1e6,
+            'max_ms': values[-1] / 1e6,
+        }
+    return stats
 
 
 # ==============================================================================
 # 工具执行函数
-# 这些函数是工具的具体实现，由 create_travel_tools 中定义的 lambda 调用
+# 这些函数是工具的具体实现，由 _make_executors 绑定配置管理器后调用
 # ==============================================================================
 
+# 每个配置管理器对应一个 TravelData 实例，工具调用时复用，避免重复构造。
+# 按配置管理器弱引用缓存，管理器被回收时条目随之移除。
+_ENV_CACHE: "weakref.WeakKeyDictionary[ConfigManager, TravelData]" = weakref.WeakKeyDictionary()
+
+
+def _env(config_manager) -> TravelData:
+    """
+    获取配置管理器对应的 TravelData 实例（首次调用时创建）
+
+    Args:
+        config_manager: 配置管理器
+
+    Returns:
+        TravelData: 缓存的旅游数据环境实例
+    """
+    env = _ENV_CACHE.get(config_manager)
+    if env is None:
+        # 缓存值只持有管理器的弱代理，否则值会让键永远存活
+        env = _ENV_CACHE.setdefault(config_manager, TravelData(weakref.proxy(config_manager)))
+    return env
+
+
+# LLM 客户端按配置管理器、模型 ID 两级共享，工具调用不再每次新建客户端；
+# 外层按配置管理器弱引用缓存，管理器被回收时其客户端随之释放
+_LLM_POOL: "weakref.WeakKeyDictionary[ConfigManager, Dict[str, LLMClient]]" = weakref.WeakKeyDictionary()
+
+
+def _llm(config_manager, model_id: Optional[str] = None) -> LLMClient:
+    """
+    获取共享的 LLM 客户端（首次调用时创建）
+
+    Args:
+        config_manager: 配置管理器
+        model_id: 模型 ID，为 None 则使用默认模型
+
+    Returns:
+        LLMClient: 缓存的 LLM 客户端实例
+    """
+    model_id = model_id or config_manager.get_default_model_id()
+    clients = _LLM_POOL.get(config_manager)
+    if clients is None:
+        clients = _LLM_POOL.setdefault(config_manager, {})
+    client = clients.get(model_id)
+    if client is None:
+        client = clients.setdefault(model_id, LLMClient(config_manager.get_model_config(model_id)))
+    return client
+
+
 def _search_cities(config_manager, interests: List[str] = None,
                    budget: tuple = None, season: str = None) -> Dict[str, Any]:
     """
@@ -298,8 +471,7 @@ def _search_cities(config_manager, interests: List[str] = None,
         ...     for city in result['cities']:
         ...         print(city['name'])
     """
-    from environment.travel_data import TravelData
-    env = TravelData(config_manager)
+    env = _env(config_manager)
     return env.search_cities(interests, budget, season)
 
 
@@ -322,8 +494,7 @@ def _query_attractions(config_manager, cities: List[str]) -> Dict[str, Any]:
         ...     for city, info in result['data'].items():
         ...         print(f"{city}: {len(info.get('attractions', []))} 个景点")
     """
-    from environment.travel_data import TravelData
-    env = TravelData(config_manager)
+    env = _env(config_manager)
     return env.query_attractions(cities)
 
 
@@ -357,8 +528,7 @@ def _generate_route(config_manager, city: str, days: int) -> Dict[str, Any]:
         ...     for day in result['route_plan']:
         ...         print(f"第{day['day']}天: {day['schedule']}")
     """
-    from environment.travel_data import TravelData
-    env = TravelData(config_manager)
+    env = _env(config_manager)
     result = env.get_city_info(city)
     if not result.get('success'):
         return result
@@ -368,25 +538,22 @@ def _generate_route(config_manager, city: str, days: int) -> Dict[str, Any]:
 
     # 生成路线计划
     # 策略：每天分配一个主要景点，按顺序循环
-    route_plan = []
-    for i in range(min(days, len(attractions))):
-        attr = attractions[i] if i < len(attractions) else {'name': '自由活动'}
-        route_plan.append({
-            'day': i + 1,
-            'attractions': [attr['name']] if isinstance(attr, dict) else [attr],
-            'schedule': f'游览{attr.get("name", "自由活动")}'
-        })
+    route_plan = [{
+        'day': i + 1,
+        'attractions': [attr['name']] if isinstance(attr, dict) else [attr],
+        'schedule': f'游览{attr.get("name", "自由活动")}'
+    } for i, attr in enumerate(attractions[:max(days, 0)])]
 
     # 计算费用估算
     # 门票费用 + 每日平均花费
+    tickets = sum(a.get('ticket', 0) for a in attractions[:days])
     return {
         'success': True,
         'city': city,
         'route_plan': route_plan,
         'total_cost_estimate': {
-            'tickets': sum(a.get('ticket', 0) for a in attractions[:days]),
-            'total': sum(a.get('ticket', 0) for a in attractions[:days]) +
-                     city_info.get('avg_budget_per_day', 400) * days
+            'tickets': tickets,
+            'total': tickets + city_info.get('avg_budget_per_day', 400) * days
         }
     }
 
@@ -405,8 +572,7 @@ def _calculate_budget(config_manager, city: str, days: int) -> Dict[str, Any]:
     Returns:
         Dict: 预算计算结果，包含各项目的费用明细
     """
-    from environment.travel_data import TravelData
-    env = TravelData(config_manager)
+    env = _env(config_manager)
     return env.calculate_budget(city, days)
 
 
@@ -426,12 +592,11 @@ def _get_city_info(config_manager, city: str) -> Dict[str, Any]:
         - city: 城市名称
         - info: 详细信息字典
     """
-    from environment.travel_data import TravelData
-    env = TravelData(config_manager)
+    env = _env(config_manager)
     return env.get_city_info(city)
 
 
-def _llm_chat(config_manager, query: str, context: str = "") -> Dict[str, Any]:
+async def _llm_chat(config_manager, query: str, context: str = "") -> Dict[str, Any]:
     """
     LLM 对话回答
 
@@ -443,29 +608,35 @@ def _llm_chat(config_manager, query: str, context: str = "") -> Dict[str, Any]:
         context: 对话上下文（可选）
 
     Returns:
-        Dict: LLM 回答结果，格式为 {'success': bool, 'response': str}
+        Dict: LLM 回答结果，格式为 {'success': bool, 'response': str}，
+        模型给出 <final_answer> 时额外包含 final_answer 字段
     """
-    llm_config = config_manager.get_default_model_config()
-    llm_client = LLMClient(llm_config)
+    llm_client = _llm(config_manager)
 
-    messages = [{"role": "user", "content": query}]
+    messages = [{"role": "system", "content": _FINAL_ANSWER_PROMPT},
+                {"role": "user", "content": query}]
     # 如果有上下文，添加到系统消息中
     if context:
-        messages.insert(0, {"role": "system", "content": context})
+        messages.insert(1, {"role": "system", "content": context})
 
-    result = llm_client.chat(messages)
+    result = await llm_client.achat(messages)
 
     # 标准化返回格式
     if isinstance(result, dict):
         if result.get('success') and 'content' in result:
-            return {'success': True, 'response': result['content']}
+            content = result['content']
+            final_match = _FINAL_ANSWER_RE.search(content)
+            if final_match:
+                final_answer = final_match.group(1).strip()
+                return {'success': True, 'response': final_answer, 'final_answer': final_answer}
+            return {'success': True, 'response': content}
         elif 'error' in result:
             return {'success': False, 'response': result['error']}
     return result
 
 
-def _generate_recommendation(config_manager, user_query: str,
-                             available_cities: List[str]) -> Dict[str, Any]:
+async def _generate_recommendation(config_manager, user_query: str,
+                                   available_cities: List[str]) -> Dict[str, Any]:
     """
     生成城市推荐
 
@@ -479,13 +650,12 @@ def _generate_recommendation(config_manager, user_query: str,
     Returns:
         Dict: 推荐结果，包含推荐的城市列表和理由
     """
-    llm_config = config_manager.get_default_model_config()
-    llm_client = LLMClient(llm_config)
-    return llm_client.generate_travel_recommendation(user_query, "", available_cities)
+    llm_client = _llm(config_manager)
+    return await llm_client.agenerate_travel_recommendation(user_query, "", available_cities)
 
 
-def _generate_route_plan(config_manager, city: str, days: int,
-                         preferences: str = "") -> Dict[str, Any]:
+async def _generate_route_plan(config_manager, city: str, days: int,
+                               preferences: str = "") -> Dict[str, Any]:
     """
     生成详细路线计划
 
@@ -505,9 +675,134 @@ def _generate_route_plan(config_manager, city: str, days: int,
         return {'success': False, 'error': f'未找到城市: {city}'}
 
     attractions = city_info.get('attractions', [])
-    llm_config = config_manager.get_default_model_config()
-    llm_client = LLMClient(llm_config)
-    return llm_client.generate_route_plan(city, days, attractions, preferences)
+    llm_client = _llm(config_manager)
+    return await llm_client.agenerate_route_plan(city, days, attractions, preferences)
+
+
+# 无执行历史时的推理过程文本
+_EMPTY_REASONING_TEMPLATE = (
+    "<thinking>\n[Timestamp: {timestamp}]\n\n[Intent Analysis]\nNo reasoning history available.\n\n"
+    "[Context Evaluation]\nNo context available.\n\n[Response Planning]\nUnable to generate response.\n\n"
+    "[Constraint Check]\nNo constraints checked.\n</thinking>"
+)
+
+
+def _trim_for_prompt(obj: Any) -> Any:
+    """
+    裁剪工具结果中的景点列表，减少写入提示词的内容
+
+    返回新的结构，不修改原对象（工具结果可能来自共享缓存）。
+
+    Args:
+        obj: 工具执行结果
+
+    Returns:
+        Any: 每个 attractions 列表最多保留 _PROMPT_MAX_ATTRACTIONS 项的副本
+    """
+    if isinstance(obj, Mapping):
+        return {
+            k: (list(v[:_PROMPT_MAX_ATTRACTIONS]) if k == 'attractions' and isinstance(v, (list, tuple))
+                else _trim_for_prompt(v))
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_trim_for_prompt(v) for v in obj]
+    return obj
+
+
+class _HistorySummary:
+    """
+    执行历史的增量汇总
+
+    ReAct 每记录一步历史即调用 add，执行结束后推理文本、工具列表与回答提取
+    直接读取汇总结果，无需再分别遍历历史。
+
+    Attributes:
+        steps: 已汇总的步骤数
+        intent_analysis: ANALYSIS 类型思考
+        context_evaluation: INFERENCE 类型思考及其工具状态
+        response_planning: PLANNING 类型思考
+        constraint_check: REFLECTION 类型思考
+        tools_used: 使用过的工具（去重，保持首次出现顺序）
+        has_success: 是否存在成功的行动
+        final_answer: 终结工具给出的最终回答（取最后一次）
+        tool_results: 成功且有结果的行动，按执行顺序排列的 (工具名, 结果)
+    """
+
+    __slots__ = ('steps', 'intent_analysis', 'context_evaluation', 'response_planning',
+                 'constraint_check', 'tools_used', 'has_success', 'final_answer',
+                 'tool_results')
+
+    def __init__(self):
+        self.steps = 0
+        self.intent_analysis: List[str] = []
+        self.context_evaluation: List[str] = []
+        self.response_planning: List[str] = []
+        self.constraint_check: List[str] = []
+        self.tools_used: Dict[str, None] = {}
+        self.has_success = False
+        self.final_answer: Optional[str] = None
+        self.tool_results: List[Tuple[str, Any]] = []
+
+    @classmethod
+    def from_history(cls, history: List[Dict]) -> "_HistorySummary":
+        """
+        一次遍历已有历史构建汇总
+
+        Args:
+            history: 执行历史列表
+
+        Returns:
+            _HistorySummary: 汇总结果
+        """
+        summary = cls()
+        for step in history:
+            summary.add(step)
+        return summary
+
+    def add(self, step: Dict[str, Any]) -> None:
+        """
+        汇总一条历史记录
+
+        Args:
+            step: ReAct 执行历史中的一条记录
+        """
+        self.steps += 1
+        index = self.steps
+        thought = step.get('thought', {})
+        action = step.get('action', {})
+
+        thought_type = thought.get('type', 'UNKNOWN')
+        thought_content = thought.get('content', '')
+        action_name = action.get('tool_name', '')
+        action_status = action.get('status', 'PENDING')
+
+        if thought_type == 'ANALYSIS':
+            if thought_content:
+                self.intent_analysis.append(f"Step {index}: {thought_content}")
+        elif thought_type == 'PLANNING':
+            if thought_content:
+                self.response_planning.append(f"Step {index}: {thought_content}")
+        elif thought_type == 'INFERENCE':
+            if thought_content:
+                self.context_evaluation.append(f"Step {index}: {thought_content}")
+            if action_name and action_name != 'none':
+                status_str = 'SUCCESS' if action_status == 'SUCCESS' else 'FAILED' if action_status == 'FAILED' else 'RUNNING'
+                self.context_evaluation.append(f"  - Tool: {action_name} [{status_str}]")
+        elif thought_type == 'REFLECTION':
+            if thought_content:
+                self.constraint_check.append(f"Step {index}: {thought_content}")
+
+        if action_name and action_name != 'none':
+            self.tools_used[action_name] = None
+
+        if action_status == 'SUCCESS':
+            self.has_success = True
+            result = action.get('result')
+            if result:
+                self.tool_results.append((action.get('tool_name', ''), result))
+            if isinstance(result, dict) and result.get('final_answer'):
+                self.final_answer = result['final_answer']
 
 
 # ==============================================================================
@@ -554,8 +849,8 @@ class ReActTravelAgent:
             model_id: 使用的模型 ID，为 None 则使用默认模型
             max_steps: ReAct 循环的最大执行步骤数
         """
-        # 初始化配置管理器
-        self.config_manager = ConfigManager(config_path)
+        # 获取共享的配置管理器，同一配置文件只加载一次
+        self.config_manager = get_config_manager(config_path)
 
         # 初始化记忆管理器
         # max_working_memory 控制短期工作记忆的大小
@@ -565,12 +860,8 @@ class ReActTravelAgent:
         )
 
         # 获取模型配置并初始化 LLM 客户端
-        if model_id:
-            llm_config = self.config_manager.get_model_config(model_id)
-        else:
-            llm_config = self.config_manager.get_default_model_config()
-
-        self.llm_client = LLMClient(llm_config)
+        # 与工具函数共用同一客户端池
+        self.llm_client = _llm(self.config_manager, model_id)
 
         # 传递 llm_client 给 ReActAgent，使其能使用 LLM 进行思考
         # 这是 ReAct 模式的关键：让智能体能够自主思考和规划
@@ -581,9 +872,8 @@ class ReActTravelAgent:
             llm_client=self.llm_client
         )
 
-        # 注册工具和回调
+        # 注册工具
         self._register_tools()
-        self._register_callbacks()
 
     def _register_tools(self) -> None:
         """
@@ -595,28 +885,113 @@ class ReActTravelAgent:
         for tool_info, executor in tools:
             self.react_agent.register_tool(tool_info, executor)
 
-    def _register_callbacks(self) -> None:
+    @staticmethod
+    def _message_callbacks(pending: List[Tuple[str, str]]) -> Tuple[Callable, Callable]:
         """
-        注册事件回调函数
+        创建单轮推理的思考/行动事件回调
 
         用于将 ReActAgent 的思考和行动事件同步到记忆管理器中，
-        以便维护完整的对话历史。
+        以便维护完整的对话历史。事件消息先暂存，推理结束后一次性写入。
+
+        Args:
+            pending: 本轮暂存 (角色, 内容) 消息的列表
+
+        Returns:
+            Tuple: (思考事件回调, 行动事件回调)
         """
         def on_thought(thought: Thought):
-            """思考事件回调：将思考内容添加到记忆"""
-            self.memory_manager.add_message('assistant', f"[思考] {thought.content}")
+            """思考事件回调：暂存思考内容"""
+            pending.append(('assistant', f"[思考] {thought.content}"))
 
         def on_action(action: Action):
-            """行动事件回调：根据状态记录不同消息"""
+            """行动事件回调：根据状态暂存不同消息"""
             if action.status == ActionStatus.RUNNING:
-                self.memory_manager.add_message('assistant', f"[行动] 执行工具: {action.tool_name}")
+                pending.append(('assistant', f"[行动] 执行工具: {action.tool_name}"))
             elif action.status == ActionStatus.SUCCESS:
-                self.memory_manager.add_message('assistant', f"[完成] {action.tool_name}")
+                pending.append(('assistant', f"[完成] {action.tool_name}"))
             elif action.status == ActionStatus.FAILED:
-                self.memory_manager.add_message('assistant', f"[失败] {action.tool_name}: {action.error}")
+                pending.append(('assistant', f"[失败] {action.tool_name}: {action.error}"))
+
+        return on_thought, on_action
+
+    async def _run_turn(self, user_input: str, step_callback=None, think_callback=None,
+                        answer_callback=None) -> Dict[str, Any]:
+        """
+        执行一轮完整对话
+
+        process 与 process_stream 共用的处理流程：记录用户输入、执行 ReAct 循环、
+        生成回答并写入对话历史。异常由调用方处理。
+
+        Args:
+            user_input: 用户的输入文本
+            step_callback: 仅本次执行的步骤回调，接收历史记录字典
+            think_callback: 仅本次执行的思考流回调，参数为 (思考内容, 已耗时秒数)
+            answer_callback: 回答内容回调，提供时回答边生成边推送
+
+        Returns:
+            Dict: 处理结果，格式同 process 方法
+        """
+        # 1. 将用户输入添加到对话历史
+        self.memory_manager.add_message('user', user_input)
+
+        # 2. 构建上下文信息
+        context = {
+            'user_query': user_input,
+            'user_preference': self.memory_manager.get_user_preference()
+        }
 
-        self.react_agent.add_thought_callback(on_thought)
-        self.react_agent.add_action_callback(on_action)
+        # 3. 执行 ReAct 推理循环（执行过程中增量汇总历史）
+        # 汇总对象每轮独立，经本次 run() 的步骤回调更新，并发请求之间互不影响
+        summary = _HistorySummary()
+
+        def on_step(step: Dict[str, Any]):
+            """步骤事件回调：增量汇总执行历史，再转发给调用方"""
+            summary.add(step)
+            if step_callback:
+                step_callback(step)
+
+        # 思考/行动消息同样按轮暂存，推理结束后批量写入记忆
+        pending: List[Tuple[str, str]] = []
+        on_thought, on_action = self._message_callbacks(pending)
+
+        try:
+            result = await self.react_agent.run(
+                user_input, context, step_callback=on_step, think_callback=think_callback,
+                thought_callback=on_thought, action_callback=on_action)
+        finally:
+            if pending:
+                self.memory_manager.extend_messages(pending)
+        logger.info("[Agent] ReAct 执行完成, success=%s, steps=%d",
+                    result.get('success'), len(result.get('history', [])))
+
+        if not result.get('success'):
+            return {
+                "success": False,
+                "error": result.get('error', '处理失败'),
+                "reasoning": None,
+                "history": result.get('history', [])
+            }
+
+        # 4. 提取结果
+        history = result.get('history', [])
+        reasoning_text = self._build_reasoning_text(history, summary)
+        # 生成回答的 LLM 请求为异步请求，不阻塞事件循环
+        answer = await self._extract_answer(history, summary, answer_callback)
+        logger.info("[Agent] 提取到答案: %.100s...", answer)
+
+        # 5. 添加助手回答到历史
+        self.memory_manager.add_message('assistant', answer)
+
+        return {
+            "success": True,
+            "answer": answer,
+            "reasoning": {
+                "text": reasoning_text,
+                "total_steps": len(history),
+                "tools_used": self._extract_tools_used(history, summary)
+            },
+            "history": history
+        }
 
     async def process(self, user_input: str) -> Dict[str, Any]:
         """
@@ -640,55 +1015,12 @@ class ReActTravelAgent:
             >>> if result["success"]:
             ...     print(result["answer"])
         """
-        import logging
-        logger = logging.getLogger(__name__)
-
-        logger.info(f"[Agent] 开始处理用户输入: {user_input[:50]}...")
+        logger.info("[Agent] 开始处理用户输入: %.50s...", user_input)
 
         try:
-            # 1. 将用户输入添加到对话历史
-            self.memory_manager.add_message('user', user_input)
-
-            # 2. 构建上下文信息
-            context = {
-                'user_query': user_input,
-                'user_preference': self.memory_manager.get_user_preference()
-            }
-
-            # 3. 执行 ReAct 推理循环
-            result = await self.react_agent.run(user_input, context)
-            logger.info(f"[Agent] ReAct 执行完成, success={result.get('success')}, steps={len(result.get('history', []))}")
-
-            if result.get('success'):
-                # 4. 提取结果
-                history = result.get('history', [])
-                reasoning_text = self._build_reasoning_text(history)
-                answer = self._extract_answer(history)
-                logger.info(f"[Agent] 提取到答案: {answer[:100]}...")
-
-                # 5. 添加助手回答到历史
-                self.memory_manager.add_message('assistant', answer)
-
-                return {
-                    "success": True,
-                    "answer": answer,
-                    "reasoning": {
-                        "text": reasoning_text,
-                        "total_steps": len(history),
-                        "tools_used": self._extract_tools_used(history)
-                    },
-                    "history": history
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": result.get('error', '处理失败'),
-                    "reasoning": None,
-                    "history": result.get('history', [])
-                }
-
+            return await self._run_turn(user_input)
         except Exception as e:
-            logger.error(f"[Agent] 处理异常: {e}")
+            logger.error("[Agent] 处理异常: %s", e)
             return {
                 "success": False,
                 "error": f"处理失败: {str(e)}",
@@ -708,130 +1040,68 @@ class ReActTravelAgent:
         Returns:
             Dict: 处理结果，同 process 方法的返回格式
         """
-        import asyncio
-        return asyncio.run(self.process(user_input))
+        return asyncio.run(self._process_once(user_input))
+
+    async def _process_once(self, user_input: str) -> Dict[str, Any]:
+        """
+        在一次性事件循环中处理用户输入
+
+        循环随 asyncio.run() 结束而关闭，返回前关闭该循环上的 HTTP 连接池。
+
+        Args:
+            user_input: 用户输入文本
+
+        Returns:
+            Dict: 处理结果，同 process 方法的返回格式
+        """
+        try:
+            return await self.process(user_input)
+        finally:
+            await self.llm_client.aclose()
 
-    async def process_stream(self, user_input: str, answer_callback=None, done_callback=None):
+    async def process_stream(self, user_input: str, answer_callback=None, done_callback=None,
+                             step_callback=None, think_callback=None):
         """
         流式处理用户输入
 
-        使用真正的 token 级别流式输出，提供更好的用户体验。
-        特点：
-        - 实时输出：每个 token 生成后立即通过回调发送
-        - 真正的流式：使用 LLM 客户端的 chat_stream 方法
-        - 回调机制：通过回调函数实现数据推送
+        与 process 共用同一处理流程（_run_turn）。需要 LLM 生成回答时，
+        token 经 achat_stream 实时推送；回答无需生成时（如终结工具已给出）分块推送。
+        推送的内容即写入对话历史的回答。
 
         Args:
             user_input: 用户输入
-            answer_callback: 回答内容回调函数，接收单个 token (str)
+            answer_callback: 回答内容回调函数，接收单个 token 或文本块 (str)
             done_callback: 完成回调函数，接收最终结果 (Dict)
+            step_callback: 步骤回调函数，每个 ReAct 步骤完成后接收历史记录 (Dict)
+            think_callback: 思考流回调函数，接收 (思考内容, 已耗时秒数)
+
+            步骤与思考回调只作用于本次调用，并发请求之间互不可见。
 
         Returns:
             Dict: 最终处理结果
 
         Examples:
-            >>> async def on_token(token):
-            ...     print(token, end="", flush=True)
-            >>> async def on_done(result):
+            >>> def on_chunk(chunk):
+            ...     print(chunk, end="", flush=True)
+            >>> def on_done(result):
             ...     print("\\n完成!")
-            >>> await agent.process_stream("北京旅游", answer_callback=on_token, done_callback=on_done)
+            >>> await agent.process_stream("北京旅游", answer_callback=on_chunk, done_callback=on_done)
         """
-        import logging
-        import time as time_module
-        logger = logging.getLogger(__name__)
-
-        logger.info(f"[Agent] 开始流式处理用户输入: {user_input[:50]}...")
-        start_time = time_module.time()
+        logger.info("[Agent] 开始流式处理用户输入: %.50s...", user_input)
+        start_time = time.time()
 
         try:
-            # 添加用户输入到历史
-            self.memory_manager.add_message('user', user_input)
-
-            context = {
-                'user_query': user_input,
-                'user_preference': self.memory_manager.get_user_preference()
-            }
-
-            # 先运行 ReAct agent 获取思考历史
-            result = await self.react_agent.run(user_input, context)
-            logger.info(f"[Agent] ReAct 执行完成, success={result.get('success')}, steps={len(result.get('history', []))}")
-
-            if result.get('success'):
-                history = result.get('history', [])
-                reasoning_text = self._build_reasoning_text(history)
-                answer = self._extract_answer(history)
-
-                self.memory_manager.add_message('assistant', answer)
-
-                # 构建 LLM 消息
-                system_prompt = """你是一个专业的旅游助手。请根据用户的问题，提供详细、准确的旅游建议和规划。回答要简洁明了，条理清晰。"""
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_input}
-                ]
-
-                logger.info(f"[Agent] 开始流式生成答案...")
-
-                # 使用 LLM 客户端的流式方法
-                if hasattr(self.llm_client, 'chat_stream'):
-                    token_count = 0
-                    accumulated_answer = ""
-
-                    # 遍历流式响应
-                    for token in self.llm_client.chat_stream(messages, temperature=0.7):
-                        token_count += 1
-                        accumulated_answer += token
-
-                        # 立即发送每个 token
-                        if answer_callback:
-                            answer_callback(token)
-
-                        # 短暂延迟，确保前端有足够时间处理
-                        await asyncio.sleep(0.01)
-
-                    answer = accumulated_answer
-                    logger.info(f"[Agent] 流式生成完成, 共 {token_count} tokens")
-
-                else:
-                    # 回退到非流式
-                    logger.warning("[Agent] LLM 客户端不支持流式，使用批量发送")
-                    chunks = self._split_into_chunks(answer)
-                    for chunk in chunks:
-                        if answer_callback:
-                            answer_callback(chunk)
-                        await asyncio.sleep(0.02)
-
-                elapsed = time_module.time() - start_time
-                logger.info(f"[Agent] 总耗时: {elapsed:.2f}秒")
-
-                final_result = {
-                    "success": True,
-                    "answer": answer,
-                    "reasoning": {
-                        "text": reasoning_text,
-                        "total_steps": len(history),
-                        "tools_used": self._extract_tools_used(history)
-                    },
-                    "history": history
-                }
+            final_result = await self._run_turn(
+                user_input, step_callback=step_callback, think_callback=think_callback,
+                answer_callback=answer_callback)
+            logger.info("[Agent] 流式处理完成, 总耗时: %.2f秒", time.time() - start_time)
 
-                if done_callback:
-                    done_callback(final_result)
-
-                return final_result
-            else:
-                final_result = {
-                    "success": False,
-                    "error": result.get('error', '处理失败'),
-                    "reasoning": None,
-                    "history": result.get('history', [])
-                }
-                if done_callback:
-                    done_callback(final_result)
-                return final_result
+            if done_callback:
+                done_callback(final_result)
+            return final_result
 
         except Exception as e:
-            logger.error(f"[Agent] 处理异常: {e}")
+            logger.error("[Agent] 处理异常: %s", e)
             import traceback
             traceback.print_exc()
             error_result = {
@@ -905,7 +1175,8 @@ class ReActTravelAgent:
 
         return final_chunks if final_chunks else [text]
 
-    def _build_reasoning_text(self, history: List[Dict]) -> str:
+    def _build_reasoning_text(self, history: List[Dict],
+                              summary: Optional[_HistorySummary] = None) -> str:
         """
         构建推理过程文本
 
@@ -913,90 +1184,55 @@ class ReActTravelAgent:
 
         Args:
             history: ReAct 执行历史列表
+            summary: 执行过程中增量构建的历史汇总，为 None 时根据 history 构建
 
         Returns:
             str: 格式化后的推理过程文本（Markdown 格式）
         """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         if not history:
-            return "<thinking>\n[Timestamp: {timestamp}]\n\n[Intent Analysis]\nNo reasoning history available.\n\n[Context Evaluation]\nNo context available.\n\n[Response Planning]\nUnable to generate response.\n\n[Constraint Check]\nNo constraints checked.\n</thinking>".format(
-                timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            )
-
-        intent_analysis = []
-        context_evaluation = []
-        response_planning = []
-        constraint_check = []
-
-        # 遍历历史，按类型分类
-        for i, step in enumerate(history):
-            thought = step.get('thought', {})
-            action = step.get('action', {})
-
-            thought_type = thought.get('type', 'UNKNOWN')
-            thought_content = thought.get('content', '')
-            action_name = action.get('tool_name', '')
-            action_status = action.get('status', 'PENDING')
-            result = action.get('result', {})
-
-            if thought_type == 'ANALYSIS':
-                if thought_content:
-                    intent_analysis.append(f"Step {i + 1}: {thought_content}")
-            elif thought_type == 'PLANNING':
-                if thought_content:
-                    response_planning.append(f"Step {i + 1}: {thought_content}")
-            elif thought_type == 'INFERENCE':
-                if thought_content:
-                    context_evaluation.append(f"Step {i + 1}: {thought_content}")
-                if action_name and action_name != 'none':
-                    status_str = 'SUCCESS' if action_status == 'SUCCESS' else 'FAILED' if action_status == 'FAILED' else 'RUNNING'
-                    context_evaluation.append(f"  - Tool: {action_name} [{status_str}]")
-            elif thought_type == 'REFLECTION':
-                if thought_content:
-                    constraint_check.append(f"Step {i + 1}: {thought_content}")
+            return _EMPTY_REASONING_TEMPLATE.format(timestamp=timestamp)
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if summary is None:
+            summary = _HistorySummary.from_history(history)
 
-        # 构建各部分内容
-        intent_section = "[Intent Analysis]\n"
-        if intent_analysis:
-            intent_section += "\n".join(intent_analysis)
+        # 所有行收集到一个列表，最后一次 join 生成完整文本
+        out = ["<thinking>", f"[Timestamp: {timestamp}]", "", "[Intent Analysis]"]
+        if summary.intent_analysis:
+            out.extend(summary.intent_analysis)
         else:
-            intent_section += f"User query analysis based on {len(history)} reasoning steps.\n"
+            out.append(f"User query analysis based on {len(history)} reasoning steps.")
+            out.append("")
 
-        context_section = "[Context Evaluation]\n"
-        if context_evaluation:
-            context_section += "\n".join(context_evaluation)
+        out.append("")
+        out.append("[Context Evaluation]")
+        if summary.context_evaluation:
+            out.extend(summary.context_evaluation)
         else:
-            context_section += "No explicit context evaluation steps recorded."
+            out.append("No explicit context evaluation steps recorded.")
 
-        response_section = "[Response Planning]\n"
-        if response_planning:
-            response_section += "\n".join(response_planning)
+        out.append("")
+        out.append("[Response Planning]")
+        if summary.response_planning:
+            out.extend(summary.response_planning)
         else:
-            response_section += "Response generation based on tool execution results."
+            out.append("Response generation based on tool execution results.")
 
-        constraint_section = "[Constraint Check]\n"
-        if constraint_check:
-            constraint_section += "\n".join(constraint_check)
+        out.append("")
+        out.append("[Constraint Check]")
+        if summary.constraint_check:
+            out.extend(summary.constraint_check)
         else:
-            constraint_section += "All constraints satisfied.\n"
-            constraint_section += f"- Total reasoning steps: {len(history)}\n"
-            constraint_section += f"- Tools executed: {len(self._extract_tools_used(history))}\n"
-            constraint_section += "- Response format: Standard text response"
-
-        thinking_content = f"""[Timestamp: {timestamp}]
+            out.append("All constraints satisfied.")
+            out.append(f"- Total reasoning steps: {len(history)}")
+            out.append(f"- Tools executed: {len(summary.tools_used)}")
+            out.append("- Response format: Standard text response")
 
-{intent_section}
+        out.append("</thinking>")
+        return "\n".join(out)
 
-{context_section}
-
-{response_section}
-
-{constraint_section}"""
-
-        return f"<thinking>\n{thinking_content}\n</thinking>"
-
-    def _extract_tools_used(self, history: List[Dict]) -> List[str]:
+    def _extract_tools_used(self, history: List[Dict],
+                            summary: Optional[_HistorySummary] = None) -> List[str]:
         """
         提取使用的工具列表
 
@@ -1004,55 +1240,54 @@ class ReActTravelAgent:
 
         Args:
             history: 执行历史列表
+            summary: 执行过程中增量构建的历史汇总，为 None 时根据 history 构建
 
         Returns:
             List[str]: 使用的工具名称列表（去重）
         """
-        tools = []
-        for step in history:
-            action = step.get('action', {})
-            tool_name = action.get('tool_name', '')
-            if tool_name and tool_name not in tools and tool_name != 'none':
-                tools.append(tool_name)
-        return tools
+        if summary is None:
+            summary = _HistorySummary.from_history(history)
+        return list(summary.tools_used)
 
-    def _extract_answer(self, history: List[Dict]) -> str:
+    async def _extract_answer(self, history: List[Dict],
+                              summary: Optional[_HistorySummary] = None,
+                              answer_callback: Optional[Callable[[str], None]] = None) -> str:
         """
         提取最终回答
 
         从执行历史中提取最终的回答内容。
         策略：
-        1. 收集所有成功的工具执行结果
-        2. 使用 LLM 生成活泼、结构化的回答
+        1. 终结工具已给出 final_answer 时直接使用，不再请求 LLM
+        2. 存在成功的工具执行结果时，使用 LLM 生成活泼、结构化的回答
 
         Args:
             history: 执行历史列表
+            summary: 执行过程中增量构建的历史汇总，为 None 时根据 history 构建
+            answer_callback: 提供时回答边生成边推送给该回调
 
         Returns:
             str: 最终回答文本
         """
-        # 收集所有工具执行结果
-        tool_results = []
-        has_successful_tools = False
-
-        for step in reversed(history):
-            action = step.get('action', {})
-            if action.get('status') == 'SUCCESS':
-                has_successful_tools = True
-                result = action.get('result', {})
-                tool_name = action.get('tool_name', '')
-                if result:
-                    tool_results.append({
-                        'tool': tool_name,
-                        'result': result
-                    })
-
-        # 如果有工具执行结果，使用 LLM 生成活泼的回答
-        if has_successful_tools:
-            return self._generate_answer(history)
-
-        # 否则返回默认消息
-        return '让我来帮你规划这次旅行吧！🎉'
+        if summary is None:
+            summary = _HistorySummary.from_history(history)
+
+        # 如果有工具执行结果且终结工具未给出最终回答，使用 LLM 生成活泼的回答
+        if summary.has_success and not summary.final_answer:
+            # 历史中过大的结果只保留了截断摘要，生成回答前还原原文
+            resolve = self.react_agent.resolve_result
+            successes = [(tool_name, resolve(result)) for tool_name, result in summary.tool_results]
+            if answer_callback:
+                return await self._stream_answer(history, successes, answer_callback)
+            return await self._generate_answer(history, successes)
+
+        # 终结工具在同一轮请求中已生成最终回答，否则返回默认消息
+        answer = summary.final_answer or '让我来帮你规划这次旅行吧！🎉'
+        if answer_callback:
+            for chunk in self._split_into_chunks(answer):
+                answer_callback(chunk)
+                # 短暂延迟，确保前端有足够时间处理
+                await asyncio.sleep(0.02)
+        return answer
 
     def _format_attractions_response(self, tool_result: Dict) -> str:
         """
@@ -1100,7 +1335,8 @@ class ReActTravelAgent:
 
         return '\n'.join(lines) if lines else "未找到相关景点信息"
 
-    def _generate_answer(self, history: List[Dict]) -> str:
+    async def _generate_answer(self, history: List[Dict],
+                               successes: Optional[List[Tuple[str, Any]]] = None) -> str:
         """
         使用 LLM 生成最终回答
 
@@ -1108,19 +1344,13 @@ class ReActTravelAgent:
 
         Args:
             history: 执行历史列表
+            successes: 历史汇总中已收集的 (工具名, 结果)，为 None 时从 history 中提取
 
         Returns:
             str: 生成的回答文本
         """
         try:
-            tool_results = []
-            for step in history:
-                action = step.get('action', {})
-                if action.get('status') == 'SUCCESS' and action.get('result'):
-                    tool_results.append({
-                        'tool': action.get('tool_name', ''),
-                        'result': action.get('result', {})
-                    })
+            tool_results = self._answer_tool_results(history, successes)
 
             system_prompt = """你是一个超级热情、活泼的AI旅游小伙伴！
 
@@ -1159,14 +1389,16 @@ class ReActTravelAgent:
 - 每个城市至少推荐2-4个景点"""
 
             user_prompt = f"""我想要规划一次旅行，这是我的查询结果：
-{json.dumps(tool_results, ensure_ascii=False, indent=2)}
+{_dumps(tool_results)}
 
 请只输出JSON格式的结果，不要有任何其他内容。"""
 
-            result = self.llm_client.chat([
+            start = time.perf_counter_ns()
+            result = await self.llm_client.achat([
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ], temperature=0.7)
+            _LATENCY['generate_answer'].append(time.perf_counter_ns() - start)
 
             if result.get('success'):
                 content = result.get('content', '')
@@ -1180,6 +1412,86 @@ class ReActTravelAgent:
         except Exception as e:
             return f'生成回答失败：{str(e)}'
 
+    @staticmethod
+    def _answer_tool_results(history: List[Dict],
+                             successes: Optional[List[Tuple[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        整理用于生成回答的工具结果
+
+        Args:
+            history: 执行历史列表
+            successes: 历史汇总中已收集的 (工具名, 结果)，为 None 时从 history 中提取
+
+        Returns:
+            List[Dict]: 精简后的 {'tool', 'result'} 列表
+        """
+        if successes is None:
+            successes = _HistorySummary.from_history(history).tool_results
+        return [
+            {'tool': tool_name, 'result': _trim_for_prompt(result)}
+            for tool_name, result in successes
+        ]
+
+    async def _stream_answer(self, history: List[Dict],
+                             successes: Optional[List[Tuple[str, Any]]],
+                             answer_callback: Callable[[str], None]) -> str:
+        """
+        使用 LLM 流式生成最终回答
+
+        与 _generate_answer 使用相同的工具结果，但要求模型直接输出 Markdown，
+        每个 token 生成后立即推送，首字节无需等待整个回答生成完毕。
+        流式请求出错时错误提示既不推送也不计入回答；尚未产出内容时
+        退回 _generate_answer 生成并整体推送。
+
+        Args:
+            history: 执行历史列表
+            successes: 历史汇总中已收集的 (工具名, 结果)，为 None 时从 history 中提取
+            answer_callback: 回答内容回调，接收单个 token
+
+        Returns:
+            str: 完整的回答文本
+        """
+        tool_results = self._answer_tool_results(history, successes)
+
+        system_prompt = """你是一个超级热情、活泼的AI旅游小伙伴！
+
+【任务】
+根据工具查询结果，生成结构化的旅游推荐。
+
+【说话风格】
+- 使用轻松活泼的语气，多用口语化表达
+- 适当使用emoji表情符号增添趣味
+- 重点信息用**加粗**标记
+
+【输出格式】
+直接输出 Markdown：先写一段开场白；每个城市一个"## emoji 城市名"小节，
+列出推荐天数、预算、最佳旅行季节，以及"#### 必游景点："下的2-4个景点（类型、门票、简短描述）；
+最后以"☀️ 旅行小贴士"结尾。"""
+
+        user_prompt = f"""我想要规划一次旅行，这是我的查询结果：
+{_dumps(tool_results)}"""
+
+        parts: List[str] = []
+        start = time.perf_counter_ns()
+        async for token in self.llm_client.achat_stream([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ], temperature=0.7):
+            if isinstance(token, StreamError):
+                logger.error("[Agent] 流式生成回答失败: %s", token.strip())
+                break
+            parts.append(token)
+            answer_callback(token)
+        _LATENCY['generate_answer'].append(time.perf_counter_ns() - start)
+
+        if not parts:
+            answer = await self._generate_answer(history, successes)
+            answer_callback(answer)
+            return answer
+
+        logger.info("[Agent] 流式生成回答完成, 共 %d 块", len(parts))
+        return ''.join(parts)
+
     def _parse_json_response(self, content: str) -> dict:
         """
         解析 LLM 返回的 JSON 响应
@@ -1193,7 +1505,6 @@ class ReActTravelAgent:
         Returns:
             dict: 解析后的 JSON 对象，解析失败返回 None
         """
-        import re
         try:
             # 首先尝试直接解析
             return json.loads(content)
@@ -1201,7 +1512,7 @@ class ReActTravelAgent:
             pass
 
         # 尝试提取 JSON 代码块
-        json_match = re.search(r'```json\s*([\s\S]*?)\s*```', content)
+        json_match = _JSON_BLOCK_RE.search(content)
         if json_match:
             try:
                 return json.loads(json_match.group(1))
@@ -1209,7 +1520,7 @@ class ReActTravelAgent:
                 pass
 
         # 尝试提取任何 JSON 对象
-        json_match = re.search(r'\{[\s\S]*\}', content)
+        json_match = _JSON_OBJECT_RE.search(content)
         if json_match:
             try:
                 return json.loads(json_match.group())
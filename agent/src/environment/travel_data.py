@@ -30,7 +30,44 @@
     result = env.calculate_budget("北京", days=3)
 """
 
-from typing import Dict, Any, List, Optional
+import heapq
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, Iterator, List, Optional, FrozenSet, NamedTuple, Tuple
+
+# search_cities 返回的最大城市数量
+_SEARCH_TOP_K = 10
+
+
+class _CityEntry(NamedTuple):
+    """城市索引条目：搜索评分所需字段在构建索引时一次性取出"""
+    name: str                 # 城市名称
+    info: Dict[str, Any]      # 城市详细信息
+    tags: Tuple[str, ...]     # 标签（保持原顺序）
+    tag_substrings: FrozenSet[str]  # 全部标签的所有子串（兴趣子串匹配只需一次集合查找）
+    budget: int               # 日均预算
+    seasons: FrozenSet[str]   # 最佳季节集合
+    ticket_total: int         # 全部景点门票合计
+    meal_per_day: float       # 每日餐饮费用（日均预算的40%）
+    transport_per_day: float  # 每日市内交通费用（日均预算的20%）
+    lodging_per_day: float    # 每日住宿费用（日均预算的30%）
+
+
+def _substrings(tags: Tuple[str, ...]) -> FrozenSet[str]:
+    """
+    枚举标签的全部子串
+
+    标签都是很短的中文词，子串数量很小；预先展开后
+    “兴趣是否为某个标签的子串”可直接用集合成员判断。
+
+    Args:
+        tags: 城市标签
+
+    Returns:
+        FrozenSet[str]: 所有标签的子串（有标签时包含空串，与 in 运算语义一致）
+    """
+    return frozenset(tag[i:j] for tag in tags
+                     for i in range(len(tag) + 1) for j in range(i, len(tag) + 1))
 
 
 class TravelData:
@@ -60,6 +97,59 @@ class TravelData:
         """
         self.config_manager = config_manager
         self.tools = self._register_tools()
+        self._city_index = self._build_index()
+        self._city_entries = {entry.name: entry for entry in self._city_index}
+
+        # 查询结果只依赖参数与运行期只读的城市数据，按规范化后的参数缓存。
+        # 对外返回外层字典的浅拷贝，调用方增删字段不会影响缓存
+        self._search_cached = lru_cache(maxsize=256)(self._search_cities_impl)
+        self._attractions_cached = lru_cache(maxsize=256)(self._query_attractions_impl)
+        self._budget_cached = lru_cache(maxsize=256)(self._calculate_budget_impl)
+        self._city_info_cached = lru_cache(maxsize=256)(self._get_city_info_impl)
+
+    def clear_cache(self) -> None:
+        """
+        清空查询结果缓存
+
+        城市数据重新加载后调用。
+        """
+        self._city_index = self._build_index()
+        self._city_entries = {entry.name: entry for entry in self._city_index}
+        for cached in (self._search_cached, self._attractions_cached,
+                       self._budget_cached, self._city_info_cached):
+            cached.cache_clear()
+
+    def _build_index(self) -> Tuple[_CityEntry, ...]:
+        """
+        构建城市索引
+
+        城市数据在运行期间只读，初始化时取出一次，
+        search_cities 直接遍历索引，无需逐个查询城市信息。
+
+        Returns:
+            Tuple[_CityEntry, ...]: 按城市列表顺序排列的索引条目
+        """
+        entries = []
+        for city_name in self.config_manager.get_all_cities():
+            city_info = self.config_manager.get_city_info(city_name)
+            if not city_info:
+                continue
+            tags = tuple(city_info.get('tags', ()))
+            # 预算按默认日均 400 计算，与 calculate_budget 的原有口径一致
+            avg_daily = city_info.get('avg_budget_per_day', 400)
+            entries.append(_CityEntry(
+                name=city_name,
+                info=city_info,
+                tags=tags,
+                tag_substrings=_substrings(tags),
+                budget=city_info.get('avg_budget_per_day', 0),
+                seasons=frozenset(city_info.get('best_season', ())),
+                ticket_total=sum(a.get('ticket', 0) for a in city_info.get('attractions', ())),
+                meal_per_day=avg_daily * 0.4,
+                transport_per_day=avg_daily * 0.2,
+                lodging_per_day=avg_daily * 0.3
+            ))
+        return tuple(entries)
 
     def _register_tools(self) -> Dict[str, callable]:
         """
@@ -116,61 +206,11 @@ class TravelData:
                 "count": 1
             }
         """
-        all_cities = self.config_manager.get_all_cities()
-        matched_cities = []
-
-        for city_name in all_cities:
-            city_info = self.config_manager.get_city_info(city_name)
-            if not city_info:
-                continue
-
-            score = 0
-            match_reasons = []
-
-            # 兴趣匹配评分
-            if interests:
-                city_tags = city_info.get('tags', [])
-                for interest in interests:
-                    if interest in city_tags or any(interest in tag for tag in city_tags):
-                        score += 30
-                        match_reasons.append(f"符合{interest}兴趣")
-
-            # 预算匹配评分
-            if budget:
-                avg_budget = city_info.get('avg_budget_per_day', 0)
-                if budget[0] <= avg_budget <= budget[1]:
-                    score += 20
-                    match_reasons.append("预算适合")
-                elif avg_budget < budget[1]:
-                    score += 10
-
-            # 季节匹配评分
-            if season:
-                best_seasons = city_info.get('best_season', [])
-                if season in best_seasons:
-                    score += 15
-                    match_reasons.append("季节适宜")
-
-            # 如果没有筛选条件，返回默认城市
-            if not interests and not budget and not season:
-                score = 50
-
-            if score > 0:
-                matched_cities.append({
-                    "city": city_name,
-                    "score": score,
-                    "info": city_info,
-                    "match_reasons": match_reasons
-                })
-
-        # 按分数降序排序
-        matched_cities.sort(key=lambda x: x['score'], reverse=True)
-
-        return {
-            "success": True,
-            "cities": matched_cities,
-            "count": len(matched_cities)
-        }
+        return dict(self._search_cached(
+            tuple(interests) if interests else None,
+            tuple(budget) if budget else None,
+            season
+        ))
 
     def query_attractions(self, cities: List[str]) -> Dict[str, Any]:
         """
@@ -194,36 +234,7 @@ class TravelData:
                 }
             }
         """
-        result = {}
-
-        for city_name in cities:
-            city_info = self.config_manager.get_city_info(city_name)
-            if city_info:
-                result[city_name] = {
-                    "attractions": city_info.get('attractions', []),
-                    "avg_budget_per_day": city_info.get('avg_budget_per_day', 0),
-                    "recommended_days": city_info.get('recommended_days', 3)
-                }
-            else:
-                # 尝试查找地区对应的城市
-                region_cities = self._get_cities_by_region(city_name)
-                if region_cities:
-                    # 合并所有城市的景点信息
-                    for actual_city in region_cities:
-                        city_info = self.config_manager.get_city_info(actual_city)
-                        if city_info:
-                            result[actual_city] = {
-                                "attractions": city_info.get('attractions', []),
-                                "avg_budget_per_day": city_info.get('avg_budget_per_day', 0),
-                                "recommended_days": city_info.get('recommended_days', 3),
-                                "region": city_name  # 标记来源地区
-                            }
-
-        return {
-            "success": True,
-            "data": result,
-            "cities_count": len(result)
-        }
+        return dict(self._attractions_cached(tuple(cities)))
 
     def calculate_budget(self, city: str, days: int,
                         include_accommodation: bool = True,
@@ -252,30 +263,152 @@ class TravelData:
                 - city: str 城市名称
                 - budget: Dict[str, int] 各项费用明细
         """
-        city_info = self.config_manager.get_city_info(city)
-        if not city_info:
+        return dict(self._budget_cached(city, days, include_accommodation,
+                                        include_transportation))
+
+    def get_city_info(self, city: str) -> Dict[str, Any]:
+        """
+        获取城市详细信息
+
+        Args:
+            city: str 城市名称
+
+        Returns:
+            Dict[str, Any]: 城市信息
+                - success: bool 是否成功
+                - city: str 城市名称
+                - info: Dict 城市详细信息
+        """
+        return dict(self._city_info_cached(city))
+
+    def _search_cities_impl(self, interests: Optional[Tuple[str, ...]],
+                            budget: Optional[tuple], season: Optional[str]) -> Dict[str, Any]:
+        """根据兴趣、预算、季节搜索匹配的城市（未缓存实现，参数已规范化）"""
+        # 只保留得分最高的前 K 个城市；nlargest 对同分城市保持原有顺序
+        top = heapq.nlargest(_SEARCH_TOP_K, self._score_cities(interests, budget, season),
+                             key=itemgetter(0))
+        matched_cities = [{
+            "city": entry.name,
+            "score": score,
+            "info": entry.info,
+            "match_reasons": match_reasons
+        } for score, entry, match_reasons in top]
+
+        return {
+            "success": True,
+            "cities": matched_cities,
+            "count": len(matched_cities)
+        }
+
+    def _score_cities(self, interests: Optional[Tuple[str, ...]],
+                      budget: Optional[tuple], season: Optional[str]
+                      ) -> Iterator[Tuple[int, _CityEntry, List[str]]]:
+        """
+        逐个城市计算匹配得分
+
+        Args:
+            interests: 兴趣标签
+            budget: 预算范围 (min, max)
+            season: 出行季节
+
+        Yields:
+            (得分, 城市索引条目, 匹配理由)，仅产出得分大于 0 的城市
+        """
+        # 如果没有筛选条件，返回默认城市
+        if not interests and not budget and not season:
+            for entry in self._city_index:
+                yield 50, entry, []
+            return
+
+        # 与城市无关的判断与取值提到循环外
+        interest_reasons = [(interest, f"符合{interest}兴趣") for interest in interests or ()]
+        budget_lo, budget_hi = budget if budget else (None, None)
+
+        for entry in self._city_index:
+            score = 0
+            match_reasons = []
+
+            # 兴趣匹配评分
+            tag_substrings = entry.tag_substrings
+            for interest, reason in interest_reasons:
+                if interest in tag_substrings:
+                    score += 30
+                    match_reasons.append(reason)
+
+            # 预算匹配评分
+            if budget:
+                avg_budget = entry.budget
+                if budget_lo <= avg_budget <= budget_hi:
+                    score += 20
+                    match_reasons.append("预算适合")
+                elif avg_budget < budget_hi:
+                    score += 10
+
+            # 季节匹配评分
+            if season:
+                if season in entry.seasons:
+                    score += 15
+                    match_reasons.append("季节适宜")
+
+            if score > 0:
+                yield score, entry, match_reasons
+
+    def _query_attractions_impl(self, cities: Tuple[str, ...]) -> Dict[str, Any]:
+        """查询指定城市的景点信息（未缓存实现，参数已规范化）"""
+        result = {}
+
+        entries = self._city_entries
+        for city_name in cities:
+            entry = entries.get(city_name)
+            if entry:
+                city_info = entry.info
+                result[city_name] = {
+                    "attractions": city_info.get('attractions', []),
+                    "avg_budget_per_day": city_info.get('avg_budget_per_day', 0),
+                    "recommended_days": city_info.get('recommended_days', 3)
+                }
+            else:
+                # 尝试查找地区对应的城市，城市信息直接取自索引
+                region_cities = self.config_manager.cities_in_region(city_name)
+                if region_cities:
+                    # 合并所有城市的景点信息
+                    for actual_city in region_cities:
+                        entry = entries.get(actual_city)
+                        if entry:
+                            city_info = entry.info
+                            result[actual_city] = {
+                                "attractions": city_info.get('attractions', []),
+                                "avg_budget_per_day": city_info.get('avg_budget_per_day', 0),
+                                "recommended_days": city_info.get('recommended_days', 3),
+                                "region": city_name  # 标记来源地区
+                            }
+
+        return {
+            "success": True,
+            "data": result,
+            "cities_count": len(result)
+        }
+
+    def _calculate_budget_impl(self, city: str, days: int,
+                               include_accommodation: bool,
+                               include_transportation: bool) -> Dict[str, Any]:
+        """计算旅游预算（未缓存实现）"""
+        entry = self._city_entries.get(city)
+        if entry is None:
             return {
                 "success": False,
                 "error": f"未找到城市: {city}"
             }
 
-        avg_daily = city_info.get('avg_budget_per_day', 400)
-        attractions = city_info.get('attractions', [])
-
-        # 计算各项费用
-        ticket_total = sum(a.get('ticket', 0) for a in attractions)
-        meal_cost = avg_daily * 0.4 * days
-        local_transport = avg_daily * 0.2 * days
-
+        # 门票合计与每日各项费用已在索引中预先计算
         budget = {
-            "tickets": ticket_total,
-            "meals": int(meal_cost),
-            "local_transportation": int(local_transport)
+            "tickets": entry.ticket_total,
+            "meals": int(entry.meal_per_day * days),
+            "local_transportation": int(entry.transport_per_day * days)
         }
 
         if include_accommodation:
-            accommodation = avg_daily * 0.3 * days
-            budget['accommodation'] = int(accommodation)
+            budget['accommodation'] = int(entry.lodging_per_day * days)
 
         if include_transportation:
             inter_city_transport = 1000
@@ -291,19 +424,8 @@ class TravelData:
             "budget": budget
         }
 
-    def get_city_info(self, city: str) -> Dict[str, Any]:
-        """
-        获取城市详细信息
-
-        Args:
-            city: str 城市名称
-
-        Returns:
-            Dict[str, Any]: 城市信息
-                - success: bool 是否成功
-                - city: str 城市名称
-                - info: Dict 城市详细信息
-        """
+    def _get_city_info_impl(self, city: str) -> Dict[str, Any]:
+        """获取城市详细信息（未缓存实现）"""
         city_info = self.config_manager.get_city_info(city)
         if city_info:
             return {
@@ -316,15 +438,14 @@ class TravelData:
             region_cities = self._get_cities_by_region(city)
             if region_cities:
                 # 返回地区信息，包含所有城市
-                first_city = region_cities[0]
-                city_info = self.config_manager.get_city_info(first_city)
-                if city_info:
+                first_entry = self._city_entries.get(region_cities[0])
+                if first_entry:
                     # 使用地区名称，但包含实际城市信息
                     return {
                         "success": True,
                         "city": city,
                         "info": {
-                            **city_info,
+                            **first_entry.info,
                             "name": city,
                             "is_region": True,
                             "cities": region_cities
@@ -345,13 +466,8 @@ class TravelData:
         Returns:
             List[str]: 该地区的城市名称列表
         """
-        all_cities = self.config_manager.get_all_cities()
-        region_cities = []
-        for city_name in all_cities:
-            city_info = self.config_manager.get_city_info(city_name)
-            if city_info and city_info.get('region') == region:
-                region_cities.append(city_name)
-        return region_cities
+        # 地区索引由 ConfigManager 预先构建，直接查表
+        return list(self.config_manager.cities_in_region(region))
 
     def execute_tool(self, tool_name: str, **kwargs) -> Dict[str, Any]:
         """
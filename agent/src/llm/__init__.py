@@ -1,5 +1,6 @@
 # LLM Module
-from .client import LLMClient
+from .client import LLMClient, StreamError
 from .factory import LLMClientFactory
+from .cache import LLMCache, SemanticCache
 
-__all__ = ['LLMClient', 'LLMClientFactory']
\ No newline at end of file
+__all__ = ['LLMClient', 'StreamError', 'LLMClientFactory', 'LLMCache', 'SemanticCache']
\ No newline at end of file
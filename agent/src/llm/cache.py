@@ -0,0 +1,290 @@
+"""
+LLM 响应缓存模块 (LLM Response Cache)
+
+按 (模型, 消息, 温度, 最大 token 数) 缓存对话结果，相同请求直接返回，
+省去一次完整的 API 往返与 token 开销。
+
+主要组件:
+- LLMCache: 基于 LRU 的响应缓存，可选持久化到 JSON 文件
+- SemanticCache: 语义缓存，按查询向量的余弦相似度复用近似问题的回答
+
+使用示例:
+    from llm.cache import LLMCache
+    from llm.client import LLMClient
+
+    cache = LLMCache(max_size=256)
+    client = LLMClient(config, cache=cache)
+
+    client.chat(messages, temperature=0)   # 请求 API 并写入缓存
+    client.chat(messages, temperature=0)   # 命中缓存
+    print(cache.stats())
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+
+
+class LLMCache:
+    """
+    LLM 响应缓存
+
+    以请求参数的 SHA-256 摘要为键，按最近使用顺序淘汰。
+    读写加锁，可在 batch_chat 的多线程并发请求中共享。
+
+    Attributes:
+        max_size: 最大缓存条目数
+        filepath: 持久化文件路径，为 None 时仅缓存在内存中
+        hits: 命中次数
+        misses: 未命中次数
+    """
+
+    def __init__(self, max_size: int = 256, filepath: Optional[str] = None):
+        """
+        初始化缓存
+
+        Args:
+            max_size: int 最大缓存条目数
+            filepath: Optional[str] 持久化文件路径，文件存在时加载已有缓存
+        """
+        self.max_size = max_size
+        self.filepath = filepath
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if filepath:
+            self.load_from_file(filepath)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]],
+                 temperature: Optional[float], max_tokens: Optional[int]) -> str:
+        """
+        计算请求的缓存键
+
+        Args:
+            model: 模型名称
+            messages: 消息列表
+            temperature: 实际使用的温度参数
+            max_tokens: 实际使用的最大 token 数
+
+        Returns:
+            str: 请求参数的 SHA-256 十六进制摘要
+        """
+        raw = json.dumps({
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[Dict[str, Any]]: 缓存响应的副本，未命中返回 None
+        """
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(response)
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            response: 对话结果
+        """
+        with self._lock:
+            self._entries[key] = dict(response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存与命中统计"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, Any]: 包含 size、hits、misses、hit_rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+    def save_to_file(self, filepath: Optional[str] = None) -> None:
+        """
+        保存缓存到 JSON 文件
+
+        Args:
+            filepath: Optional[str] 文件路径，默认使用初始化时的路径
+        """
+        filepath = filepath or self.filepath
+        if not filepath:
+            return
+        with self._lock:
+            data = list(self._entries.items())
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def load_from_file(self, filepath: str) -> bool:
+        """
+        从 JSON 文件加载缓存
+
+        Args:
+            filepath: str 文件路径
+
+        Returns:
+            bool: 加载成功返回 True
+        """
+        if not os.path.exists(filepath):
+            return False
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+
+        with self._lock:
+            for key, response in data[-self.max_size:]:
+                self._entries[key] = response
+        return True
+
+
+class SemanticCache:
+    """
+    语义缓存
+
+    “推荐一个海边城市”与“帮我找海滨度假地”字面不同但语义相同，
+    按查询向量的余弦相似度复用已有回答。向量由调用方提供的 embed 函数生成
+    （如 sentence-transformers 模型或向量化 API）。
+
+    作用域（如可选城市列表）不同的请求互不命中，避免跨城市集合误用回答。
+
+    Attributes:
+        threshold: 命中所需的最小余弦相似度
+        max_size: 最大缓存条目数，超出后淘汰最早写入的条目
+        hits: 命中次数
+        misses: 未命中次数
+    """
+
+    def __init__(self, embed: Callable[[str], Sequence[float]],
+                 threshold: float = 0.92, max_size: int = 256):
+        """
+        初始化语义缓存
+
+        Args:
+            embed: Callable[[str], Sequence[float]] 文本向量化函数
+            threshold: float 命中所需的最小余弦相似度
+            max_size: int 最大缓存条目数
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # (作用域, 单位向量, 响应)
+        self._entries: deque = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_scope(*parts: Any) -> str:
+        """
+        计算作用域键
+
+        Args:
+            *parts: 影响回答的非查询参数，如上下文、可选城市列表
+
+        Returns:
+            str: 作用域摘要
+        """
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _unit_vector(self, text: str) -> Tuple[float, ...]:
+        """向量化并归一化，之后点积即为余弦相似度"""
+        vector = self.embed(text)
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return tuple(x / norm for x in vector)
+
+    def lookup(self, text: str, scope: str) -> Tuple[Optional[Dict[str, Any]], Tuple[float, ...]]:
+        """
+        查找语义相近的缓存回答
+
+        Args:
+            text: 查询文本
+            scope: 作用域键
+
+        Returns:
+            Tuple: (命中的响应副本或 None, 查询向量)；查询向量可直接传给 add，避免重复向量化
+        """
+        vector = self._unit_vector(text)
+        best, best_sim = None, self.threshold
+        with self._lock:
+            for entry_scope, entry_vector, response in self._entries:
+                if entry_scope != scope:
+                    continue
+                sim = sum(a * b for a, b in zip(vector, entry_vector))
+                if sim >= best_sim:
+                    best, best_sim = response, sim
+            if best is None:
+                self.misses += 1
+                return None, vector
+            self.hits += 1
+            return dict(best), vector
+
+    def add(self, vector: Tuple[float, ...], scope: str, response: Dict[str, Any]) -> None:
+        """
+        写入缓存
+
+        Args:
+            vector: lookup 返回的查询向量
+            scope: 作用域键
+            response: 对话结果
+        """
+        with self._lock:
+            self._entries.append((scope, vector, dict(response)))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, Any]: 包含 size、hits、misses、hit_rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
@@ -34,14 +34,107 @@
         print(chunk, end="", flush=True)
 """
 
+import asyncio
+import hashlib
 import json
+import logging
+import random
+import re
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod  # 抽象基类用于定义接口协议
-from typing import Dict, Any, List, Optional, Iterator
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AnyStr, Dict, Any, AsyncIterator, Generator, List, Optional, Iterator, Tuple
 import urllib.request
 import urllib.error
 from enum import Enum
 
+from .cache import LLMCache, SemanticCache
+
+# 可选依赖：httpx 提供连接池（keep-alive 复用 TCP/TLS 连接）；
+# 缺失时同步请求退化为 urllib，achat 退化为线程中执行同步 chat
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# 可选依赖：orjson 编解码 JSON 明显快于标准库，流式响应中每个 token 都要解析一次。
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常处理无需区分。
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
+
+# 回答中的代码块（未闭合时取到结尾），取第一个代码块的内容
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|\Z)", re.DOTALL)
+
+# 限流与服务端错误可重试，其余 HTTP 错误（如 400/401）重试也不会成功
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _retry_delay(attempt: int) -> float:
+    """
+    计算第 attempt 次失败后的重试等待时间
+
+    指数退避并加入随机抖动，避免多个请求在同一时刻集中重试。
+
+    Args:
+        attempt: 已失败的次数（从 0 开始）
+
+    Returns:
+        float: 等待秒数，范围 [2^attempt / 2, 2^attempt)
+    """
+    base = 2 ** attempt
+    return base / 2 + random.random() * base / 2
+
+
+# SSE 流结束标记（urllib 逐行读取为 bytes，httpx 为 str）
+_SSE_DONE = (b'[DONE]', '[DONE]')
+
+# 同步 / 异步连接池上限
+_SYNC_MAX_CONNECTIONS = 20
+_ASYNC_MAX_CONNECTIONS = 32
+
+# 所有适配器共享的同步 HTTP 客户端（httpx.Client 线程安全），首次请求时创建
+_sync_client = None
+_sync_client_lock = threading.Lock()
+
+
+def _get_sync_client() -> "httpx.Client":
+    """
+    获取共享的同步 HTTP 客户端
+
+    Returns:
+        httpx.Client: 按主机维护 keep-alive 连接池的客户端
+    """
+    global _sync_client
+    if _sync_client is None:
+        with _sync_client_lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(
+                    limits=httpx.Limits(max_connections=_SYNC_MAX_CONNECTIONS,
+                                        max_keepalive_connections=_SYNC_MAX_CONNECTIONS)
+                )
+    return _sync_client
+
+
+class StreamError(str):
+    """
+    流式对话中产出的错误提示
+
+    仍是 str，直接展示流式内容的调用方无需改动；
+    需要区分回答正文与错误的调用方用 isinstance(chunk, StreamError) 判断。
+    """
+
 
 class ProtocolType(Enum):
     """
@@ -61,6 +154,40 @@ class ProtocolType(Enum):
     OPENAI_COMPATIBLE = "openai-compatible"
 
 
+@lru_cache(maxsize=32)
+def _recommendation_prompt_prefix(available_cities: Tuple[str, ...]) -> str:
+    """
+    渲染旅游推荐系统提示词中不随用户变化的部分
+
+    Args:
+        available_cities: 可推荐城市
+
+    Returns:
+        str: 系统提示词前缀
+    """
+    return f"""你是一个专业的旅游助手，负责根据用户需求推荐合适的旅游城市。
+
+可推荐城市列表：{', '.join(available_cities)}
+
+请基于用户需求，从可推荐城市中选择3-5个最合适的城市，并以JSON格式返回：
+{{
+    "recommendations": [
+        {{
+            "city": "城市名",
+            "reason": "推荐理由（50字以内）",
+            "match_score": 90
+        }}
+    ],
+    "explanation": "整体推荐说明（100字以内）"
+}}
+
+注意：
+1. 只推荐列表中存在的城市
+2. match_score为匹配度评分（0-100）
+3. 推荐理由需结合用户偏好和城市特色
+4. 按匹配度从高到低排序"""
+
+
 class LLMProtocolAdapter(ABC):
     """LLM协议适配器抽象基类"""
 
@@ -75,7 +202,15 @@ class LLMProtocolAdapter(ABC):
         self.top_p = config.get('top_p', 1.0)
         self.frequency_penalty = config.get('frequency_penalty', 0.0)
         self.presence_penalty = config.get('presence_penalty', 0.0)
+        # 异步 HTTP 客户端（首次 achat 时创建），及其所属事件循环
+        # 事件循环 -> 该循环上的异步客户端；循环被回收时条目自动移除
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._async_clients_lock = threading.Lock()
         self._init_protocol_specific(config)
+        # 请求头与接口地址在适配器生命周期内不变，构造时计算一次
+        self._headers = self._build_request_headers()
+        self._endpoint = self._get_chat_endpoint()
 
     @abstractmethod
     def _init_protocol_specific(self, config: Dict[str, Any]):
@@ -97,7 +232,16 @@ class LLMProtocolAdapter(ABC):
         pass
 
     @abstractmethod
-    def _parse_stream_chunk(self, line: str) -> Optional[str]:
+    def _parse_stream_chunk(self, data: AnyStr) -> Optional[str]:
+        """
+        解析一条 SSE data 字段
+
+        Args:
+            data: 去掉 "data: " 前缀后的内容（urllib 为 bytes，httpx 为 str）
+
+        Returns:
+            Optional[str]: 本段生成的文本，无内容时返回 None
+        """
         pass
 
     @abstractmethod
@@ -108,44 +252,118 @@ class LLMProtocolAdapter(ABC):
                     temperature: Optional[float] = None,
                     max_tokens: Optional[int] = None) -> Iterator[str]:
         payload = self._build_request_payload(messages, temperature, max_tokens, stream=True)
-        headers = self._build_request_headers()
-        endpoint = self._get_chat_endpoint()
+        headers = self._headers
+        endpoint = self._endpoint
+
+        if httpx is None:
+            yield from self._chat_stream_urllib(endpoint, payload, headers)
+            return
+
+        try:
+            data = _dumps(payload)
+            with _get_sync_client().stream('POST', endpoint, content=data, headers=headers,
+                                           timeout=self.timeout) as response:
+                if response.is_error:
+                    error_msg = response.read().decode('utf-8')
+                    yield StreamError(f"\n\n[错误: HTTP {response.status_code} - {error_msg}]\n")
+                    return
+                for line in response.iter_lines():
+                    # 先检查前缀，event/id/注释/空行直接跳过
+                    if not line.startswith('data: '):
+                        continue
+                    content = self._parse_stream_chunk(line[6:].strip())
+                    if content:
+                        yield content
+
+        except httpx.TransportError as e:
+            yield StreamError(f"\n\n[错误: 网络连接失败 - {str(e)}]\n")
+        except Exception as e:
+            yield StreamError(f"\n\n[错误: {str(e)}]\n")
+
+    def chat(self, messages: List[Dict[str, str]],
+             temperature: Optional[float] = None,
+             max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        payload = self._build_request_payload(messages, temperature, max_tokens, stream=False)
+        headers = self._headers
+        endpoint = self._endpoint
+
+        if httpx is None:
+            return self._chat_urllib(endpoint, payload, headers)
+
+        client = _get_sync_client()
+        for attempt in range(self.max_retries):
+            try:
+                response = client.post(endpoint, content=_dumps(payload),
+                                       headers=headers, timeout=self.timeout)
+                response.raise_for_status()
+                response_data = _loads(response.content)
+                content = self._parse_response(response_data)
+
+                return {
+                    "success": True,
+                    "content": content,
+                    "usage": response_data.get('usage', {}),
+                    "model": response_data.get('model', self.model)
+                }
+
+            except httpx.HTTPStatusError as e:
+                error_msg = e.response.text
+                logger.warning("HTTP错误 (尝试 %s/%s): %s - %s", attempt + 1, self.max_retries, e.response.status_code, error_msg)
+                if attempt < self.max_retries - 1 and e.response.status_code in _RETRY_STATUSES:
+                    time.sleep(_retry_delay(attempt))
+                else:
+                    return {"success": False, "error": f"HTTP {e.response.status_code}: {error_msg}"}
+
+            except httpx.TransportError as e:
+                logger.warning("网络错误 (尝试 %s/%s): %s", attempt + 1, self.max_retries, e)
+                if attempt < self.max_retries - 1:
+                    time.sleep(_retry_delay(attempt))
+                else:
+                    return {"success": False, "error": f"网络错误: {str(e)}"}
+
+            except Exception as e:
+                logger.warning("未知错误 (尝试 %s/%s): %s", attempt + 1, self.max_retries, e)
+                if attempt < self.max_retries - 1:
+                    time.sleep(_retry_delay(attempt))
+                else:
+                    return {"success": False, "error": f"未知错误: {str(e)}"}
+
+        return {"success": False, "error": "超过最大重试次数"}
 
+    def _chat_stream_urllib(self, endpoint: str, payload: Dict[str, Any],
+                            headers: Dict[str, str]) -> Iterator[str]:
+        """未安装 httpx 时的流式请求实现（每次请求新建连接）"""
         try:
-            data = json.dumps(payload).encode('utf-8')
+            data = _dumps(payload)
             req = urllib.request.Request(endpoint, data=data, headers=headers, method='POST')
 
             with urllib.request.urlopen(req, timeout=self.timeout) as response:
                 for line in response:
-                    line = line.decode('utf-8').strip()
-                    if not line:
+                    # 在原始字节上检查前缀，只有 data 行才交给解析（JSON 解析直接接受字节）
+                    if not line.startswith(b'data: '):
                         continue
-                    content = self._parse_stream_chunk(line)
+                    content = self._parse_stream_chunk(line[6:].strip())
                     if content:
                         yield content
 
         except urllib.error.HTTPError as e:
             error_msg = e.read().decode('utf-8')
-            yield f"\n\n[错误: HTTP {e.code} - {error_msg}]\n"
+            yield StreamError(f"\n\n[错误: HTTP {e.code} - {error_msg}]\n")
         except urllib.error.URLError as e:
-            yield f"\n\n[错误: 网络连接失败 - {str(e.reason)}]\n"
+            yield StreamError(f"\n\n[错误: 网络连接失败 - {str(e.reason)}]\n")
         except Exception as e:
-            yield f"\n\n[错误: {str(e)}]\n"
-
-    def chat(self, messages: List[Dict[str, str]],
-             temperature: Optional[float] = None,
-             max_tokens: Optional[int] = None) -> Dict[str, Any]:
-        payload = self._build_request_payload(messages, temperature, max_tokens, stream=False)
-        headers = self._build_request_headers()
-        endpoint = self._get_chat_endpoint()
+            yield StreamError(f"\n\n[错误: {str(e)}]\n")
 
+    def _chat_urllib(self, endpoint: str, payload: Dict[str, Any],
+                     headers: Dict[str, str]) -> Dict[str, Any]:
+        """未安装 httpx 时的对话请求实现（每次请求新建连接）"""
         for attempt in range(self.max_retries):
             try:
-                data = json.dumps(payload).encode('utf-8')
+                data = _dumps(payload)
                 req = urllib.request.Request(endpoint, data=data, headers=headers, method='POST')
 
                 with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                    response_data = json.loads(response.read().decode('utf-8'))
+                    response_data = _loads(response.read())
                     content = self._parse_response(response_data)
 
                     return {
@@ -157,35 +375,181 @@ class LLMProtocolAdapter(ABC):
 
             except urllib.error.HTTPError as e:
                 error_msg = e.read().decode('utf-8')
-                print(f"HTTP错误 (尝试 {attempt + 1}/{self.max_retries}): {e.code} - {error_msg}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                logger.warning("HTTP错误 (尝试 %s/%s): %s - %s", attempt + 1, self.max_retries, e.code, error_msg)
+                if attempt < self.max_retries - 1 and e.code in _RETRY_STATUSES:
+                    time.sleep(_retry_delay(attempt))
                 else:
                     return {"success": False, "error": f"HTTP {e.code}: {error_msg}"}
 
             except urllib.error.URLError as e:
-                print(f"网络错误 (尝试 {attempt + 1}/{self.max_retries}): {str(e.reason)}")
+                logger.warning("网络错误 (尝试 %s/%s): %s", attempt + 1, self.max_retries, e.reason)
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(_retry_delay(attempt))
                 else:
                     return {"success": False, "error": f"网络错误: {str(e.reason)}"}
 
             except Exception as e:
-                print(f"未知错误 (尝试 {attempt + 1}/{self.max_retries}): {str(e)}")
+                logger.warning("未知错误 (尝试 %s/%s): %s", attempt + 1, self.max_retries, e)
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(_retry_delay(attempt))
                 else:
                     return {"success": False, "error": f"未知错误: {str(e)}"}
 
         return {"success": False, "error": "超过最大重试次数"}
 
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """
+        获取当前事件循环下复用的异步 HTTP 客户端
+
+        连接池绑定事件循环，每个循环各自持有一个客户端，并发的多个循环互不驱逐。
+        已关闭循环的客户端无法再 aclose，创建新客户端时释放其引用，由 GC 回收连接；
+        短生命周期的循环应在结束前调用 aclose()。
+
+        Returns:
+            httpx.AsyncClient: 共享连接池的异步客户端
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                for closed_loop in [l for l in self._async_clients if l.is_closed()]:
+                    del self._async_clients[closed_loop]
+                client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=_ASYNC_MAX_CONNECTIONS,
+                                        max_keepalive_connections=_ASYNC_MAX_CONNECTIONS)
+                )
+                self._async_clients[loop] = client
+        return client
+
+    async def achat(self, messages: List[Dict[str, str]],
+                    temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        异步对话，返回格式与 chat 相同
+
+        复用连接池，等待响应期间不阻塞事件循环；失败时按指数退避重试。
 
-class OpenAIAdapter(LLMProtocolAdapter):
-    """OpenAI API协议适配器"""
+        Args:
+            messages: 消息列表
+            temperature: 温度参数
+            max_tokens: 最大生成 token 数
+
+        Returns:
+            Dict[str, Any]: 对话结果
+        """
+        if httpx is None:
+            return await asyncio.to_thread(self.chat, messages, temperature, max_tokens)
+
+        payload = self._build_request_payload(messages, temperature, max_tokens, stream=False)
+        headers = self._headers
+        endpoint = self._endpoint
+        client = self._get_async_client()
+
+        for attempt in range(self.max_retries):
+            try:
+                response = await client.post(endpoint, content=_dumps(payload), headers=headers)
+                response.raise_for_status()
+                response_data = _loads(response.content)
+                content = self._parse_response(response_data)
+
+                return {
+                    "success": True,
+                    "content": content,
+                    "usage": response_data.get('usage', {}),
+                    "model": response_data.get('model', self.model)
+                }
+
+            except httpx.HTTPStatusError as e:
+                error_msg = e.response.text
+                logger.warning("HTTP错误 (尝试 %s/%s): %s - %s", attempt + 1, self.max_retries, e.response.status_code, error_msg)
+                if attempt < self.max_retries - 1 and e.response.status_code in _RETRY_STATUSES:
+                    await asyncio.sleep(_retry_delay(attempt))
+                else:
+                    return {"success": False, "error": f"HTTP {e.response.status_code}: {error_msg}"}
+
+            except httpx.TransportError as e:
+                logger.warning("网络错误 (尝试 %s/%s): %s", attempt + 1, self.max_retries, e)
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(_retry_delay(attempt))
+                else:
+                    return {"success": False, "error": f"网络错误: {str(e)}"}
+
+            except Exception as e:
+                logger.warning("未知错误 (尝试 %s/%s): %s", attempt + 1, self.max_retries, e)
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(_retry_delay(attempt))
+                else:
+                    return {"success": False, "error": f"未知错误: {str(e)}"}
+
+        return {"success": False, "error": "超过最大重试次数"}
+
+    async def achat_stream(self, messages: List[Dict[str, str]],
+                           temperature: Optional[float] = None,
+                           max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        异步流式对话，产出内容与 chat_stream 相同
+
+        Args:
+            messages: 消息列表
+            temperature: 温度参数
+            max_tokens: 最大生成 token 数
+
+        Yields:
+            str: 逐段生成的内容，出错时产出 StreamError 错误提示
+        """
+        if httpx is None:
+            # 无 httpx 时在线程中逐段拉取同步流
+            stream = self.chat_stream(messages, temperature, max_tokens)
+            while True:
+                chunk = await asyncio.to_thread(next, stream, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+        payload = self._build_request_payload(messages, temperature, max_tokens, stream=True)
+        headers = self._headers
+        endpoint = self._endpoint
+
+        try:
+            data = _dumps(payload)
+            async with self._get_async_client().stream('POST', endpoint, content=data,
+                                                       headers=headers) as response:
+                if response.is_error:
+                    error_msg = (await response.aread()).decode('utf-8')
+                    yield StreamError(f"\n\n[错误: HTTP {response.status_code} - {error_msg}]\n")
+                    return
+                async for line in response.aiter_lines():
+                    if not line.startswith('data: '):
+                        continue
+                    content = self._parse_stream_chunk(line[6:].strip())
+                    if content:
+                        yield content
+
+        except httpx.TransportError as e:
+            yield StreamError(f"\n\n[错误: 网络连接失败 - {str(e)}]\n")
+        except Exception as e:
+            yield StreamError(f"\n\n[错误: {str(e)}]\n")
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环下的异步 HTTP 客户端及其连接池"""
+        with self._async_clients_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+class OpenAICompatibleAdapter(LLMProtocolAdapter):
+    """
+    通用OpenAI兼容协议适配器
+
+    OpenAI、Gemini（OpenAI 兼容端点）与 Ollama 共用请求格式和响应解析，
+    子类只需覆盖默认 api_base 等协议差异。
+    """
 
     def _init_protocol_specific(self, config: Dict[str, Any]):
         if not self.api_base:
-            self.api_base = "https://api.openai.com/v1"
+            raise ValueError("OpenAI兼容协议必须提供api_base参数")
 
     def _build_request_payload(self, messages: List[Dict[str, str]],
                                temperature: Optional[float] = None,
@@ -197,38 +561,48 @@ class OpenAIAdapter(LLMProtocolAdapter):
             "temperature": temperature if temperature is not None else self.temperature,
             "max_tokens": max_tokens if max_tokens is not None else self.max_tokens,
             "top_p": self.top_p,
-            "frequency_penalty": self.frequency_penalty,
-            "presence_penalty": self.presence_penalty,
             "stream": stream
         }
 
     def _build_request_headers(self) -> Dict[str, str]:
-        return {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
 
     def _get_chat_endpoint(self) -> str:
         return f"{self.api_base.rstrip('/')}/chat/completions"
 
-    def _parse_stream_chunk(self, line: str) -> Optional[str]:
-        if not line.startswith('data: '):
-            return None
-        data_str = line[6:].strip()
-        if data_str == '[DONE]':
+    def _parse_stream_chunk(self, data: AnyStr, _loads=_loads) -> Optional[str]:
+        # 每个 token 调用一次：直接下标取值，缺字段（如仅含 usage 的末尾块）走异常分支
+        if data in _SSE_DONE:
             return None
         try:
-            chunk = json.loads(data_str)
-            delta = chunk.get('choices', [{}])[0].get('delta', {})
-            content = delta.get('content', '')
-            return content if content else None
-        except json.JSONDecodeError:
+            return _loads(data)['choices'][0]['delta'].get('content') or None
+        except (json.JSONDecodeError, LookupError, TypeError, AttributeError):
             return None
 
     def _parse_response(self, response_data: Dict[str, Any]) -> str:
         return response_data['choices'][0]['message']['content']
 
 
+class OpenAIAdapter(OpenAICompatibleAdapter):
+    """OpenAI API协议适配器"""
+
+    def _init_protocol_specific(self, config: Dict[str, Any]):
+        if not self.api_base:
+            self.api_base = "https://api.openai.com/v1"
+
+    def _build_request_payload(self, messages: List[Dict[str, str]],
+                               temperature: Optional[float] = None,
+                               max_tokens: Optional[int] = None,
+                               stream: bool = False) -> Dict[str, Any]:
+        payload = super()._build_request_payload(messages, temperature, max_tokens, stream)
+        payload["frequency_penalty"] = self.frequency_penalty
+        payload["presence_penalty"] = self.presence_penalty
+        return payload
+
+
 class AnthropicAdapter(LLMProtocolAdapter):
     """Anthropic Claude API协议适配器"""
 
@@ -270,12 +644,9 @@ class AnthropicAdapter(LLMProtocolAdapter):
     def _get_chat_endpoint(self) -> str:
         return f"{self.api_base.rstrip('/')}/messages"
 
-    def _parse_stream_chunk(self, line: str) -> Optional[str]:
-        if not line.startswith('data: '):
-            return None
-        data_str = line[6:].strip()
+    def _parse_stream_chunk(self, data: AnyStr) -> Optional[str]:
         try:
-            chunk = json.loads(data_str)
+            chunk = _loads(data)
             if chunk.get('type') == 'content_block_delta':
                 delta = chunk.get('delta', {})
                 if delta.get('type') == 'text_delta':
@@ -290,99 +661,13 @@ class AnthropicAdapter(LLMProtocolAdapter):
         return ''.join(text_content)
 
 
-class GoogleAdapter(LLMProtocolAdapter):
+class GoogleAdapter(OpenAICompatibleAdapter):
     """Google Gemini API协议适配器"""
 
     def _init_protocol_specific(self, config: Dict[str, Any]):
         if not self.api_base:
             self.api_base = "https://generativelanguage.googleapis.com/v1beta/openai"
 
-    def _build_request_payload(self, messages: List[Dict[str, str]],
-                               temperature: Optional[float] = None,
-                               max_tokens: Optional[int] = None,
-                               stream: bool = False) -> Dict[str, Any]:
-        return {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature if temperature is not None else self.temperature,
-            "max_tokens": max_tokens if max_tokens is not None else self.max_tokens,
-            "top_p": self.top_p,
-            "stream": stream
-        }
-
-    def _build_request_headers(self) -> Dict[str, str]:
-        return {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
-
-    def _get_chat_endpoint(self) -> str:
-        return f"{self.api_base.rstrip('/')}/chat/completions"
-
-    def _parse_stream_chunk(self, line: str) -> Optional[str]:
-        if not line.startswith('data: '):
-            return None
-        data_str = line[6:].strip()
-        if data_str == '[DONE]':
-            return None
-        try:
-            chunk = json.loads(data_str)
-            delta = chunk.get('choices', [{}])[0].get('delta', {})
-            content = delta.get('content', '')
-            return content if content else None
-        except json.JSONDecodeError:
-            return None
-
-    def _parse_response(self, response_data: Dict[str, Any]) -> str:
-        return response_data['choices'][0]['message']['content']
-
-
-class OpenAICompatibleAdapter(LLMProtocolAdapter):
-    """通用OpenAI兼容协议适配器"""
-
-    def _init_protocol_specific(self, config: Dict[str, Any]):
-        if not self.api_base:
-            raise ValueError("OpenAI兼容协议必须提供api_base参数")
-
-    def _build_request_payload(self, messages: List[Dict[str, str]],
-                               temperature: Optional[float] = None,
-                               max_tokens: Optional[int] = None,
-                               stream: bool = False) -> Dict[str, Any]:
-        return {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature if temperature is not None else self.temperature,
-            "max_tokens": max_tokens if max_tokens is not None else self.max_tokens,
-            "top_p": self.top_p,
-            "stream": stream
-        }
-
-    def _build_request_headers(self) -> Dict[str, str]:
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
-
-    def _get_chat_endpoint(self) -> str:
-        return f"{self.api_base.rstrip('/')}/chat/completions"
-
-    def _parse_stream_chunk(self, line: str) -> Optional[str]:
-        if not line.startswith('data: '):
-            return None
-        data_str = line[6:].strip()
-        if data_str == '[DONE]':
-            return None
-        try:
-            chunk = json.loads(data_str)
-            delta = chunk.get('choices', [{}])[0].get('delta', {})
-            content = delta.get('content', '')
-            return content if content else None
-        except json.JSONDecodeError:
-            return None
-
-    def _parse_response(self, response_data: Dict[str, Any]) -> str:
-        return response_data['choices'][0]['message']['content']
-
 
 class OllamaAdapter(OpenAICompatibleAdapter):
     """Ollama 本地模型适配器"""
@@ -412,8 +697,50 @@ class LLMClientFactory:
         "local": "openai-compatible",
     }
 
+    # 配置指纹 -> 适配器（LRU）；相同配置的 LLMClient 共享同一适配器及其异步连接池
+    _ADAPTER_CACHE: "OrderedDict[str, LLMProtocolAdapter]" = OrderedDict()
+    _ADAPTER_CACHE_SIZE = 32
+    _ADAPTER_CACHE_LOCK = threading.Lock()
+
     @staticmethod
     def create_adapter(config: Dict[str, Any]) -> LLMProtocolAdapter:
+        """
+        创建（或复用）协议适配器
+
+        适配器构造后只读（异步客户端按事件循环懒创建），
+        因此按完整配置的 SHA-256 指纹缓存，任一配置项不同都会得到新的适配器。
+        键中不含明文配置（如 api_key），缓存按最近使用顺序淘汰。
+
+        Args:
+            config: 模型配置
+
+        Returns:
+            LLMProtocolAdapter: 协议适配器
+        """
+        raw = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+        key = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+        cache = LLMClientFactory._ADAPTER_CACHE
+        with LLMClientFactory._ADAPTER_CACHE_LOCK:
+            adapter = cache.get(key)
+            if adapter is not None:
+                cache.move_to_end(key)
+                return adapter
+        adapter = LLMClientFactory._build_adapter(config)
+        with LLMClientFactory._ADAPTER_CACHE_LOCK:
+            adapter = cache.setdefault(key, adapter)
+            cache.move_to_end(key)
+            while len(cache) > LLMClientFactory._ADAPTER_CACHE_SIZE:
+                cache.popitem(last=False)
+        return adapter
+
+    @staticmethod
+    def clear_cache() -> None:
+        """清空适配器缓存"""
+        with LLMClientFactory._ADAPTER_CACHE_LOCK:
+            LLMClientFactory._ADAPTER_CACHE.clear()
+
+    @staticmethod
+    def _build_adapter(config: Dict[str, Any]) -> LLMProtocolAdapter:
         # 支持 'provider'（YAML配置）和 'provider_type' 两种配置键
         provider_type = config.get('provider', config.get('provider_type', ProtocolType.OPENAI.value))
         provider_type = provider_type.lower()
@@ -451,9 +778,32 @@ class LLMClientFactory:
 class LLMClient:
     """统一的LLM客户端"""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], cache: Optional[LLMCache] = None,
+                 semantic_cache: Optional[SemanticCache] = None):
         self.adapter = LLMClientFactory.create_adapter(config)
         self.config = config
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+
+    def _cache_key(self, messages: List[Dict[str, str]],
+                   temperature: Optional[float],
+                   max_tokens: Optional[int],
+                   force_cache: bool) -> Optional[str]:
+        """
+        计算可缓存请求的缓存键
+
+        默认只缓存 temperature 为 0 的确定性请求，force_cache 为 True 时不限制。
+
+        Returns:
+            Optional[str]: 缓存键，不可缓存时返回 None
+        """
+        if self.cache is None:
+            return None
+        temperature = temperature if temperature is not None else self.adapter.temperature
+        if temperature != 0 and not force_cache:
+            return None
+        max_tokens = max_tokens if max_tokens is not None else self.adapter.max_tokens
+        return LLMCache.make_key(self.adapter.model, messages, temperature, max_tokens)
 
     def chat_stream(self, messages: List[Dict[str, str]],
                     temperature: Optional[float] = None,
@@ -462,70 +812,92 @@ class LLMClient:
 
     def chat(self, messages: List[Dict[str, str]],
              temperature: Optional[float] = None,
-             max_tokens: Optional[int] = None) -> Dict[str, Any]:
-        return self.adapter.chat(messages, temperature, max_tokens)
-
-    def generate_travel_recommendation(self, user_query: str,
-                                       context: str,
-                                       available_cities: List[str]) -> Dict[str, Any]:
-        """生成旅游推荐"""
-        system_prompt = f"""你是一个专业的旅游助手，负责根据用户需求推荐合适的旅游城市。
-
-可推荐城市列表：{', '.join(available_cities)}
-
-当前用户偏好：
-{context}
-
-请基于用户需求，从可推荐城市中选择3-5个最合适的城市，并以JSON格式返回：
-{{
-    "recommendations": [
-        {{
-            "city": "城市名",
-            "reason": "推荐理由（50字以内）",
-            "match_score": 90
-        }}
-    ],
-    "explanation": "整体推荐说明（100字以内）"
-}}
-
-注意：
-1. 只推荐列表中存在的城市
-2. match_score为匹配度评分（0-100）
-3. 推荐理由需结合用户偏好和城市特色
-4. 按匹配度从高到低排序"""
+             max_tokens: Optional[int] = None,
+             force_cache: bool = False) -> Dict[str, Any]:
+        key = self._cache_key(messages, temperature, max_tokens, force_cache)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = self.adapter.chat(messages, temperature, max_tokens)
+        if key is not None and response.get('success'):
+            self.cache.set(key, response)
+        return response
+
+    async def achat(self, messages: List[Dict[str, str]],
+                    temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None,
+                    force_cache: bool = False) -> Dict[str, Any]:
+        key = self._cache_key(messages, temperature, max_tokens, force_cache)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = await self.adapter.achat(messages, temperature, max_tokens)
+        if key is not None and response.get('success'):
+            self.cache.set(key, response)
+        return response
+
+    def achat_stream(self, messages: List[Dict[str, str]],
+                     temperature: Optional[float] = None,
+                     max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        return self.adapter.achat_stream(messages, temperature, max_tokens)
+
+    async def aclose(self) -> None:
+        await self.adapter.aclose()
+
+    async def __aenter__(self) -> 'LLMClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def batch_chat(self, batch: List[List[Dict[str, str]]],
+                   temperature: Optional[float] = None,
+                   max_tokens: Optional[int] = None,
+                   max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        批量对话
+
+        多组相互独立的消息并发请求，总耗时接近最慢的一次请求。
+        结果顺序与输入一致，单个请求失败不影响其他请求。
+
+        Args:
+            batch: 消息列表的列表，每项为一次独立对话
+            temperature: 温度参数
+            max_tokens: 最大生成 token 数
+            max_workers: 最大并发请求数
+
+        Returns:
+            List[Dict[str, Any]]: 与输入一一对应的对话结果
+        """
+        if len(batch) <= 1:
+            return [self.chat(messages, temperature, max_tokens) for messages in batch]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batch))) as executor:
+            return list(executor.map(
+                lambda messages: self.chat(messages, temperature, max_tokens), batch
+            ))
 
-        messages = [
+    @staticmethod
+    def _recommendation_messages(user_query: str, context: str,
+                                 available_cities: List[str]) -> List[Dict[str, str]]:
+        """构建旅游推荐请求消息"""
+        # 城市列表与输出要求组成的前缀对同一城市目录保持不变，便于命中服务端前缀缓存；
+        # 随请求变化的用户偏好放在末尾
+        system_prompt = f"{_recommendation_prompt_prefix(tuple(available_cities))}\n\n当前用户偏好：\n{context}"
+
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_query}
         ]
 
-        response = self.chat(messages, temperature=0.7)
-
-        if not response['success']:
-            return response
-
-        try:
-            content = response['content']
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
-
-            recommendations = json.loads(content)
-            response['recommendations'] = recommendations
-            return response
-        except json.JSONDecodeError as e:
-            return {
-                "success": False,
-                "error": f"JSON解析失败: {str(e)}",
-                "raw_content": response['content']
-            }
-
-    def generate_route_plan(self, city: str,
-                           days: int,
-                           attractions: List[Dict[str, Any]],
-                           user_preference: str) -> Dict[str, Any]:
-        """生成旅游路线规划"""
+    @staticmethod
+    def _route_plan_messages(city: str, days: int, attractions: List[Dict[str, Any]],
+                             user_preference: str) -> List[Dict[str, str]]:
+        """构建路线规划请求消息"""
         attractions_info = "\n".join([
             f"- {a['name']}：{a['type']}，建议游玩{a['duration']}小时，门票{a['ticket']}元"
             for a in attractions
@@ -566,25 +938,33 @@ class LLMClient:
 3. 提供实用的旅行建议
 4. 估算各项费用"""
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": f"帮我规划{city}{days}天的旅游路线"}
         ]
 
-        response = self.chat(messages, temperature=0.6)
+    @staticmethod
+    def _attach_json(response: Dict[str, Any], field: str) -> Dict[str, Any]:
+        """
+        解析回答中的 JSON 并挂到响应的指定字段
+
+        Args:
+            response: chat / achat 的返回结果
+            field: 解析结果写入的字段名
 
+        Returns:
+            Dict[str, Any]: 成功时为附带解析结果的响应，否则为错误信息
+        """
         if not response['success']:
             return response
 
         try:
             content = response['content']
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
+            fenced = _JSON_FENCE_RE.search(content)
+            if fenced:
+                content = fenced.group(1)
 
-            route_plan = json.loads(content)
-            response['route_plan'] = route_plan
+            response[field] = _loads(content)
             return response
         except json.JSONDecodeError as e:
             return {
@@ -592,3 +972,113 @@ class LLMClient:
                 "error": f"JSON解析失败: {str(e)}",
                 "raw_content": response['content']
             }
+
+    def generate_travel_recommendation(self, user_query: str,
+                                       context: str,
+                                       available_cities: List[str]) -> Dict[str, Any]:
+        """生成旅游推荐"""
+        cached, scope, vector = self._lookup_recommendation(user_query, context, available_cities)
+        if cached is not None:
+            return cached
+        messages = self._recommendation_messages(user_query, context, available_cities)
+        response = self._attach_json(self.chat(messages, temperature=0.7), 'recommendations')
+        self._store_recommendation(scope, vector, response)
+        return response
+
+    async def agenerate_travel_recommendation(self, user_query: str,
+                                              context: str,
+                                              available_cities: List[str]) -> Dict[str, Any]:
+        """生成旅游推荐（异步）"""
+        cached, scope, vector = self._lookup_recommendation(user_query, context, available_cities)
+        if cached is not None:
+            return cached
+        messages = self._recommendation_messages(user_query, context, available_cities)
+        response = self._attach_json(await self.achat(messages, temperature=0.7), 'recommendations')
+        self._store_recommendation(scope, vector, response)
+        return response
+
+    def generate_travel_recommendation_stream(self, user_query: str,
+                                              context: str,
+                                              available_cities: List[str]
+                                              ) -> Generator[str, None, Dict[str, Any]]:
+        """
+        流式生成旅游推荐
+
+        逐段产出模型输出供界面实时展示，流结束后解析 JSON，
+        解析结果作为生成器的返回值（StopIteration.value / yield from 的结果）。
+
+        Yields:
+            str: 逐段生成的内容，出错时产出 StreamError 错误提示
+
+        Returns:
+            Dict[str, Any]: 与 generate_travel_recommendation 相同格式的结果
+        """
+        cached, scope, vector = self._lookup_recommendation(user_query, context, available_cities)
+        if cached is not None:
+            yield cached['content']
+            return cached
+        messages = self._recommendation_messages(user_query, context, available_cities)
+        response = yield from self._stream_json(messages, 0.7, 'recommendations')
+        self._store_recommendation(scope, vector, response)
+        return response
+
+    def generate_route_plan_stream(self, city: str,
+                                   days: int,
+                                   attractions: List[Dict[str, Any]],
+                                   user_preference: str) -> Generator[str, None, Dict[str, Any]]:
+        """
+        流式生成旅游路线规划，用法同 generate_travel_recommendation_stream
+
+        Yields:
+            str: 逐段生成的内容，出错时产出 StreamError 错误提示
+
+        Returns:
+            Dict[str, Any]: 与 generate_route_plan 相同格式的结果
+        """
+        messages = self._route_plan_messages(city, days, attractions, user_preference)
+        return (yield from self._stream_json(messages, 0.6, 'route_plan'))
+
+    def _stream_json(self, messages: List[Dict[str, str]], temperature: float,
+                     field: str) -> Generator[str, None, Dict[str, Any]]:
+        """逐段转发流式输出，结束后拼接全文并解析 JSON"""
+        chunks = []
+        for chunk in self.chat_stream(messages, temperature=temperature):
+            chunks.append(chunk)
+            yield chunk
+        response = {"success": True, "content": "".join(chunks), "model": self.adapter.model}
+        return self._attach_json(response, field)
+
+    def _lookup_recommendation(self, user_query: str, context: str,
+                               available_cities: List[str]) -> tuple:
+        """
+        在语义缓存中查找近似问题的推荐结果
+
+        Returns:
+            tuple: (命中的响应或 None, 作用域键, 查询向量)；未启用语义缓存时均为 None
+        """
+        if self.semantic_cache is None:
+            return None, None, None
+        scope = SemanticCache.make_scope(self.adapter.model, context, list(available_cities))
+        cached, vector = self.semantic_cache.lookup(user_query, scope)
+        return cached, scope, vector
+
+    def _store_recommendation(self, scope: Optional[str], vector, response: Dict[str, Any]) -> None:
+        """推荐成功时写入语义缓存"""
+        if scope is not None and response.get('success'):
+            self.semantic_cache.add(vector, scope, response)
+
+    def generate_route_plan(self, city: str,
+                           days: int,
+                           attractions: List[Dict[str, Any]],
+                           user_preference: str) -> Dict[str, Any]:
+        """生成旅游路线规划"""
+        messages = self._route_plan_messages(city, days, attractions, user_preference)
+        return self._attach_json(self.chat(messages, temperature=0.6), 'route_plan')
+
+    async def agenerate_route_plan(self, city: str,
+                                  days: int,
+                                  attractions: List[Dict[str, Any]],
+                                  user_preference: str) -> Dict[str, Any]:
+        """生成旅游路线规划（异步）"""
+        messages = self._route_plan_messages(city, days, attractions, user_preference)
+        return self._attach_json(await self.achat(messages, temperature=0.6), 'route_plan')
@@ -5,7 +5,7 @@
 采用双层记忆架构：工作记忆用于当前会话，长期记忆用于历史会话存档。
 
 主要组件:
-- Message: 对话消息数据类
+- Message: 对话消息数据类（用于加载存档时规范化消息字段）
 - UserPreference: 用户偏好数据类
 - MemoryManager: 记忆管理器核心类
 
@@ -40,10 +40,43 @@
 """
 
 import json
+import re
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 from collections import deque
+from itertools import islice
+
+
+# 可选依赖：orjson 序列化明显快于标准库 json，直接输出 UTF-8 字节
+try:
+    import orjson
+
+    def _dump_json(data: Any) -> bytes:
+        """序列化为缩进 2 格的 UTF-8 JSON 字节"""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    _loads = orjson.loads
+except ImportError:
+    def _dump_json(data: Any) -> bytes:
+        """序列化为缩进 2 格的 UTF-8 JSON 字节"""
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    _loads = json.loads
+
+# 偏好提取用的正则与兴趣关键词，模块加载时构建一次
+_NUMBER_RE = re.compile(r'\d+')
+_DAYS_RE = re.compile(r'(\d+)\s*天')
+# (关键词, 标准兴趣标签)，按原有顺序匹配
+_INTEREST_KEYWORDS = (
+    ('历史', '历史文化'),
+    ('文化', '历史文化'),
+    ('自然', '自然风光'),
+    ('风景', '自然风光'),
+    ('美食', '美食'),
+    ('海边', '海滨度假'),
+    ('海滨', '海滨度假'),
+    ('购物', '现代都市'),
+    ('休闲', '休闲养生'),
+)
 
 
 class Message:
@@ -134,12 +167,9 @@ class UserPreference:
         Args:
             text: str 用户输入文本
         """
-        text_lower = text.lower()
-
         # 提取预算
         if '预算' in text or '元' in text or '块' in text:
-            import re
-            numbers = re.findall(r'\d+', text)
+            numbers = _NUMBER_RE.findall(text)
             if numbers:
                 nums = [int(n) for n in numbers]
                 if len(nums) >= 2:
@@ -149,24 +179,12 @@ class UserPreference:
 
         # 提取天数
         if '天' in text:
-            import re
-            match = re.search(r'(\d+)\s*天', text)
+            match = _DAYS_RE.search(text)
             if match:
                 self.travel_days = int(match.group(1))
 
         # 提取兴趣标签
-        interest_keywords = {
-            '历史': '历史文化',
-            '文化': '历史文化',
-            '自然': '自然风光',
-            '风景': '自然风光',
-            '美食': '美食',
-            '海边': '海滨度假',
-            '海滨': '海滨度假',
-            '购物': '现代都市',
-            '休闲': '休闲养生'
-        }
-        for keyword, tag in interest_keywords.items():
+        for keyword, tag in _INTEREST_KEYWORDS:
             if keyword in text and tag not in self.interest_tags:
                 self.interest_tags.append(tag)
 
@@ -207,6 +225,7 @@ class MemoryManager:
         self.max_long_term_memory = max_long_term_memory
 
         # 工作记忆：对话历史（固定长度deque）
+        # 消息直接以 {"role", "content", "timestamp"} 字典存储，读取时无需逐条转换
         self.conversation_history: deque = deque(maxlen=max_working_memory)
 
         # 用户偏好
@@ -221,8 +240,14 @@ class MemoryManager:
             "current_plan": None
         }
 
-        # 长期记忆：已存档的会话列表
-        self.long_term_memory: List[Dict[str, Any]] = []
+        # 长期记忆：已存档的会话列表，超出上限时自动淘汰最早的存档
+        self.long_term_memory: deque = deque(maxlen=max_long_term_memory)
+        # 上下文摘要缓存及其对应的偏好/会话状态快照
+        self._context_summary: str = ""
+        self._context_summary_key: Optional[tuple] = None
+
+        # session_id -> 存档记录（同一会话多次存档时指向最新一次）
+        self._archive_index: Dict[Any, Dict[str, Any]] = {}
 
     def add_message(self, role: str, content: str) -> None:
         """
@@ -232,13 +257,28 @@ class MemoryManager:
             role: str 消息角色，'user'或'assistant'
             content: str 消息内容
         """
-        message = Message(role, content)
-        self.conversation_history.append(message)
+        self.conversation_history.append(
+            {"role": role, "content": content, "timestamp": datetime.now().isoformat()}
+        )
 
         # 如果是用户消息，自动提取偏好
         if role == 'user':
             self.user_preference.update_from_text(content)
 
+    def extend_messages(self, messages: Iterable[Tuple[str, str]]) -> None:
+        """
+        批量添加对话消息
+
+        Args:
+            messages: Iterable[Tuple[str, str]] (角色, 内容) 序列，按顺序写入
+        """
+        for role, content in messages:
+            self.conversation_history.append(
+                {"role": role, "content": content, "timestamp": datetime.now().isoformat()}
+            )
+            if role == 'user':
+                self.user_preference.update_from_text(content)
+
     def get_conversation_history(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
         """
         获取对话历史
@@ -249,10 +289,25 @@ class MemoryManager:
         Returns:
             List[Dict]: 消息列表
         """
-        history = list(self.conversation_history)
-        if limit:
-            history = history[-limit:]
-        return [msg.to_dict() for msg in history]
+        return [dict(msg) for msg in self._recent_messages(limit)]
+
+    def _recent_messages(self, limit: Optional[int] = None) -> Iterable[Dict[str, str]]:
+        """
+        按时间顺序遍历最近的消息（不复制）
+
+        Args:
+            limit: int 可选，只遍历最近N条消息
+
+        Returns:
+            Iterable[Dict]: 存储中的消息字典
+        """
+        history = self.conversation_history
+        if limit and limit < len(history):
+            # 从尾部反向取 limit 条，只访问需要的消息
+            tail = list(islice(reversed(history), limit))
+            tail.reverse()
+            return tail
+        return history
 
     def get_messages_for_llm(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
         """
@@ -266,8 +321,7 @@ class MemoryManager:
         Returns:
             List[Dict]: 消息列表 [{'role': '...', 'content': '...'}]
         """
-        history = self.get_conversation_history(limit)
-        return [{"role": msg['role'], "content": msg['content']} for msg in history]
+        return [{"role": msg['role'], "content": msg['content']} for msg in self._recent_messages(limit)]
 
     def update_session_state(self, key: str, value: Any) -> None:
         """
@@ -308,7 +362,7 @@ class MemoryManager:
 
     def _archive_session(self) -> None:
         """归档当前会话到长期记忆"""
-        messages = self.get_conversation_history()
+        messages = list(self._recent_messages())
         session_state = self.session_state.copy()
         user_preference = self.user_preference.to_dict()
 
@@ -326,14 +380,25 @@ class MemoryManager:
                 'last_recommended_attractions': session_state.get('last_recommended_attractions', []),
                 'current_plan': session_state.get('current_plan')
             },
-            'messages': messages
+            # 列式存储，省去每条消息重复的键名；读取详情时由 _materialize_messages 还原
+            'messages': {
+                'roles': [m.get('role') for m in messages],
+                'contents': [m.get('content') for m in messages],
+                'timestamps': [m.get('timestamp') for m in messages]
+            }
         }
 
+        # deque 设有 maxlen，超出长期记忆上限时自动淘汰最早的存档
+        evicted = None
+        if self.long_term_memory and len(self.long_term_memory) == self.long_term_memory.maxlen:
+            evicted = self.long_term_memory[0]
         self.long_term_memory.append(archive_record)
 
-        # 限制长期记忆大小
-        while len(self.long_term_memory) > self.max_long_term_memory:
-            self.long_term_memory.pop(0)
+        if evicted is not None and self._archive_index.get(evicted['session_id']) is evicted:
+            del self._archive_index[evicted['session_id']]
+        # 容量为 0 时存档随即被丢弃，不加入索引
+        if self.long_term_memory:
+            self._archive_index[archive_record['session_id']] = archive_record
 
     def _generate_session_summary(self, messages: List[Dict], session_state: Dict) -> str:
         """
@@ -385,7 +450,7 @@ class MemoryManager:
             List[Dict]: 会话摘要列表
         """
         archives = []
-        for record in reversed(self.long_term_memory[-limit:]):
+        for record in islice(reversed(self.long_term_memory), limit or None):
             archives.append({
                 'session_id': record['session_id'],
                 'start_time': record['start_time'],
@@ -405,10 +470,34 @@ class MemoryManager:
         Returns:
             Optional[Dict]: 会话详情，不存在返回None
         """
-        for record in self.long_term_memory:
-            if record['session_id'] == session_id:
-                return record
-        return None
+        record = self._archive_index.get(session_id)
+        if record is None:
+            return None
+        return {**record, 'messages': self._materialize_messages(record)}
+
+    @staticmethod
+    def _materialize_messages(record: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        将存档中的列式消息还原为消息列表
+
+        Args:
+            record: Dict 存档记录
+
+        Returns:
+            List[Dict]: 消息列表（兼容旧版按条存储的存档）
+        """
+        messages = record.get('messages') or []
+        if isinstance(messages, list):
+            return [dict(msg) for msg in messages]
+        return [
+            {'role': role, 'content': content, 'timestamp': timestamp}
+            for role, content, timestamp in zip(
+                messages.get('roles', []), messages.get('contents', []), messages.get('timestamps', []))
+        ]
+
+    def _rebuild_archive_index(self) -> None:
+        """根据长期记忆重建 session_id 索引"""
+        self._archive_index = {record.get('session_id'): record for record in self.long_term_memory}
 
     def get_long_term_memory(self) -> List[Dict[str, Any]]:
         """
@@ -417,7 +506,7 @@ class MemoryManager:
         Returns:
             List[Dict]: 长期记忆列表
         """
-        return self.long_term_memory
+        return list(self.long_term_memory)
 
     def set_long_term_memory(self, memory: List[Dict[str, Any]]) -> None:
         """
@@ -426,7 +515,8 @@ class MemoryManager:
         Args:
             memory: List[Dict] 记忆列表
         """
-        self.long_term_memory = memory[-self.max_long_term_memory:]
+        self.long_term_memory = deque(memory, maxlen=self.max_long_term_memory)
+        self._rebuild_archive_index()
 
     def get_user_preference(self) -> Dict[str, Any]:
         """
@@ -455,12 +545,13 @@ class MemoryManager:
         """
         data = {
             "session_state": self.session_state,
-            "conversation_history": self.get_conversation_history(),
+            # 消息已是字典，直接序列化，无需逐条复制
+            "conversation_history": list(self.conversation_history),
             "user_preference": self.user_preference.to_dict(),
-            "long_term_memory": self.long_term_memory
+            "long_term_memory": list(self.long_term_memory)
         }
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(_dump_json(data))
 
     def load_from_file(self, filepath: str) -> bool:
         """
@@ -473,19 +564,20 @@ class MemoryManager:
             bool: 是否加载成功
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                data = _loads(f.read())
 
             self.session_state = data.get('session_state', {})
 
             self.conversation_history.clear()
             for msg_data in data.get('conversation_history', []):
-                msg = Message.from_dict(msg_data)
-                self.conversation_history.append(msg)
+                # 经 Message 规范化字段（缺失时间戳时补当前时间）
+                self.conversation_history.append(Message.from_dict(msg_data).to_dict())
 
             self.user_preference.from_dict(data.get('user_preference', {}))
 
-            self.long_term_memory = data.get('long_term_memory', [])
+            self.long_term_memory = deque(data.get('long_term_memory', []), maxlen=self.max_long_term_memory)
+            self._rebuild_archive_index()
 
             return True
         except Exception as e:
@@ -501,9 +593,15 @@ class MemoryManager:
         Returns:
             str: 格式化的摘要字符串
         """
-        summary_parts = []
-
         pref = self.user_preference
+        recommended = self.session_state.get('last_recommended_cities')
+        # 偏好与会话状态均为公开可变属性，以其取值快照判断缓存是否仍然有效
+        key = (pref.budget_range, pref.travel_days, tuple(pref.interest_tags),
+               tuple(pref.preferred_cities), tuple(recommended) if recommended else ())
+        if key == self._context_summary_key:
+            return self._context_summary
+
+        summary_parts = []
         if pref.budget_range:
             summary_parts.append(f"预算范围：{pref.budget_range[0]}-{pref.budget_range[1]}元/天")
         if pref.travel_days:
@@ -513,7 +611,9 @@ class MemoryManager:
         if pref.preferred_cities:
             summary_parts.append(f"偏好城市：{', '.join(pref.preferred_cities)}")
 
-        if self.session_state.get('last_recommended_cities'):
-            summary_parts.append(f"已推荐城市：{', '.join(self.session_state['last_recommended_cities'])}")
+        if recommended:
+            summary_parts.append(f"已推荐城市：{', '.join(recommended)}")
 
-        return "\n".join(summary_parts) if summary_parts else "暂无用户偏好信息"
+        self._context_summary = "\n".join(summary_parts) if summary_parts else "暂无用户偏好信息"
+        self._context_summary_key = key
+        return self._context_summary
@@ -2,13 +2,15 @@
 gRPC 服务器模块
 
 本模块提供Agent服务的gRPC服务器实现，支持同步和流式两种消息处理模式。
-采用多线程架构处理并发请求，通过队列机制实现思考过程的实时流式输出。
+基于 grpc.aio 异步服务器：所有请求与 Agent 处理都运行在同一个长期存在的事件循环上，
+Agent 内部的阻塞操作（同步工具、规划）自行交给线程执行，通过 asyncio 队列实现思考过程的实时流式输出。
 
 主要组件:
 - AsyncThoughtStreamer: 异步思考流式输出器（预留）
 - ThoughtStreamer: 同步思考流式输出器，用于实时传递思考过程
 - AgentServicer: Agent服务实现类，处理gRPC请求
-- serve(): 服务器启动函数
+- serve_async(): 异步服务器启动函数，运行至服务器终止
+- serve(): 同步入口，内部通过 asyncio.run() 运行 serve_async
 
 功能特点:
 - 真正的token级别流式输出
@@ -30,14 +32,16 @@ AGENT_ROOT = os.path.dirname(os.path.dirname(__file__))  # agent/
 if AGENT_ROOT not in sys.path:
     sys.path.insert(0, AGENT_ROOT)
 
+# 必须在导入任何 protobuf 模块之前设置：使用 upb（C 实现）后端，
+# 消息构造与序列化比纯 Python 实现快一到两个数量级
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
+
 import grpc
-from concurrent import futures
 import json
 import logging
 import asyncio
 import queue
-import threading
-from typing import Iterator
+from typing import AsyncIterator
 from datetime import datetime
 
 from proto import agent_pb2, agent_pb2_grpc
@@ -47,6 +51,51 @@ from core.travel_agent import ReActTravelAgent
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    from google.protobuf.internal import api_implementation
+    if api_implementation.Type() == "python":
+        logger.warning("protobuf 正在使用纯 Python 实现，消息序列化性能较差，请安装 protobuf>=4.21")
+except ImportError:
+    pass
+
+# 热路径上频繁构造的消息类与状态码，模块加载时绑定一次
+_StreamChunk = agent_pb2.StreamChunk
+_MessageResponse = agent_pb2.MessageResponse
+_ReasoningInfo = agent_pb2.ReasoningInfo
+_HealthResponse = agent_pb2.HealthResponse
+_INTERNAL = grpc.StatusCode.INTERNAL
+
+# 服务器通道参数：放宽消息大小上限，开启 HTTP/2 keepalive，避免长时间流式请求的连接被中间设备回收
+_MAX_MESSAGE_LENGTH = 16 * 1024 * 1024
+_SERVER_OPTIONS = [
+    ("grpc.max_concurrent_streams", 1000),
+    ("grpc.max_send_message_length", _MAX_MESSAGE_LENGTH),
+    ("grpc.max_receive_message_length", _MAX_MESSAGE_LENGTH),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.http2.min_time_between_pings_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+# HistoryStep 各子消息需要从历史记录中复制的字段
+_HISTORY_STEP_FIELDS = (
+    ("thought", ("id", "type", "content", "confidence", "decision")),
+    ("action", ("id", "tool_name", "status", "duration")),
+    ("evaluation", ("success", "duration")),
+)
+
+# 可选依赖：orjson 直接输出 UTF-8 字节，序列化多 KB 的步骤记录明显快于标准库 json
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, default=str)
+
+# 结果缺少子字段时共用的只读空字典，避免每次查找都新建默认值
+_EMPTY = {}
+
 
 class AsyncThoughtStreamer:
     """
@@ -180,16 +229,14 @@ class AgentServicer:
     实现所有gRPC服务方法。
 
     设计特点:
-    - 单例模式管理线程池，提高资源利用率
+    - 所有请求在同一事件循环上并发处理，不受线程数限制
     - 每个请求使用独立的request_id进行追踪和清理
     - 回调机制实现思考过程的实时流式输出
-    - 线程安全的异步处理架构
 
     属性:
         config_path: str 配置文件路径
         agent: ReActTravelAgent Agent实例
         _instances: dict 类变量，存储活跃请求的流式器
-        _thread_pool: ThreadPoolExecutor 类变量，共享线程池
 
     gRPC方法:
         ProcessMessage(): 同步处理单条消息
@@ -198,7 +245,6 @@ class AgentServicer:
     """
 
     _instances = {}  # 存储每个请求的流式器
-    _thread_pool = None  # 线程池
 
     def __init__(self, config_path: str = "config/llm_config.yaml"):
         """
@@ -209,24 +255,10 @@ class AgentServicer:
         """
         self.config_path = config_path
         self.agent = ReActTravelAgent(config_path=config_path)
+        # 健康检查响应内容固定，构建一次后复用（只读共享是线程安全的）
+        self._health_response = _HealthResponse(healthy=True, version="1.0.0", status="running")
         logger.info("Agent 服务已初始化")
 
-    @classmethod
-    def get_thread_pool(cls):
-        """
-        获取线程池（单例模式）
-
-        使用ThreadPoolExecutor创建线程池，最大10个工作线程。
-        线程名称前缀为"agent_worker"，便于调试和监控。
-
-        Returns:
-            ThreadPoolExecutor: 共享的线程池实例
-        """
-        if cls._thread_pool is None:
-            cls._thread_pool = futures.ThreadPoolExecutor(max_workers=10, thread_name_prefix="agent_worker")
-            logger.info("Agent 线程池已初始化")
-        return cls._thread_pool
-
     @classmethod
     def cleanup_instance(cls, request_id: str):
         """
@@ -241,11 +273,11 @@ class AgentServicer:
             del cls._instances[request_id]
             logger.debug(f"[Stream-{request_id}] 实例已清理")
 
-    def ProcessMessage(self, request, context):
+    async def ProcessMessage(self, request, context):
         """
         处理消息（非流式）
 
-        同步处理单条消息，等待完整结果后返回。
+        直接在服务器事件循环上等待 Agent 协程，等待期间可处理其他请求。
         适用于不需要实时展示思考过程的场景。
 
         Args:
@@ -256,27 +288,28 @@ class AgentServicer:
             MessageResponse: 包含处理结果的响应消息
         """
         try:
-            result = self.agent.process_sync(request.user_input)
+            result = await self.agent.process(request.user_input)
             return self._build_response(result, context)
         except Exception as e:
             logger.error(f"处理消息失败: {e}")
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(_INTERNAL)
             context.set_details(str(e))
             return self._build_error_response(str(e), context)
 
-    def StreamMessage(self, request, context) -> Iterator:
+    async def StreamMessage(self, request, context) -> AsyncIterator:
         """
-        处理消息（流式）- 使用线程和队列实现真正流式
+        处理消息（流式）- 使用后台任务和异步队列实现真正流式
 
-        核心流式处理方法，通过多线程和队列实现：
-        1. 在独立线程中运行agent处理
+        核心流式处理方法：
+        1. 在服务器事件循环上以后台任务运行agent处理
         2. 通过回调函数实时收集思考过程和答案
-        3. 使用队列在线程间传递数据
-        4. 主循环实时读取队列并yield给客户端
+        3. 回调将事件按产生顺序放入 asyncio 队列
+        4. 主协程等待队列并yield给客户端，无需轮询；客户端断开时取消后台任务
 
         流式输出的内容类型:
         - thinking_start: 思考开始信号
         - thinking_chunk: 思考内容块
+        - thinking_step: 单个执行步骤（JSON），每步完成后立即发送
         - thinking_end: 思考结束信号
         - answer_start: 答案开始信号
         - answer: 答案内容块（token级别）
@@ -285,134 +318,110 @@ class AgentServicer:
 
         Args:
             request: MessageRequest gRPC请求消息
-            context: grpc.ServicerContext gRPC上下文
+            context: grpc.aio.ServicerContext gRPC上下文
 
         Yields:
             StreamChunk: 流式数据块
         """
         import uuid
-        import time as time_module
         request_id = str(uuid.uuid4())[:8]
+        agent_task = None
 
         logger.info(f"[Stream-{request_id}] 开始处理流式请求: {request.user_input[:50]}...")
 
         try:
             user_input = request.user_input
+            context.set_compression(grpc.Compression.Gzip)
 
             # 发送思考开始信号
-            yield agent_pb2.StreamChunk(chunk_type="thinking_start", content="", is_last=False)
+            yield _StreamChunk(chunk_type="thinking_start", content="", is_last=False)
 
             answer_started = False
             chunk_count = 0
             thinking_sent = False
 
-            # 创建同步队列
-            answer_queue = queue.Queue()
-            thinking_queue = queue.Queue()
-            done_event = threading.Event()
+            # agent 产生的事件按顺序放入队列，None 表示处理结束
+            events = asyncio.Queue()
             error_holder = {"error": None}
+            emit = events.put_nowait
 
             # 回调函数
             def on_think(content, elapsed):
-                thinking_queue.put((content, elapsed))
+                emit(("thinking", content, elapsed))
+
+            def on_step(entry):
+                emit(("step", entry))
 
             def on_answer_chunk(chunk):
-                answer_queue.put(chunk)
+                emit(("answer", chunk))
 
             def on_done(result):
                 if not result.get("success"):
                     error_holder["error"] = result.get("error", "未知错误")
-                done_event.set()
-
-            # 设置回调
-            self.agent.react_agent.set_think_stream_callback(on_think)
 
-            # 在线程中运行 agent
-            def run_agent():
+            async def run_agent():
                 try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(
-                        self.agent.process_stream(
-                            user_input,
-                            answer_callback=on_answer_chunk,
-                            done_callback=on_done
-                        )
+                    await self.agent.process_stream(
+                        user_input,
+                        answer_callback=on_answer_chunk,
+                        done_callback=on_done,
+                        # 思考与步骤回调随本次调用传入，不注册到共享的 agent 上
+                        step_callback=on_step,
+                        think_callback=on_think
                     )
-                    loop.close()
                 except Exception as e:
                     logger.error(f"[Stream-{request_id}] agent 错误: {e}")
                     error_holder["error"] = str(e)
-                    done_event.set()
+                finally:
+                    emit(None)
 
-            # 启动 agent 线程
-            thread = threading.Thread(target=run_agent, daemon=True)
-            thread.start()
+            agent_task = asyncio.create_task(run_agent())
 
-            # 主循环：使用阻塞方式读取队列
-            # 这确保了当队列为空时会阻塞，直到 agent 放入新数据
             while True:
-                # 首先检查思考队列（带超时）
-                try:
-                    content, elapsed = thinking_queue.get(timeout=0.05)
+                event = await events.get()
+                if event is None:
+                    break
+
+                if event[0] == "thinking":
+                    _, content, elapsed = event
                     thinking_text = f"[已思考 {elapsed:.1f}秒]\n\n{content}"
-                    yield agent_pb2.StreamChunk(chunk_type="thinking_chunk", content=thinking_text, is_last=False)
+                    yield _StreamChunk(chunk_type="thinking_chunk", content=thinking_text, is_last=False)
                     thinking_sent = True
-                except queue.Empty:
-                    pass
+                    continue
 
-                # 检查答案队列
-                try:
-                    chunk = answer_queue.get(timeout=0.05)
-                    if not answer_started:
-                        if thinking_sent:
-                            yield agent_pb2.StreamChunk(chunk_type="thinking_end", content="", is_last=False)
-                        yield agent_pb2.StreamChunk(chunk_type="answer_start", content="", is_last=False)
-                        answer_started = True
-                    chunk_count += 1
-                    yield agent_pb2.StreamChunk(chunk_type="answer", content=chunk, is_last=False)
-                    time_module.sleep(0.02)
-                except queue.Empty:
-                    pass
-
-                # 检查是否完成
-                if done_event.is_set():
-                    # 继续读取剩余数据
-                    while not answer_queue.empty():
-                        try:
-                            chunk = answer_queue.get_nowait()
-                            if not answer_started:
-                                if thinking_sent:
-                                    yield agent_pb2.StreamChunk(chunk_type="thinking_end", content="", is_last=False)
-                                yield agent_pb2.StreamChunk(chunk_type="answer_start", content="", is_last=False)
-                                answer_started = True
-                            chunk_count += 1
-                            yield agent_pb2.StreamChunk(chunk_type="answer", content=chunk, is_last=False)
-                            time_module.sleep(0.02)
-                        except queue.Empty:
-                            break
-                    break
+                if event[0] == "step":
+                    yield _StreamChunk(chunk_type="thinking_step", content=_dumps(event[1]), is_last=False)
+                    continue
 
-            # 清理
-            self.agent.react_agent.set_think_stream_callback(None)
+                if not answer_started:
+                    if thinking_sent:
+                        yield _StreamChunk(chunk_type="thinking_end", content="", is_last=False)
+                    yield _StreamChunk(chunk_type="answer_start", content="", is_last=False)
+                    answer_started = True
+                chunk_count += 1
+                yield _StreamChunk(chunk_type="answer", content=event[1], is_last=False)
 
             # 检查错误
             if error_holder["error"]:
                 if not answer_started:
-                    yield agent_pb2.StreamChunk(chunk_type="thinking_end", content="", is_last=False)
-                yield agent_pb2.StreamChunk(chunk_type="error", content=error_holder["error"], is_last=True)
+                    yield _StreamChunk(chunk_type="thinking_end", content="", is_last=False)
+                yield _StreamChunk(chunk_type="error", content=error_holder["error"], is_last=True)
                 AgentServicer.cleanup_instance(request_id)
                 return
 
             # 发送完成信号
-            yield agent_pb2.StreamChunk(chunk_type="done", content="", is_last=True)
+            yield _StreamChunk(chunk_type="done", content="", is_last=True)
             AgentServicer.cleanup_instance(request_id)
             logger.info(f"[Stream-{request_id}] 流式响应完成 (共 {chunk_count} 个分块)")
 
         except Exception as e:
             logger.error(f"[Stream-{request_id}] 流式处理异常: {e}")
-            yield agent_pb2.StreamChunk(chunk_type="error", content=str(e), is_last=True)
+            yield _StreamChunk(chunk_type="error", content=str(e), is_last=True)
             AgentServicer.cleanup_instance(request_id)
+        finally:
+            # 客户端中途断开时停止仍在运行的 agent 处理
+            if agent_task is not None and not agent_task.done():
+                agent_task.cancel()
 
     def _build_response(self, result, context):
         """
@@ -428,46 +437,52 @@ class AgentServicer:
             MessageResponse: gRPC响应消息
         """
         if result.get("success", False):
-            reasoning = result.get("reasoning", {})
+            reasoning = result.get("reasoning") or _EMPTY
             history = result.get("history", [])
-            return agent_pb2.MessageResponse(
+            response = _MessageResponse(
                 success=True,
                 answer=result.get("answer", ""),
-                reasoning=agent_pb2.ReasoningInfo(
+                reasoning=_ReasoningInfo(
                     text=reasoning.get("text", ""),
                     total_steps=reasoning.get("total_steps", 0),
                     tools_used=reasoning.get("tools_used", [])
-                ),
-                history=[
-                    agent_pb2.HistoryStep(
-                        step=step.get("step", 0),
-                        thought=agent_pb2.ThoughtInfo(
-                            id=step.get("thought", {}).get("id", ""),
-                            type=step.get("thought", {}).get("type", ""),
-                            content=step.get("thought", {}).get("content", ""),
-                            confidence=step.get("thought", {}).get("confidence", 0.0),
-                            decision=step.get("thought", {}).get("decision", "")
-                        ),
-                        action=agent_pb2.ActionInfo(
-                            id=step.get("action", {}).get("id", ""),
-                            tool_name=step.get("action", {}).get("tool_name", ""),
-                            status=step.get("action", {}).get("status", ""),
-                            duration=step.get("action", {}).get("duration", 0)
-                        ),
-                        evaluation=agent_pb2.EvaluationInfo(
-                            success=step.get("evaluation", {}).get("success", False),
-                            duration=step.get("evaluation", {}).get("duration", 0)
-                        )
-                    )
-                    for step in history
-                ]
+                )
             )
+            # 直接在 repeated 字段中追加并原地填充，省去临时列表与子消息拷贝
+            for step in history:
+                self._fill_history_step(response.history.add(), step)
+            return response
         else:
-            return agent_pb2.MessageResponse(
+            return _MessageResponse(
                 success=False,
                 error=result.get("error", "未知错误")
             )
 
+    @staticmethod
+    def _fill_history_step(message, step: dict) -> None:
+        """
+        原地填充单个历史步骤消息
+
+        只设置非默认值的字段：proto3 标量字段取默认值时不占传输字节，
+        跳过赋值即可省去对应的字段检查与 setattr 开销。
+
+        Args:
+            message: HistoryStep 通过 response.history.add() 得到的历史步骤消息
+            step: dict 历史步骤，包含step、thought、action、evaluation字段
+        """
+        value = step.get("step")
+        if value:
+            message.step = value
+        for field, names in _HISTORY_STEP_FIELDS:
+            source = step.get(field)
+            if not source:
+                continue
+            target = getattr(message, field)
+            for name in names:
+                value = source.get(name)
+                if value:
+                    setattr(target, name, value)
+
     def _build_error_response(self, error: str, context):
         """
         构建错误响应消息
@@ -479,12 +494,12 @@ class AgentServicer:
         Returns:
             MessageResponse: 包含错误信息的gRPC响应
         """
-        return agent_pb2.MessageResponse(
+        return _MessageResponse(
             success=False,
             error=error
         )
 
-    def HealthCheck(self, request, context):
+    async def HealthCheck(self, request, context):
         """
         健康检查接口
 
@@ -492,33 +507,33 @@ class AgentServicer:
 
         Args:
             request: HealthRequest 健康检查请求（空）
-            context: grpc.ServicerContext gRPC上下文
+            context: grpc.aio.ServicerContext gRPC上下文
 
         Returns:
             HealthResponse: 包含服务状态、版本和运行状态的响应
         """
-        return agent_pb2.HealthResponse(healthy=True, version="1.0.0", status="running")
+        return self._health_response
 
 
-def serve(config_path: str = "config/config.json", port: int = 50051):
+async def serve_async(config_path: str = "config/config.json", port: int = 50051,
+                      grace: float = 5.0) -> None:
     """
-    启动 gRPC 服务器
+    启动 gRPC 异步服务器并运行至终止
 
-    创建并启动gRPC服务器，注册AgentServicer服务实现。
+    使用 grpc.aio 服务器，单个事件循环即可承载大量并发的流式请求，
+    Agent 协程直接运行在该事件循环上。
+    服务器开启 HTTP/2 keepalive 与 gzip 压缩，通道参数见 _SERVER_OPTIONS。
 
     Args:
         config_path: str LLM配置文件路径
         port: int 服务监听端口，默认为50051
-
-    Returns:
-        grpc.Server: 运行的gRPC服务器实例
+        grace: float 停止时等待进行中请求完成的秒数
 
     示例:
-        >>> server = serve("config/llm_config.yaml", 50051)
-        >>> server.wait_for_termination()  # 等待服务器终止
+        >>> asyncio.run(serve_async("config/llm_config.yaml", 50051))
     """
-    # 使用同步服务器
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    # 推理文本重复度高，默认启用 gzip 压缩
+    server = grpc.aio.server(options=_SERVER_OPTIONS, compression=grpc.Compression.Gzip)
 
     # 添加服务
     agent_servicer = AgentServicer(config_path)
@@ -526,10 +541,26 @@ def serve(config_path: str = "config/config.json", port: int = 50051):
     agent_pb2_grpc.add_AgentServiceServicer_to_server(agent_servicer, server)
 
     server.add_insecure_port(f'[::]:{port}')
-    server.start()
+    await server.start()
 
     logger.info(f"Agent gRPC 服务器已启动，端口: {port}")
-    return server
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(grace)
+
+
+def serve(config_path: str = "config/config.json", port: int = 50051) -> None:
+    """
+    启动 gRPC 服务器（同步入口）
+
+    阻塞运行 serve_async 直至服务器终止。
+
+    Args:
+        config_path: str LLM配置文件路径
+        port: int 服务监听端口，默认为50051
+    """
+    asyncio.run(serve_async(config_path, port))
 
 
 if __name__ == '__main__':
@@ -553,7 +584,5 @@ if __name__ == '__main__':
     print(f"    Port: {args.port}")
     print()
 
-    server = serve(config_path, args.port)
-    print(f"[OK] Agent gRPC Server started on port {args.port}")
     print("    Press Ctrl+C to stop")
-    server.wait_for_termination()
+    serve(config_path, args.port)
@@ -40,6 +40,7 @@ gRPC Agent 服务器启动脚本 - ShuaiTravelAgent Agent Service
     - 确保 LLM API 密钥已正确配置
 """
 
+import asyncio
 import sys
 import os
 
@@ -58,7 +59,7 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 os.chdir(project_root)
 
 # 将 agent 目录添加到 Python 路径
-# 这样可以使用相对导入，如 from src.server import serve
+# 这样可以使用相对导入，如 from src.server import serve_async
 agent_path = os.path.join(project_root, 'agent')
 if agent_path not in sys.path:
     sys.path.insert(0, agent_path)
@@ -67,11 +68,14 @@ if agent_path not in sys.path:
 # 导入服务模块
 # =============================================================================
 
+# protobuf 使用 upb（C 实现）后端，须在导入 gRPC 生成代码之前设置
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
+
 try:
     # 从 agent 模块导入服务器启动函数和配置管理器
-    # serve(): gRPC 服务器启动函数
+    # serve_async(): gRPC 异步服务器启动函数，运行至服务器终止
     # ConfigManager: 配置管理类，用于加载 LLM 配置
-    from src.server import serve
+    from src.server import serve_async
     from src.config.config_manager import ConfigManager
 
 except ImportError as e:
@@ -100,7 +104,7 @@ if __name__ == "__main__":
         1. 加载配置文件
         2. 获取 gRPC 端口配置
         3. 启动 gRPC 服务器
-        4. 等待服务器终止
+        4. 运行至服务器终止
     """
     try:
         # ==========================================================================
@@ -134,24 +138,17 @@ if __name__ == "__main__":
         print("   默认模型: " + config_manager.get_default_model_id())
         print()
 
-        # 调用 serve() 函数启动 gRPC 服务器
+        print("   按 Ctrl+C 停止服务\n")
+
+        # 在事件循环中启动 gRPC 异步服务器并运行至终止
         # 参数:
         #     config_path: str 配置文件路径
         #     port: int 监听端口
-        # 返回:
-        #     grpc.Server gRPC 服务器实例
-        server = serve(config_path=config_path, port=port)
-
-        # ==========================================================================
-        # 4. 等待服务器运行
-        # ==========================================================================
-
-        print("\n[✓] Agent gRPC 服务已启动，监听端口 " + str(port))
-        print("   按 Ctrl+C 停止服务\n")
+        # 终止信号（Ctrl+C）会取消等待并优雅停止服务器
+        asyncio.run(serve_async(config_path=config_path, port=port))
 
-        # wait_for_termination() 阻塞主线程
-        # 等待终止信号（Ctrl+C）或服务器内部停止
-        server.wait_for_termination()
+    except KeyboardInterrupt:
+        print("\n[*] Agent gRPC 服务已停止\n")
 
     except FileNotFoundError as e:
         """
@@ -1,6 +1,6 @@
 """Shared API types."""
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import List, Dict, Any, Optional
 
 
 class APIResponse(BaseModel):
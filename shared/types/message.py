@@ -1,7 +1,18 @@
 """Shared message types."""
+import json
+from dataclasses import dataclass
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
 
 class Message(BaseModel):
     """Chat message."""
@@ -39,12 +50,21 @@ class ChatResponse(BaseModel):
     error: Optional[str] = None
 
 
-class StreamChunk(BaseModel):
-    """Stream chunk for SSE."""
+@dataclass(slots=True, frozen=True)
+class StreamChunk:
+    """Stream chunk for SSE.
+
+    Plain carrier built once per streamed chunk, so it skips model validation.
+    """
     chunk_type: str  # "session_id", "reasoning_start", "reasoning_chunk", "reasoning_end", "answer_start", "chunk", "done", "error"
     content: str
     is_last: bool = False
 
+    def to_sse(self) -> str:
+        """Render as an SSE ``data:`` event; empty content is omitted."""
+        event = {"type": self.chunk_type, "content": self.content} if self.content else {"type": self.chunk_type}
+        return f"data: {_dumps(event)}\n\n"
+
 
 class CityInfo(BaseModel):
     """City information."""
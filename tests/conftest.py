@@ -2,10 +2,19 @@
 Pytest 配置文件和共享 fixtures
 """
 
+import os
+import sys
+
 import pytest
 import httpx
 import asyncio
 
+# 单元测试直接导入 agent 源码：agent/ 提供 proto 包，agent/src 提供 core、llm 等模块
+_AGENT_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'agent')
+for _path in (_AGENT_ROOT, os.path.join(_AGENT_ROOT, 'src')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
 
 @pytest.fixture(scope="session")
 def event_loop():
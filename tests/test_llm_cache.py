@@ -0,0 +1,113 @@
+"""
+LLM 响应缓存单元测试
+
+覆盖 LLMCache 的键计算、LRU 淘汰、统计与持久化，
+以及 SemanticCache 的相似度命中与作用域隔离。
+"""
+
+import pytest
+
+from llm.cache import LLMCache, SemanticCache
+
+MESSAGES = [{"role": "user", "content": "北京旅游推荐"}]
+
+
+class TestLLMCache:
+    """LLM 响应缓存测试类"""
+
+    def test_make_key(self):
+        """测试相同参数得到相同键，参数变化时键随之变化"""
+        key = LLMCache.make_key("gpt-4o-mini", MESSAGES, 0.7, 1024)
+
+        assert key == LLMCache.make_key("gpt-4o-mini", MESSAGES, 0.7, 1024)
+        assert key != LLMCache.make_key("gpt-4o-mini", MESSAGES, 0.2, 1024)
+        assert key != LLMCache.make_key("gpt-4o", MESSAGES, 0.7, 1024)
+
+    def test_get_returns_copy(self):
+        """测试读取返回副本，修改不影响缓存"""
+        cache = LLMCache()
+        cache.set("k", {"content": "答案"})
+
+        cache.get("k")["content"] = "已修改"
+        assert cache.get("k") == {"content": "答案"}
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = LLMCache(max_size=2)
+        cache.set("a", {"content": "a"})
+        cache.set("b", {"content": "b"})
+        cache.get("a")
+        cache.set("c", {"content": "c"})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"content": "a"}
+        assert cache.get("c") == {"content": "c"}
+
+    def test_stats(self):
+        """测试命中统计"""
+        cache = LLMCache()
+        cache.set("k", {"content": "答案"})
+        cache.get("k")
+        cache.get("missing")
+
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+        cache.clear()
+        assert cache.stats() == {"size": 0, "hits": 0, "misses": 0, "hit_rate": 0.0}
+
+    def test_save_and_load(self, tmp_path):
+        """测试持久化后重新加载"""
+        filepath = str(tmp_path / "llm_cache.json")
+        cache = LLMCache(filepath=filepath)
+        cache.set("k", {"content": "答案"})
+        cache.save_to_file()
+
+        assert LLMCache(filepath=filepath).get("k") == {"content": "答案"}
+        assert LLMCache().load_from_file(str(tmp_path / "missing.json")) is False
+
+
+class TestSemanticCache:
+    """语义缓存测试类"""
+
+    @pytest.fixture
+    def cache(self) -> SemanticCache:
+        """以查询文本首字为维度的简易向量化语义缓存"""
+        vectors = {"海": (1.0, 0.1), "推": (1.0, 0.0), "历": (0.0, 1.0)}
+        return SemanticCache(lambda text: vectors[text[0]], threshold=0.9)
+
+    def test_similar_query_hits(self, cache: SemanticCache):
+        """测试语义相近的查询命中缓存"""
+        scope = SemanticCache.make_scope("cities")
+        response, vector = cache.lookup("推荐一个海边城市", scope)
+        assert response is None
+        cache.add(vector, scope, {"content": "三亚"})
+
+        response, _ = cache.lookup("海滨度假地", scope)
+        assert response == {"content": "三亚"}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_dissimilar_query_misses(self, cache: SemanticCache):
+        """测试相似度低于阈值时不命中"""
+        scope = SemanticCache.make_scope("cities")
+        _, vector = cache.lookup("推荐一个海边城市", scope)
+        cache.add(vector, scope, {"content": "三亚"})
+
+        response, _ = cache.lookup("历史文化城市", scope)
+        assert response is None
+
+    def test_scope_isolation(self, cache: SemanticCache):
+        """测试不同作用域互不命中"""
+        _, vector = cache.lookup("推荐一个海边城市", SemanticCache.make_scope(["三亚"]))
+        cache.add(vector, SemanticCache.make_scope(["三亚"]), {"content": "三亚"})
+
+        response, _ = cache.lookup("海滨度假地", SemanticCache.make_scope(["厦门"]))
+        assert response is None
+
+    def test_max_size(self):
+        """测试超出容量时淘汰最早写入的条目"""
+        cache = SemanticCache(lambda text: (1.0, 0.0), max_size=2)
+        for i in range(3):
+            cache.add((1.0, 0.0), "scope", {"content": str(i)})
+
+        assert cache.stats()["size"] == 2
@@ -0,0 +1,85 @@
+"""
+记忆管理器单元测试
+
+覆盖长期记忆存档的列式存储还原、持久化往返，
+以及存档淘汰时 session_id 索引的同步。
+"""
+
+from memory.manager import MemoryManager
+
+
+class TestArchive:
+    """会话存档测试类"""
+
+    @staticmethod
+    def _archive(manager: MemoryManager, session_id: str, *contents: str) -> dict:
+        """以指定会话ID写入消息并存档"""
+        manager.session_state['session_id'] = session_id
+        for content in contents:
+            manager.add_message('user', content)
+        return manager.archive_current_session()
+
+    def test_columnar_round_trip(self):
+        """测试列式存档可还原为逐条消息"""
+        manager = MemoryManager()
+        manager.add_message('user', '北京旅游推荐')
+        manager.add_message('assistant', '推荐故宫和长城')
+        expected = manager.get_conversation_history()
+
+        record = manager.archive_current_session()
+        assert record['messages']['roles'] == ['user', 'assistant']
+
+        detail = manager.get_archive_detail(record['session_id'])
+        assert detail['messages'] == expected
+        assert detail['message_count'] == 2
+
+    def test_save_and_load(self, tmp_path):
+        """测试存档经文件持久化后仍可查询详情"""
+        filepath = str(tmp_path / "memory.json")
+        manager = MemoryManager()
+        record = self._archive(manager, 'session_a', '杭州西湖一日游')
+        manager.save_to_file(filepath)
+
+        loaded = MemoryManager()
+        assert loaded.load_from_file(filepath) is True
+        detail = loaded.get_archive_detail(record['session_id'])
+        assert [m['content'] for m in detail['messages']] == ['杭州西湖一日游']
+
+    def test_legacy_list_messages(self):
+        """测试兼容旧版按条存储的存档"""
+        manager = MemoryManager()
+        messages = [{'role': 'user', 'content': '成都火锅', 'timestamp': '2024-01-01T00:00:00'}]
+        manager.set_long_term_memory([{'session_id': 'legacy', 'messages': messages}])
+
+        assert manager.get_archive_detail('legacy')['messages'] == messages
+
+    def test_missing_archive(self):
+        """测试查询不存在的存档返回 None"""
+        assert MemoryManager().get_archive_detail('missing') is None
+
+    def test_eviction_updates_index(self):
+        """测试超出长期记忆上限时，被淘汰的存档同步移出索引"""
+        manager = MemoryManager(max_long_term_memory=2)
+        for session_id in ('s1', 's2', 's3'):
+            self._archive(manager, session_id, session_id)
+
+        assert manager.get_archive_detail('s1') is None
+        assert manager.get_archive_detail('s2') is not None
+        assert manager.get_archive_detail('s3') is not None
+
+    def test_zero_capacity(self):
+        """测试长期记忆容量为 0 时存档不报错"""
+        manager = MemoryManager(max_long_term_memory=0)
+
+        assert manager.archive_current_session() == {}
+        assert manager.get_archive_detail(manager.session_state['session_id']) is None
+
+    def test_eviction_keeps_latest_archive(self):
+        """测试同一会话多次存档时，淘汰旧记录不影响最新记录的索引"""
+        manager = MemoryManager(max_long_term_memory=2)
+        self._archive(manager, 's1', '第一次')
+        self._archive(manager, 's1', '第二次')
+        self._archive(manager, 's2', '其他会话')
+
+        detail = manager.get_archive_detail('s1')
+        assert [m['content'] for m in detail['messages']] == ['第一次', '第二次']
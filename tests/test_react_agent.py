@@ -0,0 +1,241 @@
+"""
+ReAct 智能体单元测试
+
+覆盖规则推理与执行历史中的关键辅助逻辑：
+1. 城市名提取的模式优先级与关键词过滤
+2. 过大工具结果在历史中的截断与还原
+3. 计划中独立步骤的分组与并发执行
+4. 并发 run() 之间回调与事件分发的隔离
+"""
+
+import asyncio
+
+import pytest
+
+from core.react_agent import (
+    Action, ActionStatus, ReActAgent, Thought, ThoughtType, ToolInfo,
+    _HISTORY_RESULT_LIMIT, _extract_city, _independent_group_end,
+)
+
+
+class TestExtractCity:
+    """城市名提取测试类"""
+
+    @pytest.mark.parametrize("task, expected", [
+        ("北京 计划三天行程", "北京"),
+        ("成都 想要吃火锅", "成都"),
+        ("西安攻略", "西安"),
+        ("西安的攻略", "西安"),
+    ])
+    def test_patterns(self, task: str, expected: str):
+        """测试各提取模式"""
+        assert _extract_city(task) == expected
+
+    def test_priority(self):
+        """测试按模式优先级返回：“计划”模式先于“在/去/到”模式"""
+        assert _extract_city("在三亚 计划五天") == "在三亚"
+
+    def test_priority_over_position(self):
+        """测试优先级高的模式即使匹配位置靠后也先返回：“在/去/到”模式先于“攻略”模式"""
+        assert _extract_city("西安攻略，去杭州") == "杭"
+
+    def test_reject_keywords(self):
+        """测试匹配结果包含“推荐”等关键词时不视为城市名"""
+        assert _extract_city("推荐 计划") is None
+
+    def test_no_match(self):
+        """测试无匹配时返回 None"""
+        assert _extract_city("你好") is None
+
+
+class TestRecordHistory:
+    """执行历史记录测试类"""
+
+    @pytest.fixture
+    def agent(self) -> ReActAgent:
+        """ReAct 智能体"""
+        return ReActAgent()
+
+    @staticmethod
+    def _record(agent: ReActAgent, result) -> dict:
+        """记录一步执行历史，返回历史中的工具结果"""
+        thought = Thought(id="thought_1", type=ThoughtType.ANALYSIS, content="分析任务")
+        action = Action(id="action_1", tool_name="get_city_info", parameters={},
+                        status=ActionStatus.SUCCESS, result=result)
+        agent._record_history(thought, action, {"success": True})
+        return agent.state.history[-1]["action"]["result"]
+
+    def test_small_result_kept(self, agent: ReActAgent):
+        """测试未超限的结果原样保留"""
+        result = {"city": "北京"}
+        assert self._record(agent, result) is result
+
+    def test_large_result_truncated(self, agent: ReActAgent):
+        """测试超限的结果在历史中只保留摘要"""
+        result = {"data": "x" * (_HISTORY_RESULT_LIMIT + 1)}
+        stub = self._record(agent, result)
+
+        assert stub["_truncated"] is True
+        assert stub["_size"] == len(str(result))
+        assert stub["_memory_id"]
+
+    def test_resolve_truncated_result(self, agent: ReActAgent):
+        """测试截断摘要可还原为完整结果"""
+        result = {"data": "x" * (_HISTORY_RESULT_LIMIT + 1)}
+        stub = self._record(agent, result)
+
+        assert agent.resolve_result(stub) is result
+
+    def test_resolve_plain_result(self, agent: ReActAgent):
+        """测试非截断结果原样返回"""
+        result = {"city": "北京"}
+        assert agent.resolve_result(result) is result
+        assert agent.resolve_result(None) is None
+
+    def test_resolve_unknown_stub(self, agent: ReActAgent):
+        """测试原文已不可用时返回摘要本身"""
+        stub = {"_truncated": True, "_size": 1, "_memory_id": "mem_missing"}
+        assert agent.resolve_result(stub) is stub
+
+
+class TestIndependentGroup:
+    """独立步骤分组测试类"""
+
+    def test_without_depends_on(self):
+        """测试未声明依赖的步骤不并入分组"""
+        decisions = [{"action": "a"}, {"action": "b"}]
+        assert _independent_group_end(decisions, 0, 10) == 1
+
+    def test_independent_steps_grouped(self):
+        """测试不依赖本组步骤的后续步骤并入分组"""
+        decisions = [{"action": "a"}, {"action": "b", "depends_on": []},
+                     {"action": "c", "depends_on": [0]}]
+        assert _independent_group_end(decisions, 0, 10) == 2
+        assert _independent_group_end(decisions, 1, 10) == 3
+
+    def test_dependent_step_stops_group(self):
+        """测试依赖本组步骤或依赖格式无效时分组截断"""
+        assert _independent_group_end(
+            [{"action": "a"}, {"action": "b", "depends_on": [0]}], 0, 10) == 1
+        assert _independent_group_end(
+            [{"action": "a"}, {"action": "b", "depends_on": ["0"]}], 0, 10) == 1
+
+    def test_limit(self):
+        """测试分组不超过剩余步骤数"""
+        decisions = [{"action": "a"}] + [{"action": "b", "depends_on": []}] * 3
+        assert _independent_group_end(decisions, 0, 2) == 2
+        assert _independent_group_end(decisions, 0, 0) == 1
+
+
+class TestActGrouping:
+    """分组并发执行测试类"""
+
+    @staticmethod
+    def _agent(serialize_b: bool = False):
+        """注册 a、b 两个记录并发数的工具，返回 (智能体, 最大并发数记录)"""
+        agent = ReActAgent()
+        stats = {"running": 0, "max": 0}
+
+        def make_tool(name: str):
+            async def tool():
+                stats["running"] += 1
+                stats["max"] = max(stats["max"], stats["running"])
+                await asyncio.sleep(0.01)
+                stats["running"] -= 1
+                return {"name": name}
+            return tool
+
+        for name in ("a", "b"):
+            agent.register_tool(
+                ToolInfo(name=name, description=name, parameters={},
+                         serialize=serialize_b and name == "b"),
+                make_tool(name))
+        return agent, stats
+
+    @staticmethod
+    def _thought() -> Thought:
+        """包含两个相互独立步骤的计划"""
+        plan = [{"action": "a"}, {"action": "b", "depends_on": []}]
+        return Thought(id="thought_1", type=ThoughtType.PLANNING, content="计划",
+                       decision="plan", decision_plan=plan)
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        """测试独立步骤并发执行，结果按计划顺序返回"""
+        agent, stats = self._agent()
+        actions = await agent._act(self._thought())
+
+        assert [a.tool_name for a in actions] == ["a", "b"]
+        assert all(a.status == ActionStatus.SUCCESS for a in actions)
+        assert [a.result["name"] for a in actions] == ["a", "b"]
+        assert stats["max"] == 2
+
+    @pytest.mark.asyncio
+    async def test_serialize_tool_runs_alone(self):
+        """测试声明 serialize 的工具不与其他步骤并发"""
+        agent, stats = self._agent(serialize_b=True)
+        actions = await agent._act(self._thought())
+
+        assert [a.tool_name for a in actions] == ["a"]
+        assert stats["max"] == 1
+
+
+class TestRunScope:
+    """单次 run() 回调隔离测试类"""
+
+    @staticmethod
+    def _agent() -> ReActAgent:
+        """注册城市信息工具的智能体，北京的查询耗时更长，使两次执行交错"""
+        agent = ReActAgent(max_steps=3)
+
+        async def get_city_info(cities):
+            await asyncio.sleep(0.05 if "北京" in cities else 0.01)
+            return {"cities": cities}
+
+        agent.register_tool(
+            ToolInfo(name="get_city_info", description="查询城市信息", parameters={}),
+            get_city_info)
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_overlapping_runs(self):
+        """测试共享同一智能体的两次并发执行各自只收到自己的事件，且均经各自的分发任务异步调用"""
+        agent = self._agent()
+        tasks = {"北京": "北京 计划三天", "成都": "成都 计划两天"}
+        events = {city: [] for city in tasks}
+
+        def recorder(city: str, kind: str):
+            def callback(obj):
+                events[city].append((kind, obj, asyncio.current_task()))
+            return callback
+
+        runs = {
+            city: asyncio.create_task(agent.run(
+                task,
+                step_callback=recorder(city, "step"),
+                thought_callback=recorder(city, "thought"),
+                action_callback=recorder(city, "action")))
+            for city, task in tasks.items()
+        }
+        await asyncio.gather(*runs.values())
+
+        dispatchers = {}
+        for city, task in tasks.items():
+            kinds = {kind for kind, _, _ in events[city]}
+            assert kinds == {"step", "thought", "action"}
+
+            for kind, obj, _ in events[city]:
+                if kind == "step" and obj["action"]["tool_name"] == "get_city_info":
+                    assert obj["action"]["result"] == {"cities": [city]}
+                elif kind == "action" and obj.tool_name == "get_city_info":
+                    assert obj.parameters == {"cities": [city]}
+                elif kind == "thought" and "用户输入" in obj.content:
+                    assert task in obj.content
+
+            # 回调全部由本次执行自己的分发任务调用，既不同步执行，也不串到另一次执行
+            callers = {caller for _, _, caller in events[city]}
+            assert len(callers) == 1
+            assert runs[city] not in callers
+            dispatchers[city] = callers.pop()
+
+        assert dispatchers["北京"] is not dispatchers["成都"]
@@ -0,0 +1,58 @@
+"""
+gRPC 服务单元测试
+
+覆盖执行历史步骤到 HistoryStep 消息的字段映射。
+"""
+
+from proto import agent_pb2
+from server import AgentServicer
+
+
+class TestFillHistoryStep:
+    """历史步骤消息填充测试类"""
+
+    @staticmethod
+    def _fill(step: dict) -> agent_pb2.HistoryStep:
+        """填充并返回历史步骤消息"""
+        response = agent_pb2.MessageResponse()
+        AgentServicer._fill_history_step(response.history.add(), step)
+        return response.history[0]
+
+    def test_full_step(self):
+        """测试完整步骤的字段映射"""
+        message = self._fill({
+            "step": 2,
+            "thought": {"id": "thought_1", "type": "ANALYSIS", "content": "分析任务",
+                        "confidence": 0.5, "decision": "get_city_info"},
+            "action": {"id": "action_1", "tool_name": "get_city_info", "status": "SUCCESS",
+                       "duration": 120, "result": {"city": "北京"}},
+            "evaluation": {"success": True, "duration": 130},
+            "timestamp": "2024-01-01T00:00:00",
+        })
+
+        assert message.step == 2
+        assert message.thought.id == "thought_1"
+        assert message.thought.type == "ANALYSIS"
+        assert message.thought.content == "分析任务"
+        assert message.thought.confidence == 0.5
+        assert message.thought.decision == "get_city_info"
+        assert message.action.id == "action_1"
+        assert message.action.tool_name == "get_city_info"
+        assert message.action.status == "SUCCESS"
+        assert message.action.duration == 120
+        assert message.evaluation.success is True
+        assert message.evaluation.duration == 130
+
+    def test_missing_and_empty_fields(self):
+        """测试缺失或为空的字段保持默认值"""
+        message = self._fill({
+            "step": 1,
+            "thought": {"id": "thought_1", "decision": None},
+            "action": None,
+        })
+
+        assert message.step == 1
+        assert message.thought.id == "thought_1"
+        assert message.thought.decision == ""
+        assert message.action.tool_name == ""
+        assert message.evaluation.success is False